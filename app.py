@@ -9,17 +9,40 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-from flask import Flask, jsonify
+from flask import Flask, g, jsonify
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from flask_mail import Mail
 from config import Config
+from utils.json_provider import ProvedorJSON
+from utils.compressao import iniciar_compressao
+from services.metricas import iniciar_metricas
+from services.profiling import iniciar_profiling
+from services.tracing import iniciar_tracing
+from database.database import encerrar_transacao
+from database.instrumentacao import configurar_instrumentacao
 
 # Importa os blueprints das rotas
 from controllers.contatos import contatos_bp
 from controllers.cloudinaryapi import cloudinary_bp
 from controllers.auth import auth_bp
 from controllers.formas_contato import formas_contato_bp
+from controllers.logs import logs_bp
+from controllers.estatisticas import estatisticas_bp
+from controllers.metricas import metricas_bp
+from controllers.profiling import profiling_bp
+from commands.dados_sinteticos import gerar_dados
+from commands.manutencao_logs import manter_logs
+from commands.estatisticas import atualizar_estatisticas_comando
+from services.journal import iniciar_ingestao_journal
+from services.eventos import iniciar_ouvinte_postgres
+from services.estatisticas import iniciar_atualizacao_estatisticas
+from services.visualizacoes import iniciar_contador_visualizacoes
+from services.logs import (
+    configurar_registro_logs,
+    iniciar_manutencao_logs,
+    ler_mapa_tipos,
+)
 
 
 def create_app(config_class=Config):
@@ -37,6 +60,9 @@ def create_app(config_class=Config):
     # Carrega as configurações da aplicação
     app.config.from_object(config_class)
 
+    # Serialização JSON (jsonify e request.get_json) via orjson, quando instalado
+    app.json = ProvedorJSON(app)
+
     # Inicializa extensões com a aplicação
     jwt = JWTManager()
     mail = Mail()
@@ -55,7 +81,7 @@ def create_app(config_class=Config):
             r"/api/*": {
                 "origins": allowed_origins,
                 "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-                "allow_headers": ["Content-Type", "Authorization"],
+                "allow_headers": ["Content-Type", "Authorization", "Idempotency-Key"],
             }
         },
         supports_credentials=True,
@@ -65,6 +91,80 @@ def create_app(config_class=Config):
     jwt.init_app(app)
     mail.init_app(app)
 
+    # No modo journal, contatos são gravados em disco e drenados em segundo plano
+    if app.config["CONTATOS_MODO_INGESTAO"] == "journal":
+        iniciar_ingestao_journal(app)
+
+    # Com LISTEN/NOTIFY, cada processo repassa os novos contatos aos seus assinantes SSE
+    if app.config["EVENTOS_BACKEND"] == "postgres":
+        iniciar_ouvinte_postgres()
+
+    # Quais eventos o registrar_log grava (nível mínimo, amostragem e limite por tipo)
+    configurar_registro_logs(
+        app.config["LOGS_NIVEL_MINIMO"],
+        ler_mapa_tipos(app.config["LOGS_AMOSTRAGEM"], float),
+        ler_mapa_tipos(app.config["LOGS_LIMITE_POR_MINUTO"], int),
+    )
+
+    # Criação das partições futuras de logs e retenção (DROP das partições antigas)
+    if app.config["LOGS_MANUTENCAO_AUTOMATICA"]:
+        iniciar_manutencao_logs(app)
+
+    # Resumos do painel (/api/estatisticas) atualizados a partir da última marca
+    if app.config["ESTATISTICAS_ATUALIZACAO_AUTOMATICA"]:
+        iniciar_atualizacao_estatisticas(app)
+
+    # Visualizações de fotos somadas em memória e gravadas em lote
+    iniciar_contador_visualizacoes(app)
+
+    # Log de consultas lentas do cursor instrumentado de get_cursor()
+    configurar_instrumentacao(
+        app.config["SQL_LENTA_LIMITE_MS"], app.config["SQL_LENTA_EXPLAIN"]
+    )
+
+    # Latência, status e requisições em andamento por endpoint (expostos em /metrics)
+    if app.config["METRICAS_ATIVAS"]:
+        iniciar_metricas(app)
+        app.register_blueprint(metricas_bp, url_prefix="/metrics")
+
+    # Spans por requisição (banco, Cloudinary, SMTP), Server-Timing e exportação
+    if app.config["TRACING_ATIVO"]:
+        iniciar_tracing(app)
+
+    # Profiling (cProfile) de requisições com X-Profile assinado ou sorteadas
+    if app.config["PROFILING_ATIVO"]:
+        iniciar_profiling(app)
+        app.register_blueprint(profiling_bp, url_prefix="/api/profiling")
+
+    # Compressão gzip/brotli das respostas de /api/*
+    if app.config["COMPRESSAO_ATIVA"]:
+        iniciar_compressao(app)
+
+    # Toda requisição termina sem transação aberta na conexão compartilhada
+    @app.teardown_request
+    def encerrar_transacao_requisicao(erro):
+        """
+        Confirma (ou desfaz, após erro) a transação que a requisição deixou aberta
+        na conexão compartilhada, como as das consultas de leitura.
+
+        Rotas assíncronas (ponte ASGI) usam o pool assíncrono e são encerradas no
+        event loop: não tocam a conexão compartilhada, que pode estar no meio da
+        transação de uma thread WSGI.
+
+        Args:
+            erro (Exception | None): Exceção não tratada da requisição, se houver.
+
+        Returns:
+            None
+        """
+        if g.get("rota_assincrona"):
+            return
+
+        try:
+            encerrar_transacao()
+        except Exception as e:
+            print(f"Erro ao encerrar transação da requisição: {e}")
+
     # Callback que verifica se o token está na denylist (lista negra)
     @jwt.token_in_blocklist_loader
     def check_if_token_revoked(jwt_header, jwt_payload):
@@ -74,6 +174,10 @@ def create_app(config_class=Config):
         Esta função é chamada automaticamente pelo Flask-JWT-Extended antes de cada
         acesso a uma rota protegida.
 
+        A época de sessão (claim `token_epoch`) é sempre comparada com a época em
+        cache do fotógrafo. A consulta à denylist só é feita no modo "denylist";
+        no modo "epoca" o logout incrementa a época e nenhuma consulta por JTI é necessária.
+
         Args:
             jwt_header (dict): Cabeçalho do token JWT.
             jwt_payload (dict): Conteúdo decodificado do token.
@@ -84,15 +188,19 @@ def create_app(config_class=Config):
         jti = jwt_payload["jti"]
 
         try:
-            from database.database import get_cursor
+            from services.token_service import token_revogado, token_epoca_revogada
+
+            if token_epoca_revogada(jwt_payload):
+                return True
 
-            with get_cursor() as cur:
-                cur.execute(
-                    "SELECT 1 FROM tokens_denylist WHERE token_jti = %s", (jti,)
-                )
-                token_denylistado = cur.fetchone()
+            # Refresh tokens são revogados na própria tabela tokens_refresh
+            if (
+                app.config["JWT_MODO_REVOGACAO"] == "epoca"
+                or jwt_payload["type"] == "refresh"
+            ):
+                return False
 
-            return token_denylistado is not None
+            return token_revogado(jti)
 
         except Exception as e:
             print(f"Erro ao verificar denylist: {e}")
@@ -193,11 +301,18 @@ def create_app(config_class=Config):
         """
         return "Olá, estou online!"
 
+    # Comandos do Flask CLI (ex: flask --app app gerar-dados)
+    app.cli.add_command(gerar_dados)
+    app.cli.add_command(manter_logs)
+    app.cli.add_command(atualizar_estatisticas_comando)
+
     # Registro dos blueprints com prefixos de URL
     app.register_blueprint(contatos_bp, url_prefix="/api/contatos")
     app.register_blueprint(cloudinary_bp, url_prefix="/api/cloudinary")
     app.register_blueprint(auth_bp, url_prefix="/api/auth")
     app.register_blueprint(formas_contato_bp, url_prefix="/api/formas-contato")
+    app.register_blueprint(logs_bp, url_prefix="/api/logs")
+    app.register_blueprint(estatisticas_bp, url_prefix="/api/estatisticas")
 
     return app
 
@@ -0,0 +1,28 @@
+"""
+asgi.py – Ponto de entrada ASGI da aplicação
+
+Serve a mesma aplicação Flask de app.py, mas com as rotas públicas dominadas
+por espera de rede (galeria do Cloudinary, formulário de contato e formas de
+contato) rodando como corrotinas: o banco é acessado pelo pool de conexões
+assíncronas do psycopg e o Cloudinary por um cliente HTTP assíncrono, sem
+ocupar uma thread por requisição. As demais rotas (painel, autenticação,
+feed SSE, métricas) seguem pelo caminho WSGI de sempre.
+
+Exemplo:
+    uvicorn asgi:app --host 0.0.0.0 --port 8000
+"""
+
+from app import app as aplicacao_flask
+from controllers.cloudinaryapi import get_fotos_async
+from controllers.contatos import inserir_contato_async
+from controllers.formas_contato import listar_formas_contato_publico_async
+from utils.ponte_asgi import AplicacaoASGI
+
+# Rotas atendidas no event loop (endpoint do Flask -> versão assíncrona)
+ROTAS_ASSINCRONAS = {
+    "cloudinaryapi.get_fotos": get_fotos_async,
+    "contatos.inserir_contato": inserir_contato_async,
+    "formas_contato.listar_formas_contato_publico": listar_formas_contato_publico_async,
+}
+
+app = AplicacaoASGI(aplicacao_flask, ROTAS_ASSINCRONAS)
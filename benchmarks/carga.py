@@ -0,0 +1,427 @@
+"""
+carga.py – Benchmark de latência e vazão da API com serviços locais
+
+Monta a aplicação com `create_app()` apontando para um PostgreSQL local de
+benchmark, um Cloudinary falso (em memória) e um servidor SMTP local que apenas
+aceita as mensagens, e mede as rotas principais:
+
+    - POST /api/contatos
+    - GET  /api/contatos (paginado, com JWT e check_if_token_revoked) em vários tamanhos de tabela
+    - POST /api/cloudinary/fotos
+    - GET  /api/formas-contato
+    - POST /api/auth/recuperar-senha (consultas + envio SMTP)
+
+Os resultados são gravados em JSON (`benchmarks/resultados/`) para comparação
+entre commits com `benchmarks/comparar.py`.
+
+ATENÇÃO: com `--preparar`, o schema `public` do banco informado é APAGADO e
+recriado a partir de `database/migration.sql`. Use um banco exclusivo: o script
+se recusa a prepará-lo se o nome do banco não contiver "bench".
+
+Uso (na raiz do projeto):
+    createdb portifolio_bench
+    python benchmarks/carga.py --database-url postgresql://localhost/portifolio_bench --preparar
+"""
+
+import argparse
+import json
+import os
+import platform
+import socketserver
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, RAIZ)
+
+EMAIL_FOTOGRAFO = "fotografo@bench.local"
+
+
+class _SessaoSMTP(socketserver.StreamRequestHandler):
+    # Implementa apenas o necessário do SMTP para o Flask-Mail entregar a mensagem
+
+    def responder(self, linha):
+        self.wfile.write(linha.encode("ascii") + b"\r\n")
+
+    def handle(self):
+        self.responder("220 bench.local ESMTP")
+
+        while True:
+            linha = self.rfile.readline()
+            if not linha:
+                return
+
+            comando = linha.decode("ascii", "replace").strip().upper()
+
+            if comando.startswith("EHLO"):
+                self.responder("250-bench.local")
+                self.responder("250 OK")
+            elif comando.startswith("DATA"):
+                self.responder("354 End data with <CRLF>.<CRLF>")
+                while self.rfile.readline() not in (b".\r\n", b".\n", b""):
+                    pass
+                self.server.mensagens += 1
+                self.responder("250 OK")
+            elif comando.startswith("QUIT"):
+                self.responder("221 Bye")
+                return
+            else:
+                # HELO, MAIL FROM, RCPT TO, RSET, NOOP...
+                self.responder("250 OK")
+
+
+class ServidorSMTPFalso(socketserver.ThreadingTCPServer):
+    """Servidor SMTP local que aceita e descarta as mensagens (conta quantas recebeu)."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _SessaoSMTP)
+        self.mensagens = 0
+
+    @property
+    def porta(self):
+        return self.server_address[1]
+
+    def iniciar(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+def cloudinary_falso(quantidade_fotos, latencia_ms):
+    """
+    Cria um substituto de `cloudinary.api.resources_by_asset_folder`.
+
+    Args:
+        quantidade_fotos (int): Fotos devolvidas por página.
+        latencia_ms (float): Atraso simulado da API, em milissegundos.
+
+    Returns:
+        function: Função com a mesma assinatura usada pelo controller.
+    """
+
+    def resources_by_asset_folder(asset_folder, max_results=18, next_cursor=None):
+        if latencia_ms:
+            time.sleep(latencia_ms / 1000)
+        return {
+            "resources": [
+                {
+                    "url": f"http://res.cloudinary.com/bench/image/upload/v1/{asset_folder}/foto_{i}.jpg",
+                    "public_id": f"{asset_folder}/foto_{i}",
+                }
+                for i in range(min(quantidade_fotos, max_results))
+            ],
+            "next_cursor": "cursor-bench",
+        }
+
+    return resources_by_asset_folder
+
+
+def banco_de_benchmark(database_url):
+    """
+    Indica se a URL aponta para um banco claramente marcado como de benchmark.
+
+    Args:
+        database_url (str): URL (postgresql://...) ou DSN (dbname=...) do banco.
+
+    Returns:
+        bool: True se o nome do banco contiver "bench".
+    """
+    from psycopg.conninfo import conninfo_to_dict
+
+    try:
+        nome = conninfo_to_dict(database_url).get("dbname") or ""
+    except Exception:
+        return False
+
+    return "bench" in nome.lower()
+
+
+def preparar_banco(database_url):
+    """
+    Recria o schema `public` do banco de benchmark a partir de `database/migration.sql`.
+
+    As linhas `CREATE DATABASE` e `\\c` do script (próprias do psql) são ignoradas.
+    """
+    import psycopg
+
+    with open(os.path.join(RAIZ, "database", "migration.sql"), encoding="utf-8") as f:
+        script = "\n".join(
+            linha
+            for linha in f.read().splitlines()
+            if not linha.startswith(("CREATE DATABASE", "\\c"))
+        )
+
+    with psycopg.connect(database_url, autocommit=True) as conexao:
+        conexao.execute("DROP SCHEMA public CASCADE")
+        conexao.execute("CREATE SCHEMA public")
+        conexao.execute(script)
+
+
+def popular_banco(cur):
+    """Garante o fotógrafo e a linha de formas de contato usados pelas rotas."""
+    cur.execute(
+        """
+        INSERT INTO fotografo (id, nome, email, senha_hash)
+        VALUES (1, 'Fotógrafo Bench', %s, 'x')
+        ON CONFLICT (id) DO NOTHING
+        """,
+        (EMAIL_FOTOGRAFO,),
+    )
+    cur.execute("SELECT COUNT(*) AS total FROM formas_contato")
+    if cur.fetchone()["total"] == 0:
+        cur.execute(
+            """
+            INSERT INTO formas_contato (redesocial_nome, redesocial_perfil, email, telefone)
+            VALUES ('Instagram', 'https://instagram.com/bench', %s, '(11) 99999-0000')
+            """,
+            (EMAIL_FOTOGRAFO,),
+        )
+    cur.connection.commit()
+
+
+def popular_contatos(cur, quantidade):
+    """
+    Substitui a tabela `contatos` por `quantidade` linhas geradas no próprio banco.
+
+    As datas se espalham pelos últimos dois anos e ~20% dos contatos ficam
+    arquivados e ~60% lidos, para que os índices parciais tenham trabalho real.
+    """
+    cur.execute("TRUNCATE contatos RESTART IDENTITY")
+    cur.execute(
+        """
+        INSERT INTO contatos (nome, telefone, email, mensagem, data_envio, lido, arquivado)
+        SELECT 'Visitante ' || g,
+               '(11) 9' || lpad((g %% 100000000)::text, 8, '0'),
+               'visitante' || g || '@exemplo.com',
+               repeat('Olá, gostaria de um orçamento para um ensaio. ', 1 + g %% 8),
+               now() - (random() * INTERVAL '730 days'),
+               random() < 0.6,
+               random() < 0.2
+        FROM generate_series(1, %s) AS g
+        """,
+        (quantidade,),
+    )
+    cur.execute("ANALYZE contatos")
+    cur.connection.commit()
+
+
+def medir(requisicao, repeticoes, aquecimento, concorrencia):
+    """
+    Executa `requisicao(i)` repetidas vezes e calcula latência e vazão.
+
+    Args:
+        requisicao (function): Recebe o número da execução e retorna a resposta.
+        repeticoes (int): Execuções medidas.
+        aquecimento (int): Execuções descartadas antes da medição.
+        concorrencia (int): Threads fazendo requisições ao mesmo tempo.
+
+    Returns:
+        dict: Latências em ms (média, p50, p95, p99, máx.), req/s e contagem de status.
+    """
+    for i in range(aquecimento):
+        requisicao(-i - 1)
+
+    status = Counter()
+
+    def cronometrar(i):
+        inicio = time.perf_counter()
+        resposta = requisicao(i)
+        duracao = (time.perf_counter() - inicio) * 1000
+        return duracao, resposta.status_code
+
+    inicio = time.perf_counter()
+    if concorrencia > 1:
+        with ThreadPoolExecutor(concorrencia) as executor:
+            amostras = list(executor.map(cronometrar, range(repeticoes)))
+    else:
+        amostras = [cronometrar(i) for i in range(repeticoes)]
+    total = time.perf_counter() - inicio
+
+    latencias = sorted(duracao for duracao, _ in amostras)
+    status.update(str(codigo) for _, codigo in amostras)
+
+    def percentil(p):
+        return latencias[min(len(latencias) - 1, int(len(latencias) * p))]
+
+    return {
+        "requisicoes": repeticoes,
+        "concorrencia": concorrencia,
+        "media_ms": round(statistics.fmean(latencias), 3),
+        "p50_ms": round(percentil(0.50), 3),
+        "p95_ms": round(percentil(0.95), 3),
+        "p99_ms": round(percentil(0.99), 3),
+        "max_ms": round(latencias[-1], 3),
+        "req_s": round(repeticoes / total, 1),
+        "status": dict(status),
+    }
+
+
+def commit_atual():
+    """Retorna o hash curto do commit atual (ou 'desconhecido')."""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconhecido"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url", required=True, help="Banco de benchmark")
+    parser.add_argument(
+        "--preparar",
+        action="store_true",
+        help="Apaga e recria o schema public a partir de database/migration.sql "
+        '(apenas em bancos cujo nome contém "bench")',
+    )
+    parser.add_argument(
+        "--tamanhos",
+        default="1000,10000,100000",
+        help="Tamanhos da tabela contatos para o GET paginado (separados por vírgula)",
+    )
+    parser.add_argument("--repeticoes", type=int, default=200)
+    parser.add_argument("--aquecimento", type=int, default=20)
+    parser.add_argument("--concorrencia", type=int, default=1)
+    parser.add_argument("--fotos", type=int, default=18)
+    parser.add_argument("--latencia-cloudinary-ms", type=float, default=0)
+    parser.add_argument(
+        "--saida", default=os.path.join(RAIZ, "benchmarks", "resultados")
+    )
+    args = parser.parse_args()
+
+    if args.preparar:
+        if not banco_de_benchmark(args.database_url):
+            parser.error(
+                '--preparar apaga o schema public: o nome do banco precisa conter "bench"'
+            )
+        preparar_banco(args.database_url)
+
+    smtp = ServidorSMTPFalso().iniciar()
+
+    # O Config lê o ambiente na importação: tudo precisa estar definido antes
+    os.environ.update(
+        {
+            "DATABASE_URL": args.database_url,
+            "MAIL_SERVER": "127.0.0.1",
+            "MAIL_PORT": str(smtp.porta),
+            "MAIL_USE_TLS": "False",
+            "MAIL_USE_SSL": "False",
+            "MAIL_DEFAULT_SENDER": "bench@bench.local",
+            # Sem limite por IP: todas as requisições saem de 127.0.0.1
+            "CONTATOS_LIMITE_CAPACIDADE": "1000000000",
+            "CONTATOS_LIMITE_POR_MINUTO": "1000000000",
+        }
+    )
+    os.environ.pop("MAIL_USERNAME", None)
+
+    import cloudinary.api
+    from app import create_app
+    from database.database import get_cursor
+    from utils.token import gerar_token_jwt
+
+    cloudinary.api.resources_by_asset_folder = cloudinary_falso(
+        args.fotos, args.latencia_cloudinary_ms
+    )
+
+    app = create_app()
+    cliente = app.test_client()
+
+    with get_cursor() as cur:
+        popular_banco(cur)
+
+    with app.app_context():
+        autorizacao = {"Authorization": f"Bearer {gerar_token_jwt(1, 0)}"}
+
+    def executar(nome, requisicao):
+        print(f"  {nome} ...", end=" ", flush=True)
+        resultado = medir(
+            requisicao, args.repeticoes, args.aquecimento, args.concorrencia
+        )
+        print(
+            f"p50 {resultado['p50_ms']} ms | p95 {resultado['p95_ms']} ms | "
+            f"{resultado['req_s']} req/s | status {resultado['status']}"
+        )
+        cenarios[nome] = resultado
+
+    cenarios = {}
+    print("Executando cenários:")
+
+    with get_cursor() as cur:
+        popular_contatos(cur, 0)
+
+    executar(
+        "POST /api/contatos",
+        lambda i: cliente.post(
+            "/api/contatos",
+            json={
+                "nome": "Visitante Bench",
+                "telefone": "11999990000",
+                "email": "visitante@bench.local",
+                "mensagem": f"Mensagem de benchmark número {i} {time.perf_counter_ns()}",
+            },
+        ),
+    )
+
+    for tamanho in (int(t) for t in args.tamanhos.split(",")):
+        with get_cursor() as cur:
+            popular_contatos(cur, tamanho)
+
+        paginas = max(1, tamanho // 20)
+        executar(
+            f"GET /api/contatos pagina=1 (n={tamanho})",
+            lambda i: cliente.get(
+                "/api/contatos?pagina=1&por_pagina=20", headers=autorizacao
+            ),
+        )
+        executar(
+            f"GET /api/contatos pagina={paginas // 2} (n={tamanho})",
+            lambda i: cliente.get(
+                f"/api/contatos?pagina={paginas // 2}&por_pagina=20",
+                headers=autorizacao,
+            ),
+        )
+
+    executar(
+        "POST /api/cloudinary/fotos",
+        lambda i: cliente.post("/api/cloudinary/fotos", json={"pasta": "galeria"}),
+    )
+    executar("GET /api/formas-contato", lambda i: cliente.get("/api/formas-contato"))
+    executar(
+        "POST /api/auth/recuperar-senha",
+        lambda i: cliente.post(
+            "/api/auth/recuperar-senha", json={"email": EMAIL_FOTOGRAFO}
+        ),
+    )
+
+    resultado = {
+        "commit": commit_atual(),
+        "data": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "parametros": vars(args) | {"database_url": "(omitido)"},
+        "emails_recebidos": smtp.mensagens,
+        "cenarios": cenarios,
+    }
+
+    os.makedirs(args.saida, exist_ok=True)
+    caminho = os.path.join(
+        args.saida,
+        f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{resultado['commit']}.json",
+    )
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+
+    print(f"Resultados gravados em {caminho}")
+
+
+if __name__ == "__main__":
+    main()
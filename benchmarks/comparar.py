@@ -0,0 +1,71 @@
+"""
+comparar.py – Compara dois resultados de benchmarks/carga.py
+
+Mostra, por cenário, a variação de p50, p95 e req/s entre um resultado base e um
+novo resultado. Termina com código 1 se algum p95 piorar mais que o limite, para
+uso em scripts de CI.
+
+Uso:
+    python benchmarks/comparar.py resultados/base.json resultados/novo.json [--limite 10]
+"""
+
+import argparse
+import json
+import sys
+
+
+def variacao(antes, depois):
+    """Retorna a variação percentual de `antes` para `depois`."""
+    if not antes:
+        return 0.0
+    return (depois - antes) / antes * 100
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("base")
+    parser.add_argument("novo")
+    parser.add_argument(
+        "--limite",
+        type=float,
+        default=10.0,
+        help="Piora máxima aceita no p95, em porcentagem (padrão: 10)",
+    )
+    args = parser.parse_args()
+
+    with open(args.base, encoding="utf-8") as arquivo:
+        base = json.load(arquivo)
+    with open(args.novo, encoding="utf-8") as arquivo:
+        novo = json.load(arquivo)
+
+    print(f"base: {base['commit']} ({base['data']})")
+    print(f"novo: {novo['commit']} ({novo['data']})\n")
+    print(f"{'cenário':<46}{'p50 (ms)':>20}{'p95 (ms)':>20}{'req/s':>20}")
+
+    regressoes = []
+
+    for nome, depois in novo["cenarios"].items():
+        antes = base["cenarios"].get(nome)
+        if antes is None:
+            print(f"{nome:<46}{'(novo cenário)':>20}")
+            continue
+
+        colunas = []
+        for campo in ("p50_ms", "p95_ms", "req_s"):
+            delta = variacao(antes[campo], depois[campo])
+            colunas.append(f"{depois[campo]:>9} ({delta:+6.1f}%)")
+
+        print(f"{nome:<46}" + "".join(f"{coluna:>20}" for coluna in colunas))
+
+        if variacao(antes["p95_ms"], depois["p95_ms"]) > args.limite:
+            regressoes.append(nome)
+
+    if regressoes:
+        print(f"\np95 piorou mais de {args.limite}% em:")
+        for nome in regressoes:
+            print(f"  - {nome}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+json_serializacao.py – Micro-benchmark da serialização JSON das respostas
+
+Compara o tempo de `jsonify` com o provedor padrão do Flask (json da biblioteca
+padrão) e com o `ProvedorJSON` (orjson) para payloads representativos de
+`GET /api/cloudinary/fotos` e `GET /api/contatos`.
+
+Uso (na raiz do projeto):
+    python benchmarks/json_serializacao.py [repeticoes]
+"""
+
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+from decimal import Decimal
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from utils.json_provider import ProvedorJSON, orjson
+
+
+def payload_fotos():
+    """Página da galeria: 18 fotos (limite do get_fotos) e o cursor da próxima página."""
+    return {
+        "fotos": [
+            {
+                "url": f"https://res.cloudinary.com/demo/image/upload/v1700000000/galeria/casamentos/foto_{i:04d}.jpg",
+                "nome": f"galeria/casamentos/foto_{i:04d}",
+            }
+            for i in range(18)
+        ],
+        "proxima_pagina": "8edbc61040178db60b0973ca9494bf3a",
+    }
+
+
+def payload_contatos(por_pagina=100, com_datetime=True):
+    """Página de contatos (máximo de 100 por página), com datas como datetime ou texto."""
+    base = datetime(2026, 1, 1, 12, 0, 0)
+    dados = []
+    for i in range(por_pagina):
+        data_envio = base - timedelta(minutes=37 * i)
+        dados.append(
+            {
+                "id": 10000 - i,
+                "nome": f"Visitante Número {i}",
+                "data_envio": (
+                    data_envio
+                    if com_datetime
+                    else data_envio.strftime("%a, %d %b %Y %H:%M:%S GMT")
+                ),
+                "data_formatada": data_envio.strftime("%d/%m/%Y %H:%M"),
+                "telefone": "(11) 99999-0000",
+                "email": f"visitante{i}@exemplo.com.br",
+                "mensagem": "Olá! Gostaria de um orçamento para ensaio fotográfico. "
+                * 6,
+                "lido": i % 3 == 0,
+                "arquivado": False,
+            }
+        )
+    return {
+        "dados": dados,
+        "pagina": 1,
+        "por_pagina": por_pagina,
+        "total": 4321,
+        "total_paginas": 44,
+    }
+
+
+def payload_tipos():
+    """Objetos com Decimal e UUID, tratados pelo provedor sem conversão manual."""
+    return {
+        "itens": [
+            {"id": uuid.uuid4(), "valor": Decimal("1234.50"), "criado": datetime.now()}
+            for _ in range(100)
+        ]
+    }
+
+
+def medir(app, payload, repeticoes):
+    """Retorna o tempo médio (µs) de uma chamada a `app.json.response(payload)`."""
+    with app.app_context():
+        tempo = timeit.timeit(lambda: app.json.response(payload), number=repeticoes)
+    return tempo / repeticoes * 1_000_000
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    padrao = Flask("padrao")
+    padrao.json = DefaultJSONProvider(padrao)
+
+    rapido = Flask("rapido")
+    rapido.json = ProvedorJSON(rapido)
+
+    cenarios = {
+        "get_fotos (18 fotos)": payload_fotos(),
+        "listar_contatos (100, datetime)": payload_contatos(),
+        "listar_contatos (100, texto)": payload_contatos(com_datetime=False),
+        "Decimal/UUID (100)": payload_tipos(),
+    }
+
+    print(f"orjson: {orjson.__version__ if orjson else 'não instalado'}")
+    print(f"{'cenário':<34}{'padrão (µs)':>14}{'orjson (µs)':>14}{'ganho':>9}")
+
+    for nome, payload in cenarios.items():
+        # As duas implementações precisam gerar o mesmo JSON
+        with padrao.app_context(), rapido.app_context():
+            assert padrao.json.loads(padrao.json.response(payload).data) == (
+                rapido.json.loads(rapido.json.response(payload).data)
+            ), nome
+
+        antes = medir(padrao, payload, repeticoes)
+        depois = medir(rapido, payload, repeticoes)
+        print(f"{nome:<34}{antes:>14.1f}{depois:>14.1f}{antes / depois:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
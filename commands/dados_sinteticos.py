@@ -0,0 +1,352 @@
+from database.database import criar_conexao
+from services.logs import manter_particoes_logs
+from datetime import date, datetime, timedelta
+from flask import current_app
+from itertools import accumulate
+import click
+import random
+import time
+import uuid
+
+# Tipos de log com o peso (frequência relativa), URL e método de cada um,
+# aproximando a proporção de uma semana real de tráfego
+_TIPOS_LOG = (
+    ("Requisição de Galeria", 40, "/api/cloudinary/fotos", "POST"),
+    ("Galeria Recuperada", 38, "/api/cloudinary/fotos", "POST"),
+    ("Formas de Contato Públicas Listadas", 10, "/api/formas-contato", "GET"),
+    ("Contato Criado", 3, "/api/contatos", "POST"),
+    ("Contatos Listados", 3, "/api/contatos", "GET"),
+    ("Erro de Validação", 2, "/api/contatos", "POST"),
+    ("Login bem-sucedido", 1, "/api/auth/login", "POST"),
+    ("Login falhou", 1, "/api/auth/login", "POST"),
+    ("Erro ao Buscar Fotos", 1, "/api/cloudinary/fotos", "POST"),
+    ("Logout realizado", 1, "/api/auth/logout", "POST"),
+)
+
+_USER_AGENTS = (
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_4 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.4 Mobile/15E148 Safari/604.1",
+    "Mozilla/5.0 (Linux; Android 14; SM-S918B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Mobile Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_4) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.4 Safari/605.1.15",
+    "Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)",
+)
+
+_NOMES = (
+    "Ana",
+    "Bruno",
+    "Carla",
+    "Diego",
+    "Eduarda",
+    "Felipe",
+    "Gabriela",
+    "Henrique",
+    "Isabela",
+    "João",
+    "Larissa",
+    "Marcos",
+    "Natália",
+    "Otávio",
+    "Patrícia",
+    "Rafael",
+)
+
+_SOBRENOMES = (
+    "Silva",
+    "Santos",
+    "Oliveira",
+    "Souza",
+    "Lima",
+    "Pereira",
+    "Costa",
+    "Almeida",
+    "Ferreira",
+    "Rodrigues",
+    "Gomes",
+    "Martins",
+)
+
+_MENSAGENS = (
+    "Olá! Gostaria de um orçamento para ensaio de casamento.",
+    "Vocês fazem cobertura de aniversário de 15 anos? Qual o valor?",
+    "Quero agendar um ensaio gestante para o próximo mês.",
+    "Tenho interesse em fotos corporativas para a equipe da minha empresa.",
+    "Qual a disponibilidade para um ensaio de família no fim de semana?",
+)
+
+# Peso de cada hora do dia (0-23): pouco tráfego de madrugada, pico à noite
+_PESOS_HORA = (
+    1,
+    1,
+    1,
+    1,
+    1,
+    2,
+    3,
+    5,
+    7,
+    8,
+    8,
+    8,
+    9,
+    9,
+    8,
+    8,
+    8,
+    9,
+    10,
+    12,
+    12,
+    10,
+    6,
+    3,
+)
+
+# Pesos acumulados, calculados uma vez (random.choices os recalcularia a cada linha)
+_HORAS_ACUMULADAS = list(accumulate(_PESOS_HORA))
+_TIPOS_LOG_ACUMULADOS = list(accumulate(tipo[1] for tipo in _TIPOS_LOG))
+
+
+class GeradorDados:
+    """
+    Gera linhas sintéticas determinísticas (mesma semente, mesmos dados).
+
+    As datas seguem uma distribuição exponencial a partir de `agora` (dados
+    recentes são mais densos, como em uma tabela que cresce com o tráfego) e
+    uma curva de horários ao longo do dia.
+    """
+
+    def __init__(self, semente, dias, agora):
+        self.rng = random.Random(semente)
+        self.dias = dias
+        self.agora = agora
+
+    def data(self):
+        """Data aleatória nos últimos `dias` dias, mais densa perto de hoje."""
+        idade_dias = min(self.rng.expovariate(3 / self.dias), self.dias - 1)
+        dia = (self.agora - timedelta(days=idade_dias)).date()
+        hora = self.rng.choices(range(24), cum_weights=_HORAS_ACUMULADAS)[0]
+        return datetime(
+            dia.year,
+            dia.month,
+            dia.day,
+            hora,
+            self.rng.randrange(60),
+            self.rng.randrange(60),
+            self.rng.randrange(1_000_000),
+        )
+
+    def uuid(self):
+        """UUID4 derivado da semente (reprodutível)."""
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def ip(self):
+        """IPv4 público aleatório."""
+        return f"{self.rng.randint(1, 223)}.{self.rng.randrange(256)}.{self.rng.randrange(256)}.{self.rng.randint(1, 254)}"
+
+    def contato(self):
+        """Linha para `contatos (nome, telefone, email, mensagem, data_envio, lido, arquivado)`."""
+        nome = f"{self.rng.choice(_NOMES)} {self.rng.choice(_SOBRENOMES)}"
+        data_envio = self.data()
+        idade = (self.agora - data_envio).days
+        # Contatos antigos quase sempre já foram lidos; parte deles arquivada
+        lido = idade > 7 or self.rng.random() < 0.3
+        arquivado = lido and idade > 30 and self.rng.random() < 0.7
+        return (
+            nome,
+            f"({self.rng.randint(11, 99)}) 9{self.rng.randrange(10**8):08d}",
+            f"{nome.split()[0].lower()}.{self.rng.randrange(10**6)}@exemplo.com",
+            " ".join(self.rng.choices(_MENSAGENS, k=self.rng.randint(1, 3))),
+            data_envio,
+            lido,
+            arquivado,
+        )
+
+    def log(self):
+        """Linha para `logs (tipo_log, data_hora, ip_usuario, user_agent, url, metodo, status)`."""
+        tipo, _, url, metodo = self.rng.choices(
+            _TIPOS_LOG, cum_weights=_TIPOS_LOG_ACUMULADOS
+        )[0]
+        return (
+            tipo,
+            self.data(),
+            self.ip(),
+            self.rng.choice(_USER_AGENTS),
+            url,
+            metodo,
+            "Gerado pelo gerar-dados",
+        )
+
+    def denylist(self):
+        """Linha para `tokens_denylist (token_jti, fotografo_id, data_denylist, motivo, expira_em)`."""
+        data = self.data()
+        return (
+            str(self.uuid()),
+            1,
+            data,
+            self.rng.choices(("logout", "logout_todos", "reuso"), weights=(90, 8, 2))[
+                0
+            ],
+            data + timedelta(minutes=self.rng.randint(1, 15)),
+        )
+
+    def token_recuperacao(self):
+        """Linha para `tokens_recuperacao (token_hash, fotografo_id, usado, criado_em)`."""
+        return (self.rng.randbytes(32), 1, self.rng.random() < 0.8, self.data())
+
+
+# Tabela, colunas e método gerador de cada tipo de dado
+_TABELAS = {
+    "contatos": (
+        "contatos",
+        "nome, telefone, email, mensagem, data_envio, lido, arquivado",
+        GeradorDados.contato,
+    ),
+    "logs": (
+        "logs",
+        "tipo_log, data_hora, ip_usuario, user_agent, url, metodo, status",
+        GeradorDados.log,
+    ),
+    "denylist": (
+        "tokens_denylist",
+        "token_jti, fotografo_id, data_denylist, motivo, expira_em",
+        GeradorDados.denylist,
+    ),
+    "tokens-recuperacao": (
+        "tokens_recuperacao",
+        "token_hash, fotografo_id, usado, criado_em",
+        GeradorDados.token_recuperacao,
+    ),
+}
+
+
+def carregar_tabela(conexao, gerador, tipo, quantidade, tamanho_lote):
+    """
+    Carrega `quantidade` linhas sintéticas via COPY, em lotes de `tamanho_lote`.
+
+    Cada lote é um COPY em sua própria transação, de modo que a memória usada
+    não cresce com o volume e uma interrupção preserva os lotes já gravados.
+
+    Args:
+        conexao (psycopg.Connection): Conexão dedicada ao carregamento.
+        gerador (GeradorDados): Gerador com a semente configurada.
+        tipo (str): Chave de `_TABELAS` ('contatos', 'logs', ...).
+        quantidade (int): Total de linhas.
+        tamanho_lote (int): Linhas por COPY/commit.
+
+    Returns:
+        None
+    """
+    tabela, colunas, gerar_linha = _TABELAS[tipo]
+    inicio = time.perf_counter()
+    carregadas = 0
+
+    while carregadas < quantidade:
+        lote = min(tamanho_lote, quantidade - carregadas)
+
+        with conexao.cursor() as cur:
+            with cur.copy(f"COPY {tabela} ({colunas}) FROM STDIN") as copy:
+                for _ in range(lote):
+                    copy.write_row(gerar_linha(gerador))
+        conexao.commit()
+
+        carregadas += lote
+        click.echo(
+            f"  {tabela}: {carregadas}/{quantidade} linhas "
+            f"({carregadas / (time.perf_counter() - inicio):,.0f} linhas/s)"
+        )
+
+    with conexao.cursor() as cur:
+        cur.execute(f"ANALYZE {tabela}")
+    conexao.commit()
+
+
+@click.command("gerar-dados")
+@click.option(
+    "--contatos", default=100_000, show_default=True, help="Linhas em contatos"
+)
+@click.option("--logs", default=1_000_000, show_default=True, help="Linhas em logs")
+@click.option(
+    "--denylist", default=50_000, show_default=True, help="Linhas em tokens_denylist"
+)
+@click.option(
+    "--tokens-recuperacao",
+    default=10_000,
+    show_default=True,
+    help="Linhas em tokens_recuperacao",
+)
+@click.option(
+    "--dias",
+    default=365,
+    show_default=True,
+    type=click.IntRange(1),
+    help="Período coberto pelas datas",
+)
+@click.option(
+    "--semente", default=42, show_default=True, help="Semente do gerador aleatório"
+)
+@click.option(
+    "--lote",
+    default=50_000,
+    show_default=True,
+    type=click.IntRange(1),
+    help="Linhas por COPY/commit",
+)
+def gerar_dados(contatos, logs, denylist, tokens_recuperacao, dias, semente, lote):
+    """
+    Carrega dados sintéticos realistas para testes de volume (contatos, logs,
+    tokens_denylist e tokens_recuperacao) usando COPY em lotes.
+
+    Os dados são acrescentados às tabelas existentes. Use apenas em bancos de
+    desenvolvimento ou de benchmark. Com `LOGS_RETENCAO_MESES` > 0, `--dias`
+    não pode ir além da retenção: os logs mais antigos seriam apagados na
+    próxima manutenção das partições.
+
+    Exemplo:
+        flask --app app gerar-dados --contatos 2000000 --logs 10000000
+    """
+    gerador = GeradorDados(semente, dias, datetime.now())
+    retencao = current_app.config["LOGS_RETENCAO_MESES"]
+
+    if logs > 0 and retencao > 0:
+        # Mesmo limite de remover_particoes_logs: início do mês atual - retenção
+        mes = gerador.agora.year * 12 + gerador.agora.month - 1 - retencao
+        limite = date(mes // 12, mes % 12 + 1, 1)
+        if (gerador.agora - timedelta(days=dias)).date() < limite:
+            raise click.ClickException(
+                f"--dias {dias} gera logs anteriores a {limite:%d/%m/%Y}, que seriam "
+                f"apagados pela retenção (LOGS_RETENCAO_MESES={retencao}). Use um "
+                f"--dias menor ou aumente LOGS_RETENCAO_MESES."
+            )
+    quantidades = {
+        "contatos": contatos,
+        "logs": logs,
+        "denylist": denylist,
+        "tokens-recuperacao": tokens_recuperacao,
+    }
+
+    with criar_conexao() as conexao:
+        # Denylist e tokens de recuperação referenciam o fotógrafo (id = 1)
+        with conexao.cursor() as cur:
+            cur.execute("SELECT 1 FROM fotografo WHERE id = 1")
+            existe_fotografo = cur.fetchone() is not None
+
+        if not existe_fotografo and (denylist or tokens_recuperacao):
+            raise click.ClickException(
+                "Cadastre o fotógrafo (id = 1) antes de gerar denylist e tokens de recuperação."
+            )
+
+        # Logs antigos precisam das partições dos meses cobertos por --dias
+        if logs > 0:
+            manter_particoes_logs(
+                conexao,
+                current_app.config["LOGS_PARTICOES_FUTURAS"],
+                0,
+                desde=(gerador.agora - timedelta(days=dias)).date(),
+            )
+
+        for tipo, quantidade in quantidades.items():
+            if quantidade > 0:
+                click.echo(f"Gerando {quantidade} linhas ({tipo})...")
+                carregar_tabela(conexao, gerador, tipo, quantidade, lote)
+
+    click.echo("Dados sintéticos carregados.")
@@ -0,0 +1,43 @@
+from database.database import criar_conexao
+from services.estatisticas import atualizar_estatisticas, recalcular_estatisticas
+from flask import current_app
+from flask.cli import with_appcontext
+import click
+
+
+@click.command("atualizar-estatisticas")
+@click.option(
+    "--recalcular",
+    is_flag=True,
+    help="Zera os resumos e os reconstrói a partir de todo o histórico",
+)
+@with_appcontext
+def atualizar_estatisticas_comando(recalcular):
+    """
+    Atualiza as tabelas de resumo do painel (/api/estatisticas) com as linhas
+    novas de contatos e logs, a partir da última marca processada.
+
+    A mesma atualização roda em segundo plano na aplicação quando
+    `ESTATISTICAS_ATUALIZACAO_AUTOMATICA=True`.
+
+    Exemplo:
+        flask --app app atualizar-estatisticas --recalcular
+    """
+    with criar_conexao() as conexao:
+        if recalcular:
+            recalcular_estatisticas(conexao)
+            click.echo("Resumos zerados; reconstruindo...")
+
+        processados = atualizar_estatisticas(
+            conexao, current_app.config["ESTATISTICAS_ATRASO_SEGUNDOS"]
+        )
+
+    if processados is None:
+        raise click.ClickException(
+            "Outro processo está atualizando as estatísticas; tente novamente."
+        )
+
+    click.echo(
+        f"Estatísticas atualizadas: {processados['contatos']} contato(s) e "
+        f"{processados['logs']} log(s) processados."
+    )
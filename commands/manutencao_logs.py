@@ -0,0 +1,43 @@
+from database.database import criar_conexao
+from services.logs import manter_particoes_logs
+from flask import current_app
+from flask.cli import with_appcontext
+import click
+
+
+@click.command("manter-logs")
+@click.option(
+    "--meses-a-frente",
+    type=int,
+    help="Meses futuros com partição criada (padrão: LOGS_PARTICOES_FUTURAS)",
+)
+@click.option(
+    "--retencao",
+    type=int,
+    help="Meses de logs mantidos, 0 mantém todos (padrão: LOGS_RETENCAO_MESES)",
+)
+@with_appcontext
+def manter_logs(meses_a_frente, retencao):
+    """
+    Cria as partições mensais futuras da tabela `logs` e remove (DROP) as
+    partições mais antigas que a retenção.
+
+    A mesma manutenção roda em segundo plano na aplicação quando
+    `LOGS_MANUTENCAO_AUTOMATICA=True`; este comando é para cron ou execução manual.
+
+    Exemplo:
+        flask --app app manter-logs --retencao 6
+    """
+    config = current_app.config
+    if meses_a_frente is None:
+        meses_a_frente = config["LOGS_PARTICOES_FUTURAS"]
+    if retencao is None:
+        retencao = config["LOGS_RETENCAO_MESES"]
+
+    with criar_conexao() as conexao:
+        resultado = manter_particoes_logs(conexao, meses_a_frente, retencao)
+
+    click.echo(
+        f"Partições de logs: {resultado['criadas']} criada(s), "
+        f"{resultado['removidas']} removida(s)."
+    )
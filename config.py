@@ -7,6 +7,16 @@ com valores carregados das variáveis de ambiente (.env).
 As configurações são agrupadas por categoria:
     - Flask
     - JWT
+    - Limite de tentativas de login
+    - Formulário de contato (limite por IP e antispam)
+    - Compressão das respostas
+    - Métricas
+    - Profiling sob demanda
+    - Tracing
+    - Logs (política de gravação, partições e retenção)
+    - Estatísticas do painel
+    - Visualizações de fotos
+    - Modo assíncrono (ASGI)
     - E-mail
     - Banco de dados
     - Cloudinary
@@ -32,11 +42,196 @@ class Config:
     # ========================
     SECRET_KEY = os.getenv("FLASK_SECRET_KEY", "fallback-secret-key")
     FLASK_DEBUG = os.getenv("FLASK_DEBUG", "False").lower() == "true"
+    # Fuso usado nas datas formatadas pelo banco (as datas são gravadas em UTC)
+    FUSO_HORARIO = os.getenv("FUSO_HORARIO", "UTC")
+    # Tamanho máximo do corpo das requisições (bytes); acima disso a resposta é 413
+    MAX_CONTENT_LENGTH = int(os.getenv("MAX_CONTENT_LENGTH", str(1024 * 1024)))
 
     # ========================
     # Configurações do JWT
     # ========================
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "fallback-jwt-secret")
+    # Modo de revogação de tokens: "denylist" (consulta por JTI a cada requisição)
+    # ou "epoca" (compara a claim token_epoch com a época atual do fotógrafo)
+    JWT_MODO_REVOGACAO = os.getenv("JWT_MODO_REVOGACAO", "denylist")
+    # Tempo (s) que a época do fotógrafo fica em cache em cada processo
+    JWT_EPOCA_CACHE_SEGUNDOS = int(os.getenv("JWT_EPOCA_CACHE_SEGUNDOS", "30"))
+    # Validade do token de acesso (minutos) e do refresh token rotativo (dias)
+    JWT_ACCESS_TOKEN_MINUTOS = int(os.getenv("JWT_ACCESS_TOKEN_MINUTOS", "15"))
+    JWT_REFRESH_TOKEN_DIAS = int(os.getenv("JWT_REFRESH_TOKEN_DIAS", "7"))
+
+    # ========================
+    # Limite de tentativas de login
+    # ========================
+    # Backend das contagens: "memoria" (por processo) ou "postgres" (compartilhado)
+    LOGIN_LIMITE_BACKEND = os.getenv("LOGIN_LIMITE_BACKEND", "memoria")
+    LOGIN_LIMITE_IP = int(os.getenv("LOGIN_LIMITE_IP", "20"))
+    LOGIN_LIMITE_EMAIL = int(os.getenv("LOGIN_LIMITE_EMAIL", "5"))
+    LOGIN_JANELA_SEGUNDOS = int(os.getenv("LOGIN_JANELA_SEGUNDOS", "300"))
+    # Falhas consecutivas a partir das quais cada tentativa espera 2^n segundos
+    LOGIN_FALHAS_ANTES_ATRASO = int(os.getenv("LOGIN_FALHAS_ANTES_ATRASO", "3"))
+    LOGIN_ATRASO_MAXIMO_SEGUNDOS = int(os.getenv("LOGIN_ATRASO_MAXIMO_SEGUNDOS", "900"))
+    # Backend postgres: falhas sem novidade há mais que isso são apagadas
+    LOGIN_FALHAS_RETENCAO_SEGUNDOS = int(
+        os.getenv("LOGIN_FALHAS_RETENCAO_SEGUNDOS", "86400")
+    )
+
+    # ========================
+    # Formulário de contato (limite por IP e antispam)
+    # ========================
+    # Balde de fichas por IP: rajada máxima e envios recuperados por minuto
+    CONTATOS_LIMITE_CAPACIDADE = int(os.getenv("CONTATOS_LIMITE_CAPACIDADE", "5"))
+    CONTATOS_LIMITE_POR_MINUTO = float(os.getenv("CONTATOS_LIMITE_POR_MINUTO", "2"))
+    # Campo invisível do formulário que só robôs preenchem
+    ANTISPAM_CAMPO_HONEYPOT = os.getenv("ANTISPAM_CAMPO_HONEYPOT", "site")
+    ANTISPAM_TEMPO_MINIMO_SEGUNDOS = int(
+        os.getenv("ANTISPAM_TEMPO_MINIMO_SEGUNDOS", "3")
+    )
+    ANTISPAM_MAX_LINKS = int(os.getenv("ANTISPAM_MAX_LINKS", "2"))
+    ANTISPAM_JANELA_DUPLICADOS_SEGUNDOS = int(
+        os.getenv("ANTISPAM_JANELA_DUPLICADOS_SEGUNDOS", "600")
+    )
+    # Respostas guardadas para reenvios com a mesma chave (Idempotency-Key)
+    IDEMPOTENCIA_TTL_SEGUNDOS = int(os.getenv("IDEMPOTENCIA_TTL_SEGUNDOS", "86400"))
+    IDEMPOTENCIA_MAX_CHAVES = int(os.getenv("IDEMPOTENCIA_MAX_CHAVES", "10000"))
+    # Modo de gravação dos contatos: "direto" (INSERT na requisição) ou "journal"
+    # (grava em disco local e um drenador em segundo plano insere em lotes no banco)
+    CONTATOS_MODO_INGESTAO = os.getenv("CONTATOS_MODO_INGESTAO", "direto")
+    JOURNAL_DIR = os.getenv("JOURNAL_DIR", "journal")
+    JOURNAL_TAMANHO_SEGMENTO = int(
+        os.getenv("JOURNAL_TAMANHO_SEGMENTO", str(4 * 1024 * 1024))
+    )
+    JOURNAL_TAMANHO_LOTE = int(os.getenv("JOURNAL_TAMANHO_LOTE", "500"))
+    JOURNAL_INTERVALO_SEGUNDOS = float(os.getenv("JOURNAL_INTERVALO_SEGUNDOS", "1"))
+    # Feed SSE de novos contatos: "memoria" (um processo) ou "postgres" (LISTEN/NOTIFY
+    # entre workers) e intervalo dos heartbeats
+    EVENTOS_BACKEND = os.getenv("EVENTOS_BACKEND", "memoria")
+    EVENTOS_HEARTBEAT_SEGUNDOS = int(os.getenv("EVENTOS_HEARTBEAT_SEGUNDOS", "15"))
+
+    # ========================
+    # Compressão das respostas (/api/*)
+    # ========================
+    COMPRESSAO_ATIVA = os.getenv("COMPRESSAO_ATIVA", "True").lower() == "true"
+    # Respostas menores que isso (bytes) são enviadas sem compressão
+    COMPRESSAO_TAMANHO_MINIMO = int(os.getenv("COMPRESSAO_TAMANHO_MINIMO", "500"))
+    COMPRESSAO_NIVEL_GZIP = int(os.getenv("COMPRESSAO_NIVEL_GZIP", "6"))
+    COMPRESSAO_NIVEL_BROTLI = int(os.getenv("COMPRESSAO_NIVEL_BROTLI", "5"))
+    # Endpoints cujas respostas se repetem e têm o corpo comprimido guardado em cache
+    COMPRESSAO_ENDPOINTS_CACHE = os.getenv(
+        "COMPRESSAO_ENDPOINTS_CACHE",
+        "cloudinaryapi.get_fotos,formas_contato.listar_formas_contato_publico",
+    ).split(",")
+    COMPRESSAO_CACHE_MAX_ENTRADAS = int(
+        os.getenv("COMPRESSAO_CACHE_MAX_ENTRADAS", "256")
+    )
+
+    # ========================
+    # Métricas (/metrics)
+    # ========================
+    METRICAS_ATIVAS = os.getenv("METRICAS_ATIVAS", "True").lower() == "true"
+    # Token estático do coletor (Prometheus); sem ele, /metrics exige o JWT do fotógrafo
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+    # Consultas SQL acima deste tempo (ms) vão para o log de consultas lentas,
+    # com o plano de execução (EXPLAIN) dos SELECTs se SQL_LENTA_EXPLAIN=True
+    SQL_LENTA_LIMITE_MS = float(os.getenv("SQL_LENTA_LIMITE_MS", "200"))
+    SQL_LENTA_EXPLAIN = os.getenv("SQL_LENTA_EXPLAIN", "False").lower() == "true"
+
+    # ========================
+    # Profiling sob demanda
+    # ========================
+    # Desativado, nenhum hook é registrado (custo zero por requisição)
+    PROFILING_ATIVO = os.getenv("PROFILING_ATIVO", "False").lower() == "true"
+    # Segredo do HMAC do cabeçalho X-Profile (sem ele, apenas a amostragem dispara)
+    PROFILING_SEGREDO = os.getenv("PROFILING_SEGREDO")
+    # Fração das requisições perfiladas por sorteio (0 desativa a amostragem)
+    PROFILING_TAXA_AMOSTRAGEM = float(os.getenv("PROFILING_TAXA_AMOSTRAGEM", "0"))
+    PROFILING_MAX_RESULTADOS = int(os.getenv("PROFILING_MAX_RESULTADOS", "20"))
+
+    # ========================
+    # Tracing (spans por requisição)
+    # ========================
+    TRACING_ATIVO = os.getenv("TRACING_ATIVO", "False").lower() == "true"
+    # Destino dos spans: "" (nenhum, só Server-Timing), "jsonl" ou "otlp"
+    TRACING_EXPORTADOR = os.getenv("TRACING_EXPORTADOR", "")
+    TRACING_ARQUIVO = os.getenv("TRACING_ARQUIVO", "traces.jsonl")
+    TRACING_OTLP_ENDPOINT = os.getenv("TRACING_OTLP_ENDPOINT", "http://localhost:4318")
+    TRACING_NOME_SERVICO = os.getenv("TRACING_NOME_SERVICO", "portfolio-fotografo")
+    # Adiciona o cabeçalho Server-Timing com o tempo por serviço
+    TRACING_SERVER_TIMING = os.getenv("TRACING_SERVER_TIMING", "True").lower() == "true"
+
+    # ========================
+    # Logs (tabela particionada por mês)
+    # ========================
+    # Meses futuros com partição criada antecipadamente
+    LOGS_PARTICOES_FUTURAS = int(os.getenv("LOGS_PARTICOES_FUTURAS", "3"))
+    # Meses de logs mantidos; partições mais antigas são removidas. O padrão 0
+    # mantém todos: a remoção só acontece se o operador definir a retenção
+    LOGS_RETENCAO_MESES = int(os.getenv("LOGS_RETENCAO_MESES", "0"))
+    # Executa a manutenção das partições em segundo plano (além do comando manter-logs)
+    LOGS_MANUTENCAO_AUTOMATICA = (
+        os.getenv("LOGS_MANUTENCAO_AUTOMATICA", "True").lower() == "true"
+    )
+    LOGS_MANUTENCAO_INTERVALO_HORAS = float(
+        os.getenv("LOGS_MANUTENCAO_INTERVALO_HORAS", "24")
+    )
+    # Política de gravação do registrar_log (erros e autenticação são sempre gravados):
+    # nível mínimo ("debug", "info", "aviso", "erro"), fração gravada por tipo_log
+    # e máximo de linhas por minuto e processo por tipo_log ("Tipo=valor,Tipo=valor")
+    LOGS_NIVEL_MINIMO = os.getenv("LOGS_NIVEL_MINIMO", "info")
+    LOGS_AMOSTRAGEM = os.getenv(
+        "LOGS_AMOSTRAGEM",
+        "Galeria Recuperada=0.1,Formas de Contato Públicas Listadas=0.1",
+    )
+    LOGS_LIMITE_POR_MINUTO = os.getenv(
+        "LOGS_LIMITE_POR_MINUTO",
+        "Erro de Validação=60,Formas de Contato Públicas Listadas=30",
+    )
+    # Intervalo máximo (dias) das agregações de /api/logs
+    LOGS_CONSULTA_MAX_DIAS = int(os.getenv("LOGS_CONSULTA_MAX_DIAS", "31"))
+
+    # ========================
+    # Estatísticas do painel (/api/estatisticas)
+    # ========================
+    # Atualiza os resumos em segundo plano (além do comando atualizar-estatisticas)
+    ESTATISTICAS_ATUALIZACAO_AUTOMATICA = (
+        os.getenv("ESTATISTICAS_ATUALIZACAO_AUTOMATICA", "True").lower() == "true"
+    )
+    ESTATISTICAS_INTERVALO_SEGUNDOS = int(
+        os.getenv("ESTATISTICAS_INTERVALO_SEGUNDOS", "300")
+    )
+    # Linhas inseridas há menos que isso ficam para a próxima atualização (transações em curso)
+    ESTATISTICAS_ATRASO_SEGUNDOS = int(os.getenv("ESTATISTICAS_ATRASO_SEGUNDOS", "30"))
+
+    # ========================
+    # Visualizações de fotos
+    # ========================
+    # Intervalo entre as gravações em lote das visualizações acumuladas em memória
+    VISUALIZACOES_INTERVALO_SEGUNDOS = float(
+        os.getenv("VISUALIZACOES_INTERVALO_SEGUNDOS", "10")
+    )
+    # Fotos distintas pendentes por processo (acima disso, novas são descartadas)
+    VISUALIZACOES_MAX_FOTOS = int(os.getenv("VISUALIZACOES_MAX_FOTOS", "10000"))
+    # Pastas da galeria aceitas (prefixos do public_id, separados por vírgula; vazio aceita todas)
+    VISUALIZACOES_PREFIXOS = os.getenv("VISUALIZACOES_PREFIXOS", "")
+    # Balde de fichas por IP da rota de visualizações: rajada máxima e requisições por minuto
+    VISUALIZACOES_LIMITE_CAPACIDADE = int(
+        os.getenv("VISUALIZACOES_LIMITE_CAPACIDADE", "30")
+    )
+    VISUALIZACOES_LIMITE_POR_MINUTO = float(
+        os.getenv("VISUALIZACOES_LIMITE_POR_MINUTO", "60")
+    )
+
+    # ========================
+    # Modo assíncrono (ASGI, asgi.py)
+    # ========================
+    # Conexões do pool assíncrono usado pelas rotas da galeria e de contato
+    ASGI_POOL_MIN = int(os.getenv("ASGI_POOL_MIN", "2"))
+    ASGI_POOL_MAX = int(os.getenv("ASGI_POOL_MAX", "20"))
+    # Conexões simultâneas do cliente HTTP com a API do Cloudinary
+    ASGI_HTTP_MAX_CONEXOES = int(os.getenv("ASGI_HTTP_MAX_CONEXOES", "100"))
+    # Threads que atendem as demais rotas pela aplicação WSGI (cada stream SSE ocupa uma)
+    ASGI_THREADS_WSGI = int(os.getenv("ASGI_THREADS_WSGI", "32"))
 
     # ========================
     # Configurações de E-mail (Flask-Mail)
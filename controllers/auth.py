@@ -1,4 +1,4 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt
 from services.auth_service import (
     login_usuario,
@@ -10,6 +10,15 @@ from services.auth_service import (
 )
 from database.database import get_cursor, connection
 from services.email_service import enviar_email_recuperacao
+from services.limitador import obter_limitador_login
+from services.token_service import (
+    revogar_token,
+    incrementar_epoca_token,
+    registrar_epoca_token,
+    rotacionar_refresh_token,
+    revogar_familia_refresh,
+)
+from utils.token import gerar_hash_token
 import bcrypt
 
 # Define o blueprint de autenticação, agrupando rotas de login e cadastro
@@ -43,9 +52,12 @@ def login():
         schema:
           type: object
           properties:
-            access_token:
+            token:
+              type: string
+              description: Token JWT de acesso (validade em JWT_ACCESS_TOKEN_MINUTOS)
+            refresh_token:
               type: string
-              description: Token JWT válido por 30 minutos
+              description: Refresh token de uso único para /api/auth/refresh
             id:
               type: integer
               description: ID do fotógrafo
@@ -59,6 +71,10 @@ def login():
         description: Credenciais inválidas
         examples:
           {"erro": "E-mail ou senha incorretos"}
+      429:
+        description: Muitas tentativas. O cabeçalho Retry-After indica quantos segundos aguardar.
+        examples:
+          {"erro": "Muitas tentativas de login. Tente novamente mais tarde."}
     """
 
     data = request.get_json()
@@ -68,8 +84,36 @@ def login():
     if not email or not senha:
         return jsonify({"erro": "Email e senha são obrigatórios"}), 400
 
+    # O limite é verificado antes de qualquer consulta ao usuário ou bcrypt
+    limitador = obter_limitador_login()
+    ip_usuario = request.remote_addr
+
+    try:
+        espera = limitador.verificar(ip_usuario, email)
+    except Exception as e:
+        # Em caso de erro no backend do limite, não bloqueia o login
+        connection.rollback()
+        print(f"Erro ao verificar limite de login: {e}")
+        espera = 0
+
+    if espera:
+        resposta = jsonify(
+            {"erro": "Muitas tentativas de login. Tente novamente mais tarde."}
+        )
+        resposta.headers["Retry-After"] = str(espera)
+        return resposta, 429
+
     resultado = login_usuario(email, senha)
 
+    try:
+        if resultado.get("codigo") in (401, 404):
+            limitador.registrar_falha(ip_usuario, email)
+        elif not resultado.get("erro"):
+            limitador.registrar_sucesso(ip_usuario, email)
+    except Exception as e:
+        connection.rollback()
+        print(f"Erro ao registrar tentativa de login: {e}")
+
     if resultado.get("erro"):
         return jsonify({"erro": resultado["erro"]}), resultado["codigo"]
 
@@ -250,16 +294,24 @@ def resetar_senha():
         )
 
         with get_cursor() as cur:
+            # Incrementa a época de sessão: todos os tokens emitidos antes da troca deixam de valer
             cur.execute(
-                "UPDATE fotografo SET senha_hash = %s WHERE id = %s",
+                """
+                UPDATE fotografo SET senha_hash = %s, token_epoch = token_epoch + 1
+                WHERE id = %s
+                RETURNING token_epoch
+                """,
                 (senha_hash, fotografo_id),
             )
+            token_epoch = cur.fetchone()["token_epoch"]
             cur.execute(
-                "UPDATE tokens_recuperacao SET usado = TRUE WHERE token = %s",
-                (token,),
+                "UPDATE tokens_recuperacao SET usado = TRUE WHERE token_hash = %s",
+                (gerar_hash_token(token),),
             )
             cur.connection.commit()
 
+        registrar_epoca_token(fotografo_id, token_epoch)
+
         return (
             jsonify(
                 {
@@ -279,7 +331,11 @@ def resetar_senha():
 @jwt_required()
 def logout():
     """
-    Invalida o token atual adicionando-o à lista negra (denylist).
+    Invalida o token atual adicionando-o à lista negra (denylist) e revoga
+    os refresh tokens da mesma sessão.
+
+    No modo de revogação por época (`JWT_MODO_REVOGACAO = "epoca"`) o logout
+    incrementa a época de sessão do fotógrafo, encerrando todas as sessões.
 
     ---
     tags:
@@ -304,16 +360,108 @@ def logout():
         jti = token_data["jti"]
         fotografo_id = token_data["fotografo_id"]
 
-        with get_cursor() as cur:
-            cur.execute(
-                "INSERT INTO tokens_denylist (token_jti, fotografo_id, motivo) VALUES (%s, %s, %s)",
-                (jti, fotografo_id, "logout"),
-            )
-            cur.connection.commit()
+        if current_app.config["JWT_MODO_REVOGACAO"] == "epoca":
+            incrementar_epoca_token(int(fotografo_id))
+        else:
+            # A linha na denylist só precisa existir até o token expirar
+            revogar_token(jti, fotografo_id, token_data["exp"], "logout")
+            revogar_familia_refresh(token_data.get("familia"))
 
         registrar_log("Logout realizado", f"Token {jti[:8]}... invalidado")
         return jsonify({"sucesso": "Logout realizado com sucesso"}), 200
 
     except Exception as e:
+        connection.rollback()
+        registrar_log("Erro no logout", str(e))
+        return jsonify({"erro": "Erro interno no servidor"}), 500
+
+
+@auth_bp.route("/refresh", methods=["POST"])
+@jwt_required(refresh=True)
+def refresh():
+    """
+    Renova a sessão trocando o refresh token por um novo par de tokens.
+
+    O refresh token é de uso único: o reuso de um token já trocado revoga
+    todos os refresh tokens da sessão.
+
+    ---
+    tags:
+      - Autenticação
+    parameters:
+        - name: Authorization
+          in: header
+          description: Refresh token no formato `Bearer <refresh_token>`
+          required: true
+          type: string
+    responses:
+      200:
+        description: Sessão renovada. Retorna novo token de acesso e novo refresh token.
+        schema:
+          type: object
+          properties:
+            token:
+              type: string
+            refresh_token:
+              type: string
+      401:
+        description: Refresh token inválido, expirado, revogado ou reutilizado
+        examples:
+          {"erro": "Sessão inválida. Faça login novamente."}
+      500:
+        description: Erro interno ao renovar a sessão
+    """
+
+    try:
+        resultado = rotacionar_refresh_token(get_jwt())
+
+        if resultado.get("erro"):
+            if resultado.get("reuso"):
+                registrar_log(
+                    "Reuso de refresh token", "Família de refresh tokens revogada"
+                )
+            return jsonify({"erro": resultado["erro"]}), resultado["codigo"]
+
+        return jsonify(resultado), 200
+
+    except Exception as e:
+        connection.rollback()
+        registrar_log("Erro ao renovar sessão", str(e))
+        return jsonify({"erro": "Erro interno no servidor"}), 500
+
+
+@auth_bp.route("/logout-todos", methods=["POST"])
+@jwt_required()
+def logout_todos():
+    """
+    Encerra todas as sessões do fotógrafo incrementando sua época de sessão.
+
+    ---
+    tags:
+      - Autenticação
+    parameters:
+        - name: Authorization
+          in: header
+          description: Token JWT no formato `Bearer <token>`
+          required: true
+          type: string
+    responses:
+      200:
+        description: Todas as sessões foram encerradas
+        examples:
+          {"sucesso": "Todas as sessões foram encerradas"}
+      500:
+        description: Erro interno ao processar o logout
+    """
+
+    try:
+        fotografo_id = int(get_jwt()["fotografo_id"])
+        incrementar_epoca_token(fotografo_id)
+
+        registrar_log("Logout em todos os dispositivos", "Época de sessão incrementada")
+        return jsonify({"sucesso": "Todas as sessões foram encerradas"}), 200
+
+    except Exception as e:
+        connection.rollback()
         registrar_log("Erro no logout", str(e))
         return jsonify({"erro": "Erro interno no servidor"}), 500
@@ -1,8 +1,17 @@
 from flask import Blueprint, jsonify, request, current_app
+from flask_jwt_extended import jwt_required
 import cloudinary
 import cloudinary.api
+import math
+import psycopg
 from dotenv import load_dotenv
-from services.logs import registrar_log
+from database.database import connection, get_cursor
+from database.database_async import obter_pool
+from services.logs import registrar_log, registrar_log_async, AVISO
+from services.cloudinary_async import buscar_fotos_pasta
+from services.metricas import medir_upstream
+from services.visualizacoes import contador_visualizacoes
+from services.limitador import obter_limitador_visualizacoes
 
 load_dotenv()
 
@@ -70,7 +79,11 @@ def get_fotos():
         pasta = dados_requisicao.get("pasta") if dados_requisicao else None
 
         if not pasta:
-            registrar_log("Erro de Validação", "O parâmetro 'pasta' não foi informado")
+            registrar_log(
+                "Erro de Validação",
+                "O parâmetro 'pasta' não foi informado",
+                nivel=AVISO,
+            )
             return jsonify({"erro": "O parâmetro 'pasta' é obrigatório"}), 400
 
         registrar_log(
@@ -96,21 +109,10 @@ def get_fotos():
             options["next_cursor"] = next_cursor
 
         # Faz a requisição à API do Cloudinary
-        response = cloudinary.api.resources_by_asset_folder(**options)
+        with medir_upstream("cloudinary", "resources_by_asset_folder"):
+            response = cloudinary.api.resources_by_asset_folder(**options)
 
-        # Monta o payload da resposta com as fotos formatadas
-        resposta = {"fotos": [], "proxima_pagina": response.get("next_cursor")}
-
-        for resource in response.get("resources", []):
-            url = resource["url"]
-            if url.startswith("http://"):
-                url = url.replace("http://", "https://", 1)
-
-            foto = {
-                "url": url,
-                "nome": resource["public_id"],
-            }
-            resposta["fotos"].append(foto)
+        resposta = _formatar_fotos(response)
 
         registrar_log(
             "Galeria Recuperada",
@@ -125,3 +127,188 @@ def get_fotos():
             jsonify({"erro": "Erro ao buscar fotos, tente novamente mais tarde!"}),
             500,
         )
+
+
+async def get_fotos_async():
+    """
+    Versão assíncrona de `get_fotos`, usada pelo servidor ASGI (asgi.py).
+
+    Mesma rota, validação e resposta; a chamada ao Cloudinary usa o cliente
+    HTTP assíncrono e os logs são gravados pelo pool de conexões assíncronas,
+    sem ocupar uma thread enquanto espera a rede.
+    """
+    pool = obter_pool()
+
+    try:
+        dados_requisicao = request.get_json()
+        next_cursor = dados_requisicao.get("next_cursor") if dados_requisicao else None
+        pasta = dados_requisicao.get("pasta") if dados_requisicao else None
+
+        if not pasta:
+            await registrar_log_async(
+                pool,
+                "Erro de Validação",
+                "O parâmetro 'pasta' não foi informado",
+                nivel=AVISO,
+            )
+            return jsonify({"erro": "O parâmetro 'pasta' é obrigatório"}), 400
+
+        await registrar_log_async(
+            pool, "Requisição de Galeria", f"Usuário solicitou fotos da pasta '{pasta}'"
+        )
+
+        response = await buscar_fotos_pasta(current_app.config, pasta, next_cursor)
+        resposta = _formatar_fotos(response)
+
+        await registrar_log_async(
+            pool,
+            "Galeria Recuperada",
+            f"{len(resposta['fotos'])} fotos retornadas da pasta '{pasta}'",
+        )
+
+        return jsonify(resposta)
+
+    except Exception as e:
+        await registrar_log_async(pool, "Erro ao Buscar Fotos", str(e))
+        return (
+            jsonify({"erro": "Erro ao buscar fotos, tente novamente mais tarde!"}),
+            500,
+        )
+
+
+def _formatar_fotos(response):
+    """Monta o payload da galeria a partir da resposta do Cloudinary (URLs sempre em HTTPS)."""
+    resposta = {"fotos": [], "proxima_pagina": response.get("next_cursor")}
+
+    for resource in response.get("resources", []):
+        url = resource["url"]
+        if url.startswith("http://"):
+            url = url.replace("http://", "https://", 1)
+
+        foto = {
+            "url": url,
+            "nome": resource["public_id"],
+        }
+        resposta["fotos"].append(foto)
+
+    return resposta
+
+
+@cloudinary_bp.route("/fotos/visualizacoes", methods=["POST"])
+def registrar_visualizacoes():
+    """
+    Registra visualizações de fotos da galeria.
+
+    As visualizações são somadas em memória e gravadas no banco em lote a cada
+    `VISUALIZACOES_INTERVALO_SEGUNDOS`, então a rota não acessa o banco. O site
+    pode enviar várias fotos de uma vez (ex: as exibidas em uma página da galeria).
+    Cada IP tem um balde de fichas próprio (`VISUALIZACOES_LIMITE_*`) e só são
+    aceitos IDs no formato de public_id do Cloudinary, dentro das pastas de
+    `VISUALIZACOES_PREFIXOS` quando configuradas.
+
+    ---
+    tags:
+      - Galeria de Fotos (Cloudinary)
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          properties:
+            fotos:
+              type: array
+              description: Identificadores (campo `nome` de /fotos) das fotos vistas, até 100
+              items:
+                type: string
+              example: ["galeria/fotos/casamento-01", "galeria/fotos/casamento-02"]
+        required:
+          - fotos
+    responses:
+      202:
+        description: Visualizações aceitas para gravação
+        examples:
+          {"aceitas": 2}
+      400:
+        description: Lista de fotos inválida
+        examples:
+          {"erro": "Informe de 1 a 100 identificadores de fotos"}
+      429:
+        description: Limite de requisições do IP atingido (ver cabeçalho Retry-After)
+        examples:
+          {"erro": "Muitas requisições. Tente novamente mais tarde."}
+    """
+    espera = obter_limitador_visualizacoes().consumir(request.remote_addr)
+    if espera:
+        resposta = jsonify({"erro": "Muitas requisições. Tente novamente mais tarde."})
+        resposta.headers["Retry-After"] = str(math.ceil(espera))
+        return resposta, 429
+
+    dados = request.get_json(silent=True)
+    fotos = dados.get("fotos") if isinstance(dados, dict) else None
+
+    if (
+        not isinstance(fotos, list)
+        or not 1 <= len(fotos) <= 100
+        or not all(contador_visualizacoes.foto_valida(f) for f in fotos)
+    ):
+        return jsonify({"erro": "Informe de 1 a 100 identificadores de fotos"}), 400
+
+    aceitas = contador_visualizacoes.registrar(fotos)
+    return jsonify({"aceitas": aceitas}), 202
+
+
+@cloudinary_bp.route("/fotos/mais-vistas", methods=["GET"])
+@jwt_required()
+def fotos_mais_vistas():
+    """
+    Lista as fotos mais vistas (requer autenticação).
+
+    As contagens incluem as visualizações já gravadas; as dos últimos segundos
+    ainda podem estar acumuladas em memória.
+
+    ---
+    tags:
+      - Galeria de Fotos (Cloudinary)
+    parameters:
+      - name: limite
+        in: query
+        type: integer
+        default: 10
+        description: Quantidade de fotos (máximo 100)
+    security:
+      - JWT: []
+    responses:
+      200:
+        description: Fotos da mais vista para a menos vista
+        examples:
+          [{"foto_id": "galeria/fotos/casamento-01", "visualizacoes": 1520, "ultima_visualizacao": "Sun, 19 Oct 2026 12:00:00 GMT"}]
+      500:
+        description: Erro ao consultar as visualizações
+        examples:
+          {"erro": "Erro ao buscar fotos mais vistas"}
+    """
+    limite = request.args.get("limite", default=10, type=int)
+    if limite < 1 or limite > 100:
+        limite = 10
+
+    try:
+        with get_cursor() as cur:
+            cur.execute(
+                """ SELECT foto_id, visualizacoes, ultima_visualizacao
+                    FROM visualizacoes_fotos
+                    ORDER BY visualizacoes DESC
+                    LIMIT %s
+                    """,
+                (limite,),
+            )
+            fotos = cur.fetchall()
+
+        connection.commit()
+
+    except psycopg.DatabaseError as e:
+        connection.rollback()
+        registrar_log("Erro ao Buscar Fotos Mais Vistas", str(e))
+        return jsonify({"erro": "Erro ao buscar fotos mais vistas"}), 500
+
+    return jsonify(fotos), 200
@@ -1,22 +1,74 @@
-from flask import Blueprint, jsonify, request
+from flask import (
+    Blueprint,
+    jsonify,
+    request,
+    current_app,
+    Response,
+    stream_with_context,
+)
 from database.database import connection, get_cursor
+from database.database_async import obter_pool
 import psycopg
-from services.logs import registrar_log
-from flask_jwt_extended import jwt_required
-from datetime import datetime
+import math
+from services.logs import registrar_log, registrar_log_async, AVISO
+from services.limitador import obter_limitador_contatos
+from services.antispam import (
+    verificar_spam,
+    mensagem_duplicada,
+    liberar_mensagem,
+    registrar_rejeicao,
+)
+from services.journal import enfileirar_contato
+from services.eventos import (
+    barramento_contatos,
+    resumir_contato,
+    publicar_contatos,
+    publicar_contatos_async,
+)
+from services.idempotencia import (
+    obter_armazem_contatos,
+    gerar_chave_conteudo,
+    CONCLUIDA,
+    EM_ANDAMENTO,
+)
+from flask_jwt_extended import jwt_required, get_jwt
+import asyncio
+import json
+import time
 
 contatos_bp = Blueprint("contatos", __name__)
 
+# Tamanho máximo de cada campo, igual às colunas de `contatos` (mensagem é TEXT).
+# Validado antes da gravação: no modo journal o contato é confirmado antes do INSERT.
+_TAMANHO_MAXIMO_CAMPOS = {"nome": 50, "telefone": 20, "email": 100}
+
 
 @contatos_bp.route("", methods=["POST"])
 def inserir_contato():
     """
     Cria um novo contato via formulário.
 
+    Antes de qualquer acesso ao banco, aplica um limite por IP (balde de fichas)
+    e filtros de spam (honeypot, tempo mínimo de preenchimento, excesso de links
+    e mensagens duplicadas). Envios de robôs e duplicatas recebem a mesma resposta
+    de sucesso, sem gravação.
+
+    Reenvios com o mesmo cabeçalho `Idempotency-Key` (ou, na falta dele, com o
+    mesmo conteúdo normalizado) recebem a resposta original, sem nova gravação.
+
+    No modo `CONTATOS_MODO_INGESTAO = "journal"`, o contato validado é gravado
+    no journal local e confirmado imediatamente; a inserção no banco é feita
+    em lotes por um drenador em segundo plano.
+
     ---
     tags:
       - Contatos
     parameters:
+      - name: Idempotency-Key
+        in: header
+        required: false
+        type: string
+        description: Chave única do envio, repetida pelo cliente em caso de reenvio
       - name: body
         in: body
         required: true
@@ -39,6 +91,10 @@ def inserir_contato():
               type: string
               description: Mensagem enviada pelo usuário
               example: "Olá, gostaria de saber mais sobre seus serviços."
+            iniciado_em:
+              type: integer
+              description: Momento em que o formulário foi aberto (timestamp Unix em ms, opcional)
+              example: 1760000000000
     responses:
       201:
         description: Contato criado com sucesso
@@ -49,49 +105,41 @@ def inserir_contato():
         examples:
           {"erro": "O nome é obrigatório"}
           {"erro": "Telefone inválido"}
+          {"erro": "O campo 'nome' deve ter no máximo 50 caracteres"}
           {"erro": "Ao menos um contato é obrigatório"}
+          {"erro": "Sua mensagem contém links demais."}
+      429:
+        description: Muitos envios a partir do mesmo IP. O cabeçalho Retry-After indica quantos segundos aguardar.
+        examples:
+          {"erro": "Muitas mensagens enviadas. Tente novamente mais tarde."}
+      409:
+        description: Um envio com a mesma chave de idempotência ainda está sendo processado
+        examples:
+          {"erro": "Sua mensagem já está sendo enviada."}
       500:
         description: Erro interno ao salvar o contato
         examples:
           {"erro": "Sua mensagem não foi entregue, tente novamente, por favor!"}
     """
 
-    novo_contato = request.get_json()
-
-    if not novo_contato:
-        registrar_log("Erro de Validação", "Nenhum dado recebido")
-        return jsonify({"erro": "Nenhum dado recebido"}), 400
-
-    if not novo_contato.get("nome"):
-        registrar_log("Erro de Validação", "Nome obrigatório ausente")
-        return jsonify({"erro": "O nome é obrigatório"}), 400
-
-    if not novo_contato.get("mensagem"):
-        registrar_log("Erro de Validação", "Mensagem obrigatória ausente")
-        return jsonify({"erro": "A mensagem é obrigatória"}), 400
+    armazem = obter_armazem_contatos()
+    resposta, log, envio = _analisar_envio(armazem)
+    if log is not None:
+        registrar_log(*log)
+    if resposta is not None:
+        return resposta
 
-    if not novo_contato.get("telefone") and not novo_contato.get("email"):
-        registrar_log("Erro de Validação", "Nenhum meio de contato fornecido")
-        return jsonify({"erro": "Ao menos um contato é obrigatório"}), 400
+    nome_padronizado, telefone, email, mensagem, chave_idempotencia = envio
 
     try:
-        # padroniza o nome (primeira letra maiúscula, resto minúscula)
-        nome_padronizado = novo_contato.get("nome", "").strip().title()
-
-        # Remove formatação do telefone e valida
-        telefone = (
-            novo_contato.get("telefone", "")
-            .replace("(", "")
-            .replace(")", "")
-            .replace("-", "")
-            .replace(" ", "")
-            .strip()
-        )
-        if telefone and len(telefone) < 10:
-            return jsonify({"erro": "Telefone inválido"}), 400
+        if current_app.config["CONTATOS_MODO_INGESTAO"] == "journal":
+            # Confirmado assim que estiver no disco; o banco recebe o contato depois
+            journal_id = enfileirar_contato(nome_padronizado, telefone, email, mensagem)
 
-        # padroniza email em minúsculas
-        email = novo_contato.get("email", "").strip().lower()
+            resposta = {"sucesso": "Sua mensagem foi enviada com sucesso!"}
+            armazem.concluir(chave_idempotencia, resposta, 201)
+            registrar_log("Contato Criado", f"Journal ID {journal_id} recebido")
+            return jsonify(resposta), 201
 
         # Persistência dos dados no banco
         with get_cursor() as cur:
@@ -99,26 +147,45 @@ def inserir_contato():
                 """
                 INSERT INTO contatos (nome, telefone, email, mensagem)
                 VALUES (%s, %s, %s, %s)
-                RETURNING id
+                RETURNING id, data_envio
                 """,
-                (
-                    nome_padronizado,
-                    telefone if telefone else None,
-                    email if email else None,
-                    novo_contato.get("mensagem", "").strip(),
-                ),
+                (nome_padronizado, telefone, email, mensagem),
             )
 
-            contato_id = cur.fetchone()["id"]
+            contato = cur.fetchone()
+            contato_id = contato["id"]
 
         connection.commit()
 
+        resposta = {"sucesso": "Sua mensagem foi enviada com sucesso!"}
+        armazem.concluir(chave_idempotencia, resposta, 201)
+
+        # Avisa o feed de eventos (SSE); uma falha aqui não afeta o envio
+        try:
+            with get_cursor() as cur:
+                publicar_contatos(
+                    [
+                        resumir_contato(
+                            contato_id,
+                            nome_padronizado,
+                            mensagem,
+                            contato["data_envio"],
+                        )
+                    ],
+                    cur,
+                )
+        except psycopg.DatabaseError as e:
+            connection.rollback()
+            print(f"Erro ao publicar evento de contato: {e}")
+
         registrar_log("Contato Criado", f"ID {contato_id} registrado com sucesso")
 
-        return jsonify({"sucesso": "Sua mensagem foi enviada com sucesso!"}), 201
+        return jsonify(resposta), 201
 
-    except psycopg.DatabaseError as e:
+    except (psycopg.DatabaseError, OSError) as e:
         connection.rollback()
+        armazem.cancelar(chave_idempotencia)
+        liberar_mensagem(mensagem, _remetente(email, telefone))
         registrar_log("Erro ao Salvar Contato", str(e))
 
         return (
@@ -129,16 +196,286 @@ def inserir_contato():
         )
 
 
+async def inserir_contato_async():
+    """
+    Versão assíncrona de `inserir_contato`, usada pelo servidor ASGI (asgi.py).
+
+    Mesmas verificações e respostas; a gravação usa o pool de conexões
+    assíncronas e, no modo journal, a escrita em disco roda em uma thread
+    auxiliar para não bloquear o event loop.
+    """
+    pool = obter_pool()
+
+    armazem = obter_armazem_contatos()
+    resposta, log, envio = _analisar_envio(armazem)
+    if log is not None:
+        await registrar_log_async(pool, *log)
+    if resposta is not None:
+        return resposta
+
+    nome_padronizado, telefone, email, mensagem, chave_idempotencia = envio
+
+    try:
+        if current_app.config["CONTATOS_MODO_INGESTAO"] == "journal":
+            journal_id = await asyncio.to_thread(
+                enfileirar_contato, nome_padronizado, telefone, email, mensagem
+            )
+
+            resposta = {"sucesso": "Sua mensagem foi enviada com sucesso!"}
+            armazem.concluir(chave_idempotencia, resposta, 201)
+            await registrar_log_async(
+                pool, "Contato Criado", f"Journal ID {journal_id} recebido"
+            )
+            return jsonify(resposta), 201
+
+        async with pool.connection() as conexao:
+            cur = await conexao.execute(
+                """
+                INSERT INTO contatos (nome, telefone, email, mensagem)
+                VALUES (%s, %s, %s, %s)
+                RETURNING id, data_envio
+                """,
+                (nome_padronizado, telefone, email, mensagem),
+            )
+            contato = await cur.fetchone()
+            contato_id = contato["id"]
+
+        resposta = {"sucesso": "Sua mensagem foi enviada com sucesso!"}
+        armazem.concluir(chave_idempotencia, resposta, 201)
+
+        # Avisa o feed de eventos (SSE); uma falha aqui não afeta o envio
+        try:
+            async with pool.connection() as conexao:
+                await publicar_contatos_async(
+                    [
+                        resumir_contato(
+                            contato_id,
+                            nome_padronizado,
+                            mensagem,
+                            contato["data_envio"],
+                        )
+                    ],
+                    conexao,
+                )
+        except psycopg.DatabaseError as e:
+            print(f"Erro ao publicar evento de contato: {e}")
+
+        await registrar_log_async(
+            pool, "Contato Criado", f"ID {contato_id} registrado com sucesso"
+        )
+
+        return jsonify(resposta), 201
+
+    except (psycopg.DatabaseError, OSError) as e:
+        armazem.cancelar(chave_idempotencia)
+        liberar_mensagem(mensagem, _remetente(email, telefone))
+        await registrar_log_async(pool, "Erro ao Salvar Contato", str(e))
+
+        return (
+            jsonify(
+                {"erro": "Sua mensagem não foi entregue, tente novamente, por favor!"}
+            ),
+            500,
+        )
+
+
+def _analisar_envio(armazem):
+    """
+    Etapas de `inserir_contato` que não acessam o banco: idempotência, limite
+    por IP, antispam, validação e normalização dos campos.
+
+    Compartilhada pelas versões síncrona e assíncrona da rota; o log de
+    validação é devolvido para que cada versão o grave do seu jeito.
+
+    Args:
+        armazem (ArmazemIdempotencia): Armazém de chaves de idempotência.
+
+    Returns:
+        tuple: (resposta, log, envio). `resposta` é a resposta a devolver de
+        imediato (ou None para seguir com a gravação); `log` é None ou
+        (tipo_log, status, nivel); `envio` é (nome, telefone, email, mensagem,
+        chave_idempotencia), com telefone e email None quando vazios.
+    """
+    chave_cabecalho = request.headers.get("Idempotency-Key")
+    if chave_cabecalho:
+        chave_cabecalho = "cabecalho:" + chave_cabecalho[:255]
+
+        # Reenvio de uma requisição já concluída: devolve a resposta original
+        resposta_original = armazem.obter(chave_cabecalho)
+        if resposta_original is not None:
+            return (jsonify(resposta_original[0]), resposta_original[1]), None, None
+
+    espera = obter_limitador_contatos().consumir(request.remote_addr)
+    if espera:
+        registrar_rejeicao("limite_taxa")
+        resposta = jsonify(
+            {"erro": "Muitas mensagens enviadas. Tente novamente mais tarde."}
+        )
+        resposta.headers["Retry-After"] = str(math.ceil(espera))
+        return (resposta, 429), None, None
+
+    novo_contato = request.get_json()
+
+    if novo_contato:
+        motivo_spam = verificar_spam(novo_contato)
+
+        if motivo_spam == "links":
+            return (
+                (jsonify({"erro": "Sua mensagem contém links demais."}), 400),
+                None,
+                None,
+            )
+
+        # Robôs recebem a resposta de sucesso para não ajustarem o comportamento
+        if motivo_spam is not None:
+            return (
+                (jsonify({"sucesso": "Sua mensagem foi enviada com sucesso!"}), 201),
+                None,
+                None,
+            )
+
+    if not novo_contato:
+        return (
+            (jsonify({"erro": "Nenhum dado recebido"}), 400),
+            ("Erro de Validação", "Nenhum dado recebido", AVISO),
+            None,
+        )
+
+    if not novo_contato.get("nome"):
+        return (
+            (jsonify({"erro": "O nome é obrigatório"}), 400),
+            ("Erro de Validação", "Nome obrigatório ausente", AVISO),
+            None,
+        )
+
+    if not novo_contato.get("mensagem"):
+        return (
+            (jsonify({"erro": "A mensagem é obrigatória"}), 400),
+            ("Erro de Validação", "Mensagem obrigatória ausente", AVISO),
+            None,
+        )
+
+    if not novo_contato.get("telefone") and not novo_contato.get("email"):
+        return (
+            (jsonify({"erro": "Ao menos um contato é obrigatório"}), 400),
+            ("Erro de Validação", "Nenhum meio de contato fornecido", AVISO),
+            None,
+        )
+
+    # Texto com NUL (0x00) não pode ser gravado no PostgreSQL
+    for campo in ("nome", "telefone", "email", "mensagem"):
+        valor = novo_contato.get(campo)
+        if valor is not None and (not isinstance(valor, str) or "\x00" in valor):
+            return (
+                (jsonify({"erro": f"O campo '{campo}' é inválido"}), 400),
+                ("Erro de Validação", f"Campo '{campo}' inválido", AVISO),
+                None,
+            )
+
+    # padroniza o nome (primeira letra maiúscula, resto minúscula)
+    nome_padronizado = novo_contato["nome"].strip().title()
+
+    # Remove formatação do telefone e valida
+    telefone = (
+        (novo_contato.get("telefone") or "")
+        .replace("(", "")
+        .replace(")", "")
+        .replace("-", "")
+        .replace(" ", "")
+        .strip()
+    )
+    if telefone and len(telefone) < 10:
+        return (jsonify({"erro": "Telefone inválido"}), 400), None, None
+
+    # padroniza email em minúsculas
+    email = (novo_contato.get("email") or "").strip().lower()
+
+    mensagem = novo_contato["mensagem"].strip()
+
+    for campo, valor in (
+        ("nome", nome_padronizado),
+        ("telefone", telefone),
+        ("email", email),
+    ):
+        if len(valor) > _TAMANHO_MAXIMO_CAMPOS[campo]:
+            return (
+                (
+                    jsonify(
+                        {
+                            "erro": f"O campo '{campo}' deve ter no máximo "
+                            f"{_TAMANHO_MAXIMO_CAMPOS[campo]} caracteres"
+                        }
+                    ),
+                    400,
+                ),
+                ("Erro de Validação", f"Campo '{campo}' longo demais", AVISO),
+                None,
+            )
+
+    chave_idempotencia = chave_cabecalho or gerar_chave_conteudo(
+        nome_padronizado, telefone, email, mensagem
+    )
+    estado, resposta_original = armazem.reservar(chave_idempotencia)
+
+    if estado == CONCLUIDA:
+        return (jsonify(resposta_original[0]), resposta_original[1]), None, None
+
+    if estado == EM_ANDAMENTO:
+        return (
+            (jsonify({"erro": "Sua mensagem já está sendo enviada."}), 409),
+            None,
+            None,
+        )
+
+    # O mesmo remetente enviou esta mensagem há pouco: nada a gravar
+    if mensagem_duplicada(mensagem, _remetente(email, telefone)):
+        resposta = {"sucesso": "Sua mensagem foi enviada com sucesso!"}
+        armazem.concluir(chave_idempotencia, resposta, 201)
+        return (jsonify(resposta), 201), None, None
+
+    envio = (
+        nome_padronizado,
+        telefone or None,
+        email or None,
+        mensagem,
+        chave_idempotencia,
+    )
+    return None, None, envio
+
+
+def _remetente(email, telefone):
+    """Identificação do remetente usada na janela de duplicados do antispam."""
+    return f"{email or ''}|{telefone or ''}"
+
+
 @contatos_bp.route("", methods=["GET"])
 @jwt_required()
 def listar_contatos():
     """
     Lista todos os contatos cadastrados (requer autenticação).
 
+    A consulta já devolve as linhas no formato da resposta (datas formatadas
+    pelo banco no fuso `FUSO_HORARIO`), sem processamento por linha no Python.
+
+    Por padrão lista a caixa de entrada (contatos não arquivados). Os filtros
+    usam literais booleanos no SQL para casar com os índices parciais de
+    `contatos`, de modo que a contagem e a página de não lidos sejam varreduras
+    de intervalo no índice. Com `arquivado=todos`, o filtro por `lido` usa o
+    índice `(lido, data_envio DESC, id DESC)`.
+
     ---
     tags:
       - Contatos
     parameters:
+      - name: lido
+        in: query
+        type: boolean
+        description: Filtra por lidos (true) ou não lidos (false). Sem o parâmetro, lista ambos.
+      - name: arquivado
+        in: query
+        type: string
+        default: "false"
+        description: Filtra por arquivados (true), caixa de entrada (false) ou todos ("todos")
       - name: pagina
         in: query
         type: integer
@@ -149,6 +486,11 @@ def listar_contatos():
         type: integer
         default: 5
         description: Quantidade de registros por página (máximo 100)
+      - name: previa
+        in: query
+        type: integer
+        required: false
+        description: Retorna apenas os N primeiros caracteres da mensagem, no campo `previa`
     security:
       - JWT: []
     responses:
@@ -178,6 +520,13 @@ def listar_contatos():
                     type: string
                   mensagem:
                     type: string
+                  previa:
+                    type: string
+                    description: Presente no lugar de `mensagem` quando `previa` é informado
+                  lido:
+                    type: boolean
+                  arquivado:
+                    type: boolean
             pagina:
               type: integer
             por_pagina:
@@ -200,54 +549,69 @@ def listar_contatos():
     if por_pagina < 1 or por_pagina > 100:
         por_pagina = 5
 
+    # Monta o filtro com literais fixos (nunca com valores do usuário),
+    # para que o planejador reconheça os predicados dos índices parciais
+    filtros = []
+    lido = _parametro_booleano("lido")
+    arquivado = request.args.get("arquivado", default="false")
+
+    if lido is not None:
+        filtros.append("lido = TRUE" if lido else "lido = FALSE")
+    if arquivado != "todos":
+        filtros.append(
+            "arquivado = TRUE"
+            if _parametro_booleano("arquivado")
+            else "arquivado = FALSE"
+        )
+
+    where = ("WHERE " + " AND ".join(filtros)) if filtros else ""
+
+    # Com `previa`, a mensagem completa é trocada por seus primeiros caracteres
+    previa = request.args.get("previa", type=int)
+    if previa is not None and previa < 1:
+        previa = None
+
+    coluna_mensagem = (
+        "left(mensagem, %(previa)s) AS previa" if previa is not None else "mensagem"
+    )
+
     lista_contatos = []
     total_contatos = 0
 
     try:
         with get_cursor() as cur:
             # primeiro, contar o total de registros
-            cur.execute("SELECT COUNT(*) as total FROM contatos")
+            cur.execute(f"SELECT COUNT(*) as total FROM contatos {where}")
             total_contatos = cur.fetchone()["total"]
 
             # calcular quantos registros pular
             offset = (pagina - 1) * por_pagina
 
-            # buscar só os registros da pagina atual
+            # buscar só os registros da pagina atual, já no formato da resposta:
+            # data_envio no mesmo formato HTTP-date que o jsonify gerava e
+            # data_formatada no fuso configurado
             cur.execute(
-                """ SELECT * FROM contatos
-                        ORDER BY data_envio DESC
-                        LIMIT %s OFFSET %s
+                f""" SELECT id, nome,
+                        to_char(data_envio, 'Dy, DD Mon YYYY HH24:MI:SS "GMT"') AS data_envio,
+                        to_char(
+                            data_envio AT TIME ZONE 'UTC' AT TIME ZONE %(fuso)s,
+                            'DD/MM/YYYY HH24:MI'
+                        ) AS data_formatada,
+                        telefone, email, {coluna_mensagem}, lido, arquivado
+                        FROM contatos
+                        {where}
+                        ORDER BY contatos.data_envio DESC, id DESC
+                        LIMIT %(limite)s OFFSET %(offset)s
                         """,
-                (por_pagina, offset),
+                {
+                    "fuso": current_app.config["FUSO_HORARIO"],
+                    "previa": previa,
+                    "limite": por_pagina,
+                    "offset": offset,
+                },
             )
 
-            contatos = cur.fetchall()
-
-            for contato in contatos:
-                # formata a data para exibição amigável
-                data_original = contato["data_envio"]
-
-                # se a data já for string (gmt), converta para datetime primeiro
-                if isinstance(data_original, str):
-                    data_obj = datetime.strptime(
-                        data_original, "%a, %d %b %Y %H:%M:%S GMT"
-                    )
-                else:
-                    data_obj = data_original
-
-                data_formatada = data_obj.strftime("%d/%m/%Y %H:%M")
-
-                lista_contatos.append(
-                    {
-                        "id": contato["id"],
-                        "nome": contato["nome"],
-                        "data_envio": contato["data_envio"],
-                        "data_formatada": data_formatada,
-                        "telefone": contato["telefone"],
-                        "email": contato["email"],
-                        "mensagem": contato["mensagem"],
-                    }
-                )
+            lista_contatos = cur.fetchall()
 
         registrar_log("Contatos Listados", f"Página {pagina} com {por_pagina} itens")
 
@@ -268,3 +632,247 @@ def listar_contatos():
     except psycopg.DatabaseError as e:
         registrar_log("Erro ao Listar Contatos", str(e))
         return jsonify({"erro": "Erro ao buscar contatos"}), 500
+
+
+@contatos_bp.route("/eventos", methods=["GET"])
+@jwt_required()
+def eventos_contatos():
+    """
+    Feed Server-Sent Events com os novos contatos, à medida que chegam (requer autenticação).
+
+    Envia um evento `contato` por mensagem recebida (com `id` igual ao ID do contato)
+    e um comentário de heartbeat a cada `EVENTOS_HEARTBEAT_SEGUNDOS`. Ao reconectar com
+    o cabeçalho `Last-Event-ID`, os contatos perdidos são reenviados a partir do banco;
+    se forem mais de 100, o feed envia um único evento `recarregar` (com `id` do contato
+    mais recente) para que o painel recarregue a listagem.
+    O stream é encerrado com o evento `expirado` quando o token de acesso expira.
+
+    ---
+    tags:
+      - Contatos
+    parameters:
+      - name: Last-Event-ID
+        in: header
+        type: integer
+        required: false
+        description: ID do último contato recebido, para retomar o feed
+    security:
+      - JWT: []
+    produces:
+      - text/event-stream
+    responses:
+      200:
+        description: Stream de eventos `contato` com {id, nome, previa, data_envio}
+      500:
+        description: Erro ao recuperar contatos perdidos
+        examples:
+          {"erro": "Erro ao abrir o feed de contatos"}
+    """
+
+    heartbeat = current_app.config["EVENTOS_HEARTBEAT_SEGUNDOS"]
+    expira_em = get_jwt()["exp"]
+
+    # Assina antes de consultar o banco, para não perder eventos entre as duas etapas
+    sequencia = barramento_contatos.sequencia_atual()
+    pendentes = []
+    recarregar_ate = None
+
+    ultimo_id = request.headers.get("Last-Event-ID", type=int)
+    if ultimo_id is not None:
+        try:
+            with get_cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT id, nome, mensagem, data_envio FROM contatos
+                    WHERE id > %s
+                    ORDER BY id
+                    LIMIT %s
+                    """,
+                    (ultimo_id, _MAX_EVENTOS_PERDIDOS + 1),
+                )
+                perdidos = cur.fetchall()
+
+                if len(perdidos) > _MAX_EVENTOS_PERDIDOS:
+                    # Perdeu contatos demais: o painel recarrega a lista em vez de
+                    # receber tudo pelo feed
+                    cur.execute("SELECT MAX(id) AS ultimo FROM contatos")
+                    recarregar_ate = cur.fetchone()["ultimo"]
+                else:
+                    pendentes = [
+                        resumir_contato(
+                            c["id"], c["nome"], c["mensagem"], c["data_envio"]
+                        )
+                        for c in perdidos
+                    ]
+            connection.commit()
+        except psycopg.DatabaseError as e:
+            connection.rollback()
+            registrar_log("Erro ao Abrir Feed de Contatos", str(e))
+            return jsonify({"erro": "Erro ao abrir o feed de contatos"}), 500
+
+    registrar_log("Feed de Contatos Aberto", f"Retomando após ID {ultimo_id}")
+
+    def gerar():
+        nonlocal sequencia
+        enviados = set()
+
+        yield "retry: 5000\n\n"
+
+        if recarregar_ate is not None:
+            yield f"id: {recarregar_ate}\nevent: recarregar\ndata: {{}}\n\n"
+
+        for resumo in pendentes:
+            enviados.add(resumo["id"])
+            yield _formatar_evento(resumo)
+
+        while True:
+            restante = expira_em - time.time()
+            if restante <= 0:
+                yield "event: expirado\ndata: {}\n\n"
+                return
+
+            eventos, sequencia = barramento_contatos.aguardar(
+                sequencia, min(heartbeat, restante)
+            )
+
+            if not eventos:
+                yield ": ping\n\n"
+
+            for resumo in eventos:
+                if resumo["id"] not in enviados:
+                    yield _formatar_evento(resumo)
+
+            enviados.clear()
+
+    return Response(
+        stream_with_context(gerar()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# Contatos perdidos reenviados ao reconectar; acima disso, o feed pede para recarregar
+_MAX_EVENTOS_PERDIDOS = 100
+
+
+def _formatar_evento(resumo):
+    """
+    Formata um resumo de contato como evento SSE.
+
+    Args:
+        resumo (dict): Resumo gerado por `resumir_contato`.
+
+    Returns:
+        str: Evento no formato `text/event-stream`.
+    """
+    return f"id: {resumo['id']}\nevent: contato\ndata: {json.dumps(resumo)}\n\n"
+
+
+# Ações em lote e a instrução SQL de cada uma (ids sempre passados como parâmetro)
+ACOES_EM_LOTE = {
+    "marcar_lido": "UPDATE contatos SET lido = TRUE WHERE id = ANY(%s)",
+    "marcar_nao_lido": "UPDATE contatos SET lido = FALSE WHERE id = ANY(%s)",
+    "arquivar": "UPDATE contatos SET arquivado = TRUE WHERE id = ANY(%s)",
+    "desarquivar": "UPDATE contatos SET arquivado = FALSE WHERE id = ANY(%s)",
+    "excluir": "DELETE FROM contatos WHERE id = ANY(%s)",
+}
+
+
+@contatos_bp.route("/lote", methods=["POST"])
+@jwt_required()
+def acao_em_lote():
+    """
+    Aplica uma ação a vários contatos de uma vez, em uma única instrução SQL.
+
+    ---
+    tags:
+      - Contatos
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          properties:
+            acao:
+              type: string
+              enum: [marcar_lido, marcar_nao_lido, arquivar, desarquivar, excluir]
+              example: "marcar_lido"
+            ids:
+              type: array
+              description: IDs dos contatos (máximo 1000)
+              items:
+                type: integer
+              example: [1, 2, 3]
+    security:
+      - JWT: []
+    responses:
+      200:
+        description: Ação aplicada
+        examples:
+          {"sucesso": "Ação aplicada com sucesso", "afetados": 3}
+      400:
+        description: Ação ou lista de IDs inválida
+        examples:
+          {"erro": "Ação inválida"}
+          {"erro": "Informe de 1 a 1000 IDs numéricos"}
+      500:
+        description: Erro ao aplicar a ação
+        examples:
+          {"erro": "Erro ao atualizar contatos"}
+    """
+
+    dados = request.get_json(silent=True)
+    if not isinstance(dados, dict):
+        dados = {}
+    acao = dados.get("acao")
+    ids = dados.get("ids")
+
+    if acao not in ACOES_EM_LOTE:
+        return jsonify({"erro": "Ação inválida"}), 400
+
+    if (
+        not isinstance(ids, list)
+        or not 1 <= len(ids) <= 1000
+        or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids)
+    ):
+        return jsonify({"erro": "Informe de 1 a 1000 IDs numéricos"}), 400
+
+    try:
+        with get_cursor() as cur:
+            cur.execute(ACOES_EM_LOTE[acao], (ids,))
+            afetados = cur.rowcount
+
+        connection.commit()
+
+        registrar_log(
+            "Contatos em Lote", f"Ação '{acao}' aplicada a {afetados} contatos"
+        )
+        return (
+            jsonify({"sucesso": "Ação aplicada com sucesso", "afetados": afetados}),
+            200,
+        )
+
+    except psycopg.DatabaseError as e:
+        connection.rollback()
+        registrar_log("Erro em Ação em Lote", str(e))
+        return jsonify({"erro": "Erro ao atualizar contatos"}), 500
+
+
+def _parametro_booleano(nome):
+    """
+    Lê um parâmetro de query string booleano ("true"/"false", "1"/"0").
+
+    Args:
+        nome (str): Nome do parâmetro.
+
+    Returns:
+        bool | None: Valor do parâmetro, ou None se ausente ou inválido.
+    """
+    valor = request.args.get(nome, "").strip().lower()
+
+    if valor in ("true", "1"):
+        return True
+    if valor in ("false", "0"):
+        return False
+    return None
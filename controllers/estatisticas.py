@@ -0,0 +1,116 @@
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import jwt_required
+from database.database import connection, get_cursor
+from services.logs import registrar_log
+import psycopg
+
+estatisticas_bp = Blueprint("estatisticas", __name__)
+
+
+@estatisticas_bp.route("", methods=["GET"])
+@jwt_required()
+def obter_estatisticas():
+    """
+    Retorna os números do painel do fotógrafo (requer autenticação).
+
+    Lê apenas as tabelas de resumo, atualizadas em segundo plano a partir de
+    `contatos` e `logs`: o custo depende do período pedido, não do tamanho das
+    tabelas de origem. Os números podem estar alguns minutos atrasados
+    (`atualizado_em`).
+
+    ---
+    tags:
+      - Estatísticas
+    parameters:
+      - name: semanas
+        in: query
+        type: integer
+        default: 12
+        description: Semanas de contatos recebidos (máximo 104)
+      - name: dias
+        in: query
+        type: integer
+        default: 30
+        description: Dias considerados nas visualizações por pasta e nas falhas de login (máximo 365)
+    security:
+      - JWT: []
+    responses:
+      200:
+        description: Resumos do painel
+        examples:
+          {
+            "contatos_por_semana": [{"semana": "2026-10-12", "total": 14}],
+            "visualizacoes_por_pasta": [{"pasta": "casamentos", "visualizacoes": 812}],
+            "falhas_login_por_dia": [{"dia": "2026-10-19", "total": 3}],
+            "atualizado_em": "Sun, 19 Oct 2026 12:00:00 GMT"
+          }
+      500:
+        description: Erro ao consultar as estatísticas
+        examples:
+          {"erro": "Erro ao buscar estatísticas"}
+    """
+    semanas = request.args.get("semanas", default=12, type=int)
+    dias = request.args.get("dias", default=30, type=int)
+
+    if semanas < 1 or semanas > 104:
+        semanas = 12
+    if dias < 1 or dias > 365:
+        dias = 30
+
+    try:
+        with get_cursor() as cur:
+            cur.execute(
+                """ SELECT to_char(semana, 'YYYY-MM-DD') AS semana, total
+                    FROM estatisticas_contatos_semana
+                    WHERE semana > CURRENT_DATE - make_interval(weeks => %s)
+                    ORDER BY semana
+                    """,
+                (semanas,),
+            )
+            contatos_por_semana = cur.fetchall()
+
+            cur.execute(
+                """ SELECT pasta, SUM(visualizacoes)::bigint AS visualizacoes
+                    FROM estatisticas_galeria_pasta
+                    WHERE dia > CURRENT_DATE - %s::integer
+                    GROUP BY pasta
+                    ORDER BY visualizacoes DESC
+                    LIMIT 50
+                    """,
+                (dias,),
+            )
+            visualizacoes_por_pasta = cur.fetchall()
+
+            cur.execute(
+                """ SELECT to_char(dia, 'YYYY-MM-DD') AS dia, total
+                    FROM estatisticas_falhas_login
+                    WHERE dia > CURRENT_DATE - %s::integer
+                    ORDER BY dia
+                    """,
+                (dias,),
+            )
+            falhas_login_por_dia = cur.fetchall()
+
+            cur.execute(
+                "SELECT MIN(atualizado_em) AS atualizado_em FROM estatisticas_marcas"
+            )
+            atualizado_em = cur.fetchone()["atualizado_em"]
+
+        connection.commit()
+
+    except psycopg.DatabaseError as e:
+        connection.rollback()
+        registrar_log("Erro ao Buscar Estatísticas", str(e))
+        return jsonify({"erro": "Erro ao buscar estatísticas"}), 500
+
+    return (
+        jsonify(
+            {
+                "contatos_por_semana": contatos_por_semana,
+                "visualizacoes_por_pasta": visualizacoes_por_pasta,
+                "falhas_login_por_dia": falhas_login_por_dia,
+                "atualizado_em": atualizado_em,
+            }
+        ),
+        200,
+    )
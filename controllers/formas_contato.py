@@ -1,7 +1,8 @@
 from flask import Blueprint, jsonify, request
 from database.database import connection, get_cursor
 import psycopg
-from services.logs import registrar_log
+from database.database_async import obter_pool
+from services.logs import registrar_log, registrar_log_async
 from flask_jwt_extended import jwt_required
 
 formas_contato_bp = Blueprint("formas_contato", __name__)
@@ -61,6 +62,37 @@ def listar_formas_contato_publico():
         return jsonify({"erro": "Erro ao buscar formas de contato"}), 500
 
 
+async def listar_formas_contato_publico_async():
+    """
+    Versão assíncrona de `listar_formas_contato_publico`, usada pelo servidor
+    ASGI (asgi.py). Mesma resposta; a consulta usa o pool de conexões assíncronas.
+    """
+    pool = obter_pool()
+
+    try:
+        async with pool.connection() as conexao:
+            cur = await conexao.execute(
+                """
+                SELECT redesocial_nome, redesocial_perfil, email, telefone
+                FROM formas_contato
+            """
+            )
+            resultados = await cur.fetchone()
+
+        await registrar_log_async(
+            pool,
+            "Formas de Contato Públicas Listadas",
+            "Consulta realizada com sucesso",
+        )
+        return jsonify(resultados), 200
+
+    except psycopg.DatabaseError as e:
+        await registrar_log_async(
+            pool, "Erro ao Listar Formas de Contato Públicas", str(e)
+        )
+        return jsonify({"erro": "Erro ao buscar formas de contato"}), 500
+
+
 # Rota privada - com autenticação obrigatória
 @formas_contato_bp.route("/admin", methods=["GET"])
 @jwt_required()
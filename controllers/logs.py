@@ -0,0 +1,451 @@
+from flask import Blueprint, jsonify, request, current_app
+from flask_jwt_extended import jwt_required
+from database.database import connection, get_cursor
+from services.logs import registrar_log
+from datetime import datetime, timedelta, timezone
+import base64
+import ipaddress
+import psycopg
+
+logs_bp = Blueprint("logs", __name__)
+
+# Tipos de log contados como erro nas agregações (ex: 'Erro ao Salvar Contato').
+# O mesmo predicado define o índice parcial idx_logs_erros.
+PREDICADO_ERRO = "tipo_log LIKE 'Erro%%'"
+
+
+@logs_bp.route("", methods=["GET"])
+@jwt_required()
+def listar_logs():
+    """
+    Consulta os logs de auditoria com filtros e paginação por cursor (requer autenticação).
+
+    A paginação é por keyset em `(data_hora, id)`: cada página continua a partir
+    do último registro da anterior (`cursor`), sem OFFSET nem COUNT, então o
+    custo de uma página não cresce com o tamanho da tabela. Os filtros usam
+    igualdade em colunas indexadas junto com `data_hora`, e o intervalo de datas
+    limita as partições mensais lidas.
+
+    ---
+    tags:
+      - Logs
+    parameters:
+      - name: inicio
+        in: query
+        type: string
+        format: date-time
+        description: Data/hora inicial (ISO 8601, UTC se sem fuso)
+      - name: fim
+        in: query
+        type: string
+        format: date-time
+        description: Data/hora final, exclusiva (ISO 8601, UTC se sem fuso)
+      - name: tipo_log
+        in: query
+        type: string
+        description: Tipo exato do log (ex. "Login falhou")
+      - name: ip
+        in: query
+        type: string
+        description: IP do usuário (IPv4 ou IPv6)
+      - name: url
+        in: query
+        type: string
+        description: Caminho exato da requisição (ex. /api/contatos)
+      - name: metodo
+        in: query
+        type: string
+        description: Método HTTP (GET, POST...)
+      - name: limite
+        in: query
+        type: integer
+        default: 50
+        description: Registros por página (máximo 500)
+      - name: cursor
+        in: query
+        type: string
+        description: Valor de `proximo_cursor` da página anterior
+    security:
+      - JWT: []
+    responses:
+      200:
+        description: Página de logs, do mais recente ao mais antigo
+        schema:
+          type: object
+          properties:
+            dados:
+              type: array
+              items:
+                type: object
+                properties:
+                  id:
+                    type: integer
+                  tipo_log:
+                    type: string
+                  data_hora:
+                    type: string
+                    format: date-time
+                  ip_usuario:
+                    type: string
+                  user_agent:
+                    type: string
+                  url:
+                    type: string
+                  metodo:
+                    type: string
+                  status:
+                    type: string
+            limite:
+              type: integer
+            proximo_cursor:
+              type: string
+              description: Cursor da próxima página (null na última)
+      400:
+        description: Filtro ou cursor inválido
+        examples:
+          {"erro": "Cursor inválido"}
+      500:
+        description: Erro ao consultar os logs
+        examples:
+          {"erro": "Erro ao consultar logs"}
+    """
+    limite = request.args.get("limite", default=50, type=int)
+    if limite < 1 or limite > 500:
+        limite = 50
+
+    try:
+        filtros, parametros = _filtros_logs()
+
+        inicio = _parametro_data("inicio")
+        fim = _parametro_data("fim")
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
+
+    if inicio is not None:
+        filtros.append("data_hora >= %(inicio)s")
+        parametros["inicio"] = inicio
+    if fim is not None:
+        filtros.append("data_hora < %(fim)s")
+        parametros["fim"] = fim
+
+    cursor = request.args.get("cursor")
+    if cursor:
+        try:
+            parametros["cursor_data"], parametros["cursor_id"] = _decodificar_cursor(
+                cursor
+            )
+        except ValueError:
+            return jsonify({"erro": "Cursor inválido"}), 400
+
+        # Comparação de linha: casa com o índice (data_hora, id) varrido ao contrário
+        filtros.append("(data_hora, id) < (%(cursor_data)s, %(cursor_id)s)")
+
+    where = ("WHERE " + " AND ".join(filtros)) if filtros else ""
+    # Uma linha a mais indica se existe próxima página
+    parametros["limite"] = limite + 1
+
+    try:
+        with get_cursor() as cur:
+            cur.execute(
+                f""" SELECT id, tipo_log, data_hora, host(ip_usuario) AS ip_usuario,
+                        user_agent, url, metodo, status
+                        FROM logs
+                        {where}
+                        ORDER BY data_hora DESC, id DESC
+                        LIMIT %(limite)s
+                        """,
+                parametros,
+            )
+            registros = cur.fetchall()
+
+        connection.commit()
+
+    except psycopg.DatabaseError as e:
+        connection.rollback()
+        registrar_log("Erro ao Consultar Logs", str(e))
+        return jsonify({"erro": "Erro ao consultar logs"}), 500
+
+    proximo_cursor = None
+    if len(registros) > limite:
+        registros = registros[:limite]
+        ultimo = registros[-1]
+        proximo_cursor = _codificar_cursor(ultimo["data_hora"], ultimo["id"])
+
+    return (
+        jsonify(
+            {"dados": registros, "limite": limite, "proximo_cursor": proximo_cursor}
+        ),
+        200,
+    )
+
+
+@logs_bp.route("/por-hora", methods=["GET"])
+@jwt_required()
+def logs_por_hora():
+    """
+    Quantidade de logs (requisições registradas) por hora no intervalo (requer autenticação).
+
+    Aceita os mesmos filtros de `GET /api/logs`. Sem `inicio`/`fim`, considera as
+    últimas 24 horas; o intervalo é limitado a `LOGS_CONSULTA_MAX_DIAS` dias.
+
+    ---
+    tags:
+      - Logs
+    parameters:
+      - name: inicio
+        in: query
+        type: string
+        format: date-time
+      - name: fim
+        in: query
+        type: string
+        format: date-time
+      - name: tipo_log
+        in: query
+        type: string
+      - name: ip
+        in: query
+        type: string
+      - name: url
+        in: query
+        type: string
+      - name: metodo
+        in: query
+        type: string
+    security:
+      - JWT: []
+    responses:
+      200:
+        description: Totais por hora (apenas horas com registros), em ordem cronológica
+        examples:
+          {"inicio": "2026-10-18T12:00:00", "fim": "2026-10-19T12:00:00", "dados": [{"hora": "2026-10-18T12:00:00", "total": 154}]}
+      400:
+        description: Filtro ou intervalo inválido
+        examples:
+          {"erro": "O intervalo máximo é de 31 dias"}
+      500:
+        description: Erro ao consultar os logs
+        examples:
+          {"erro": "Erro ao consultar logs"}
+    """
+    try:
+        filtros, parametros = _filtros_logs()
+        inicio, fim = _intervalo_agregacao()
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
+
+    filtros += ["data_hora >= %(inicio)s", "data_hora < %(fim)s"]
+    parametros.update(inicio=inicio, fim=fim)
+
+    try:
+        with get_cursor() as cur:
+            cur.execute(
+                f""" SELECT to_char(date_trunc('hour', data_hora), 'YYYY-MM-DD"T"HH24:MI:SS') AS hora,
+                        COUNT(*) AS total
+                        FROM logs
+                        WHERE {" AND ".join(filtros)}
+                        GROUP BY date_trunc('hour', data_hora)
+                        ORDER BY date_trunc('hour', data_hora)
+                        """,
+                parametros,
+            )
+            totais = cur.fetchall()
+
+        connection.commit()
+
+    except psycopg.DatabaseError as e:
+        connection.rollback()
+        registrar_log("Erro ao Consultar Logs", str(e))
+        return jsonify({"erro": "Erro ao consultar logs"}), 500
+
+    return (
+        jsonify(
+            {"inicio": inicio.isoformat(), "fim": fim.isoformat(), "dados": totais}
+        ),
+        200,
+    )
+
+
+@logs_bp.route("/erros-por-endpoint", methods=["GET"])
+@jwt_required()
+def erros_por_endpoint():
+    """
+    Quantidade de logs de erro (tipo iniciado por "Erro") por método e URL (requer autenticação).
+
+    Usa o índice parcial dos logs de erro. Sem `inicio`/`fim`, considera as
+    últimas 24 horas; o intervalo é limitado a `LOGS_CONSULTA_MAX_DIAS` dias.
+
+    ---
+    tags:
+      - Logs
+    parameters:
+      - name: inicio
+        in: query
+        type: string
+        format: date-time
+      - name: fim
+        in: query
+        type: string
+        format: date-time
+    security:
+      - JWT: []
+    responses:
+      200:
+        description: Endpoints com erros, do maior número de erros para o menor (até 100)
+        examples:
+          {"inicio": "2026-10-18T12:00:00", "fim": "2026-10-19T12:00:00", "dados": [{"metodo": "POST", "url": "/api/contatos", "erros": 12, "tipos": ["Erro de Validação"], "ultimo_erro": "Sun, 19 Oct 2026 11:58:02 GMT"}]}
+      400:
+        description: Intervalo inválido
+        examples:
+          {"erro": "Data inválida em 'inicio'"}
+      500:
+        description: Erro ao consultar os logs
+        examples:
+          {"erro": "Erro ao consultar logs"}
+    """
+    try:
+        inicio, fim = _intervalo_agregacao()
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
+
+    try:
+        with get_cursor() as cur:
+            cur.execute(
+                f""" SELECT metodo, url, COUNT(*) AS erros,
+                        array_agg(DISTINCT tipo_log) AS tipos,
+                        MAX(data_hora) AS ultimo_erro
+                        FROM logs
+                        WHERE {PREDICADO_ERRO}
+                          AND data_hora >= %(inicio)s AND data_hora < %(fim)s
+                        GROUP BY metodo, url
+                        ORDER BY erros DESC
+                        LIMIT 100
+                        """,
+                {"inicio": inicio, "fim": fim},
+            )
+            erros = cur.fetchall()
+
+        connection.commit()
+
+    except psycopg.DatabaseError as e:
+        connection.rollback()
+        registrar_log("Erro ao Consultar Logs", str(e))
+        return jsonify({"erro": "Erro ao consultar logs"}), 500
+
+    return (
+        jsonify({"inicio": inicio.isoformat(), "fim": fim.isoformat(), "dados": erros}),
+        200,
+    )
+
+
+def _filtros_logs():
+    """
+    Monta os filtros de igualdade (tipo_log, ip, url, metodo) da query string.
+
+    Returns:
+        tuple: (lista de condições SQL, dicionário de parâmetros)
+
+    Raises:
+        ValueError: Se o IP informado for inválido.
+    """
+    filtros = []
+    parametros = {}
+
+    for campo in ("tipo_log", "url"):
+        valor = request.args.get(campo)
+        if valor:
+            filtros.append(f"{campo} = %({campo})s")
+            parametros[campo] = valor
+
+    metodo = request.args.get("metodo")
+    if metodo:
+        filtros.append("metodo = %(metodo)s")
+        parametros["metodo"] = metodo.upper()
+
+    ip = request.args.get("ip")
+    if ip:
+        try:
+            parametros["ip"] = str(ipaddress.ip_address(ip.strip()))
+        except ValueError:
+            raise ValueError("IP inválido")
+        filtros.append("ip_usuario = %(ip)s::inet")
+
+    return filtros, parametros
+
+
+def _parametro_data(nome):
+    """
+    Lê uma data/hora ISO 8601 da query string.
+
+    `data_hora` é gravada em UTC sem fuso: datas com fuso são convertidas para
+    UTC e enviadas sem fuso, para que a comparação use o índice e a poda de
+    partições (timestamp x timestamptz forçaria uma conversão por linha).
+
+    Args:
+        nome (str): Nome do parâmetro.
+
+    Returns:
+        datetime | None: Data/hora sem fuso (UTC), ou None se ausente.
+
+    Raises:
+        ValueError: Se o valor não for uma data válida.
+    """
+    valor = request.args.get(nome)
+    if not valor:
+        return None
+
+    try:
+        data = datetime.fromisoformat(valor.strip())
+    except ValueError:
+        raise ValueError(f"Data inválida em '{nome}'")
+
+    if data.tzinfo is not None:
+        data = data.astimezone(timezone.utc).replace(tzinfo=None)
+    return data
+
+
+def _intervalo_agregacao():
+    """
+    Intervalo das agregações: `inicio`/`fim` da query string, por padrão as
+    últimas 24 horas, limitado a `LOGS_CONSULTA_MAX_DIAS` dias.
+
+    Returns:
+        tuple: (inicio, fim) como datetimes sem fuso (UTC).
+
+    Raises:
+        ValueError: Se as datas forem inválidas ou o intervalo for grande demais.
+    """
+    fim = _parametro_data("fim") or datetime.now(timezone.utc).replace(tzinfo=None)
+    inicio = _parametro_data("inicio") or fim - timedelta(days=1)
+    max_dias = current_app.config["LOGS_CONSULTA_MAX_DIAS"]
+
+    if inicio >= fim:
+        raise ValueError("'inicio' deve ser anterior a 'fim'")
+    if fim - inicio > timedelta(days=max_dias):
+        raise ValueError(f"O intervalo máximo é de {max_dias} dias")
+
+    return inicio, fim
+
+
+def _codificar_cursor(data_hora, log_id):
+    """Cursor opaco com a posição (data_hora, id) do último registro da página."""
+    texto = f"{data_hora.isoformat()}|{log_id}"
+    return base64.urlsafe_b64encode(texto.encode("utf-8")).decode("ascii")
+
+
+def _decodificar_cursor(cursor):
+    """
+    Decodifica um cursor gerado por `_codificar_cursor`.
+
+    Returns:
+        tuple: (data_hora, id)
+
+    Raises:
+        ValueError: Se o cursor for inválido.
+    """
+    try:
+        texto = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        data_hora, log_id = texto.split("|")
+        return datetime.fromisoformat(data_hora), int(log_id)
+    except (UnicodeError, ValueError, TypeError) as e:
+        raise ValueError("Cursor inválido") from e
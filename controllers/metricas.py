@@ -0,0 +1,46 @@
+from flask import Blueprint, Response, current_app, jsonify, request
+from flask_jwt_extended import verify_jwt_in_request
+from services.metricas import registro
+import hmac
+
+metricas_bp = Blueprint("metricas", __name__)
+
+
+@metricas_bp.route("", methods=["GET"])
+def exportar_metricas():
+    """
+    Exporta as métricas do processo no formato de texto do Prometheus.
+
+    Aceita o token estático `METRICS_TOKEN` (para o coletor do Prometheus, via
+    `Authorization: Bearer <token>`) ou, se ele não estiver configurado, um JWT
+    de acesso válido do fotógrafo. Cada worker exporta apenas as suas métricas.
+
+    ---
+    tags:
+      - Métricas
+    security:
+      - JWT: []
+    produces:
+      - text/plain
+    responses:
+      200:
+        description: Histogramas de latência, contadores de status, requisições em andamento e sub-tempos de banco, Cloudinary e SMTP
+      401:
+        description: Token ausente ou inválido
+        examples:
+          {"erro": "Token de métricas inválido"}
+    """
+    token_metricas = current_app.config["METRICS_TOKEN"]
+
+    if token_metricas:
+        cabecalho = request.headers.get("Authorization", "")
+        if not hmac.compare_digest(
+            cabecalho.encode("utf-8"), f"Bearer {token_metricas}".encode("utf-8")
+        ):
+            return jsonify({"erro": "Token de métricas inválido"}), 401
+    else:
+        verify_jwt_in_request()
+
+    return Response(
+        registro.exportar(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
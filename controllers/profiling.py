@@ -0,0 +1,121 @@
+from flask import Blueprint, Response, jsonify
+from flask_jwt_extended import jwt_required
+from services.profiling import armazem_perfis
+from services.logs import registrar_log
+
+profiling_bp = Blueprint("profiling", __name__)
+
+
+@profiling_bp.route("", methods=["GET"])
+@jwt_required()
+def listar_perfis():
+    """
+    Lista os últimos resultados de profiling guardados no processo (requer autenticação).
+
+    ---
+    tags:
+      - Profiling
+    security:
+      - JWT: []
+    responses:
+      200:
+        description: Metadados dos perfis, do mais recente ao mais antigo
+        schema:
+          type: array
+          items:
+            type: object
+            properties:
+              id:
+                type: string
+              endpoint:
+                type: string
+              metodo:
+                type: string
+              caminho:
+                type: string
+              status:
+                type: integer
+              origem:
+                type: string
+                description: "cabecalho" (X-Profile assinado) ou "amostragem"
+              duracao_ms:
+                type: number
+              criado_em:
+                type: string
+                format: date-time
+    """
+    return jsonify(armazem_perfis.listar()), 200
+
+
+@profiling_bp.route("/<perfil_id>", methods=["GET"])
+@jwt_required()
+def obter_perfil(perfil_id):
+    """
+    Retorna o resumo em texto (pstats, por tempo acumulado) de um perfil (requer autenticação).
+
+    ---
+    tags:
+      - Profiling
+    parameters:
+      - name: perfil_id
+        in: path
+        type: string
+        required: true
+    security:
+      - JWT: []
+    produces:
+      - text/plain
+    responses:
+      200:
+        description: Resumo das 40 funções com maior tempo acumulado
+      404:
+        description: Perfil não encontrado (o buffer guarda apenas os mais recentes)
+        examples:
+          {"erro": "Perfil não encontrado"}
+    """
+    perfil = armazem_perfis.obter(perfil_id)
+    if perfil is None:
+        return jsonify({"erro": "Perfil não encontrado"}), 404
+
+    return Response(perfil["resumo"], mimetype="text/plain")
+
+
+@profiling_bp.route("/<perfil_id>/pstats", methods=["GET"])
+@jwt_required()
+def baixar_perfil(perfil_id):
+    """
+    Baixa as estatísticas completas de um perfil no formato do `pstats` (requer autenticação).
+
+    O arquivo pode ser aberto com `python -m pstats perfil.prof` ou `snakeviz perfil.prof`.
+
+    ---
+    tags:
+      - Profiling
+    parameters:
+      - name: perfil_id
+        in: path
+        type: string
+        required: true
+    security:
+      - JWT: []
+    produces:
+      - application/octet-stream
+    responses:
+      200:
+        description: Arquivo .prof
+      404:
+        description: Perfil não encontrado
+        examples:
+          {"erro": "Perfil não encontrado"}
+    """
+    perfil = armazem_perfis.obter(perfil_id)
+    if perfil is None:
+        return jsonify({"erro": "Perfil não encontrado"}), 404
+
+    registrar_log("Perfil Baixado", f"Perfil {perfil_id} de {perfil['caminho']}")
+
+    return Response(
+        perfil["estatisticas"],
+        mimetype="application/octet-stream",
+        headers={"Content-Disposition": f"attachment; filename={perfil_id}.prof"},
+    )
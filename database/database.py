@@ -1,5 +1,6 @@
 from dotenv import load_dotenv
 from psycopg.rows import dict_row
+from database.instrumentacao import CursorInstrumentado
 import psycopg
 import os
 
@@ -14,9 +15,12 @@ if not database_url:
     raise ValueError("DATABASE_URL não está definida!")
 
 # Estabelece conexão com o PostgreSQL usando a URL fornecida.
-# O parâmetro 'row_factory=dict_row' permite que os resultados venham como dicionários.
+# O parâmetro 'row_factory=dict_row' permite que os resultados venham como dicionários
+# e o 'cursor_factory' mede a duração de cada consulta (métricas em /metrics).
 # A conexão é mantida aberta durante o ciclo de vida da aplicação.
-connection = psycopg.connect(database_url, row_factory=dict_row)
+connection = psycopg.connect(
+    database_url, row_factory=dict_row, cursor_factory=CursorInstrumentado
+)
 print("Conexão estabelecida com sucesso!")
 
 
@@ -37,3 +41,41 @@ def get_cursor():
         raise ConnectionError("A conexão com o banco foi fechada!")
 
     return connection.cursor()
+
+
+def criar_conexao():
+    """
+    Abre uma nova conexão com o banco, independente da conexão compartilhada.
+
+    Usada por tarefas em segundo plano (threads), para que suas transações não
+    se misturem com as das requisições.
+
+    Returns:
+        psycopg.Connection: Nova conexão com `row_factory=dict_row` e cursores instrumentados.
+    """
+    return psycopg.connect(
+        database_url, row_factory=dict_row, cursor_factory=CursorInstrumentado
+    )
+
+
+def encerrar_transacao():
+    """
+    Encerra a transação deixada aberta na conexão compartilhada.
+
+    Consultas de leitura abrem uma transação implícita (a conexão não usa
+    autocommit). Sem um COMMIT, a conexão fica "idle in transaction": segura
+    locks (que bloqueiam, por exemplo, o DROP das partições de logs) e mantém
+    o CURRENT_TIMESTAMP do início da transação nos INSERTs seguintes.
+    Chamada ao fim de cada requisição (teardown) e após leituras isoladas.
+
+    Returns:
+        None
+    """
+    if connection.closed:
+        return
+
+    status = connection.info.transaction_status
+    if status == psycopg.pq.TransactionStatus.INTRANS:
+        connection.commit()
+    elif status == psycopg.pq.TransactionStatus.INERROR:
+        connection.rollback()
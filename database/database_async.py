@@ -0,0 +1,77 @@
+from psycopg.rows import dict_row
+from database.database import database_url
+from database.instrumentacao import CursorAsyncInstrumentado
+
+try:
+    from psycopg_pool import AsyncConnectionPool
+except ImportError:  # psycopg-pool só é necessário no modo ASGI (asgi.py)
+    AsyncConnectionPool = None
+
+# Pool compartilhado pelas rotas assíncronas (aberto no startup do servidor ASGI)
+_pool = None
+
+
+async def abrir_pool(config):
+    """
+    Abre o pool de conexões assíncronas usado pelas rotas do modo ASGI.
+
+    As conexões usam `row_factory=dict_row` e cursores instrumentados, como a
+    conexão compartilhada de `database.database`.
+
+    Args:
+        config (dict): Configuração da aplicação (`ASGI_POOL_MIN` e `ASGI_POOL_MAX`).
+
+    Returns:
+        psycopg_pool.AsyncConnectionPool: Pool aberto.
+
+    Raises:
+        RuntimeError: Se o pacote psycopg-pool não estiver instalado.
+    """
+    global _pool
+
+    if _pool is not None:
+        return _pool
+
+    if AsyncConnectionPool is None:
+        raise RuntimeError("O modo ASGI requer o pacote psycopg-pool.")
+
+    pool = AsyncConnectionPool(
+        database_url,
+        min_size=config["ASGI_POOL_MIN"],
+        max_size=config["ASGI_POOL_MAX"],
+        kwargs={"row_factory": dict_row, "cursor_factory": CursorAsyncInstrumentado},
+        open=False,
+    )
+    await pool.open()
+    _pool = pool
+    return _pool
+
+
+async def fechar_pool():
+    """
+    Fecha o pool de conexões assíncronas (shutdown do servidor ASGI).
+
+    Returns:
+        None
+    """
+    global _pool
+
+    if _pool is not None:
+        pool, _pool = _pool, None
+        await pool.close()
+
+
+def obter_pool():
+    """
+    Retorna o pool de conexões assíncronas.
+
+    Returns:
+        psycopg_pool.AsyncConnectionPool: Pool aberto por `abrir_pool`.
+
+    Raises:
+        ConnectionError: Se o pool ainda não foi aberto.
+    """
+    if _pool is None:
+        raise ConnectionError("O pool de conexões assíncronas não foi aberto!")
+
+    return _pool
@@ -0,0 +1,296 @@
+from services.metricas import medir_upstream, registro
+from psycopg.rows import tuple_row
+from psycopg import sql
+from collections import deque
+from functools import lru_cache
+import psycopg
+import re
+import threading
+import time
+
+# Consultas acima deste tempo (ms) são registradas no log de consultas lentas
+_limite_lenta_ms = 200
+# Se True, o log de consultas lentas inclui o plano (EXPLAIN) dos SELECTs
+_explain_lentas = False
+
+# Máximo de fingerprints distintos agregados (o excedente vai para "outras")
+_max_fingerprints = 500
+# Durações guardadas por fingerprint para o cálculo do p95
+_amostras_por_fingerprint = 500
+
+_padroes_fingerprint = (
+    (re.compile(r"--[^\n]*"), " "),
+    (re.compile(r"/\*.*?\*/", re.DOTALL), " "),
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"%\(\w+\)s|%s|\$\d+"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(?)"),
+    (re.compile(r"\s+"), " "),
+)
+
+
+def configurar_instrumentacao(limite_lenta_ms, explain_lentas=False):
+    """
+    Ajusta o log de consultas lentas (chamada em `create_app()` a partir do `Config`).
+
+    Args:
+        limite_lenta_ms (float): Duração (ms) a partir da qual a consulta é registrada.
+        explain_lentas (bool): Se True, inclui o EXPLAIN dos SELECTs lentos.
+
+    Returns:
+        None
+    """
+    global _limite_lenta_ms, _explain_lentas
+
+    _limite_lenta_ms = limite_lenta_ms
+    _explain_lentas = explain_lentas
+
+
+def _texto_sql(query, contexto=None):
+    if isinstance(query, bytes):
+        return query.decode("utf-8", "replace")
+    if isinstance(query, sql.Composable):
+        # psycopg.sql.Composed/SQL: monta o texto com a conexão (ou cursor), se houver
+        return query.as_string(contexto) if contexto is not None else repr(query)
+    return query
+
+
+def operacao_sql(query):
+    """
+    Extrai o tipo da instrução SQL (primeira palavra), usado como rótulo das métricas.
+
+    Args:
+        query (str | psycopg.sql.Composable | bytes): Instrução executada.
+
+    Returns:
+        str: Ex: 'SELECT', 'INSERT', 'UPDATE' (ou 'OUTRA' se não identificada).
+    """
+    partes = _texto_sql(query).split(None, 1)
+    if not partes:
+        return "OUTRA"
+    return partes[0].upper()
+
+
+@lru_cache(maxsize=1024)
+def gerar_fingerprint(query):
+    """
+    Normaliza uma instrução SQL para agrupar execuções da mesma consulta.
+
+    Remove comentários, troca literais e placeholders por `?`, reduz listas
+    `(?, ?, ...)` a `(?)` e colapsa espaços.
+
+    Args:
+        query (str): Instrução SQL.
+
+    Returns:
+        str: Fingerprint, ex: 'SELECT * FROM contatos WHERE id = ?'.
+    """
+    for padrao, substituto in _padroes_fingerprint:
+        query = padrao.sub(substituto, query)
+    return query.strip()
+
+
+class EstatisticasConsultas:
+    """
+    Agrega, em memória, as execuções de SQL por fingerprint: quantidade,
+    tempo total, tempo máximo e as últimas durações (para o p95).
+    """
+
+    def __init__(self, max_fingerprints, amostras):
+        self.max_fingerprints = max_fingerprints
+        self.amostras = amostras
+        self._dados = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, fingerprint, duracao):
+        """Soma uma execução de `duracao` segundos ao fingerprint."""
+        with self._lock:
+            dados = self._dados.get(fingerprint)
+            if dados is None:
+                if len(self._dados) >= self.max_fingerprints:
+                    fingerprint = "outras"
+                    dados = self._dados.get(fingerprint)
+                if dados is None:
+                    # [quantidade, total, máximo, últimas durações]
+                    dados = self._dados[fingerprint] = [
+                        0,
+                        0.0,
+                        0.0,
+                        deque(maxlen=self.amostras),
+                    ]
+
+            dados[0] += 1
+            dados[1] += duracao
+            dados[2] = max(dados[2], duracao)
+            dados[3].append(duracao)
+
+    def resumo(self):
+        """
+        Retorna os agregados por fingerprint, do maior tempo total para o menor.
+
+        Returns:
+            list: [{'consulta', 'quantidade', 'total_segundos', 'maximo_segundos', 'p95_segundos'}]
+        """
+        # Sob o lock só a cópia; a ordenação fica fora para não travar registrar()
+        with self._lock:
+            copia = [
+                (fingerprint, quantidade, total, maximo, list(duracoes))
+                for fingerprint, (
+                    quantidade,
+                    total,
+                    maximo,
+                    duracoes,
+                ) in self._dados.items()
+            ]
+
+        resumo = []
+        for fingerprint, quantidade, total, maximo, duracoes in copia:
+            duracoes.sort()
+            p95 = duracoes[min(len(duracoes) - 1, int(len(duracoes) * 0.95))]
+            resumo.append(
+                {
+                    "consulta": fingerprint,
+                    "quantidade": quantidade,
+                    "total_segundos": total,
+                    "maximo_segundos": maximo,
+                    "p95_segundos": p95,
+                }
+            )
+
+        resumo.sort(key=lambda item: item["total_segundos"], reverse=True)
+        return resumo
+
+
+estatisticas_consultas = EstatisticasConsultas(
+    _max_fingerprints, _amostras_por_fingerprint
+)
+
+
+class CursorInstrumentado(psycopg.Cursor):
+    """
+    Cursor do psycopg que mede cada `execute`/`executemany`.
+
+    Usado como `cursor_factory` das conexões, de modo que todas as consultas
+    feitas com `get_cursor()` entram nas métricas sem alterar os controllers:
+        - `upstream_duracao_segundos{servico="postgres"}` por tipo de instrução
+        - agregados por fingerprint (quantidade, tempo total, p95)
+        - um span por consulta no rastro da requisição (tracing)
+        - log das consultas acima de `SQL_LENTA_LIMITE_MS`, com EXPLAIN opcional
+    """
+
+    def execute(self, query, params=None, **kwargs):
+        texto = _texto_sql(query, self)
+        fingerprint = gerar_fingerprint(texto)
+        inicio = time.perf_counter()
+        try:
+            with medir_upstream("postgres", operacao_sql(texto), consulta=fingerprint):
+                return super().execute(query, params, **kwargs)
+        finally:
+            self._registrar(
+                texto, fingerprint, query, params, time.perf_counter() - inicio
+            )
+
+    def executemany(self, query, params_seq, **kwargs):
+        texto = _texto_sql(query, self)
+        fingerprint = gerar_fingerprint(texto)
+        inicio = time.perf_counter()
+        try:
+            with medir_upstream("postgres", operacao_sql(texto), consulta=fingerprint):
+                return super().executemany(query, params_seq, **kwargs)
+        finally:
+            self._registrar(
+                texto, fingerprint, query, None, time.perf_counter() - inicio
+            )
+
+    def _registrar(self, texto, fingerprint, query, params, duracao):
+        estatisticas_consultas.registrar(fingerprint, duracao)
+
+        if duracao * 1000 >= _limite_lenta_ms:
+            mensagem = f"[SQL lenta] {duracao * 1000:.1f} ms: {fingerprint}"
+            if _explain_lentas and operacao_sql(texto) == "SELECT":
+                mensagem += "\n" + self._explicar(query, params)
+            print(mensagem)
+
+    def _explicar(self, query, params):
+        # Usa um cursor comum (não instrumentado) e um savepoint, para que uma
+        # falha no EXPLAIN não aborte a transação da requisição
+        try:
+            with self.connection.transaction():
+                with psycopg.Cursor(self.connection, row_factory=tuple_row) as cur:
+                    cur.execute(sql.SQL("EXPLAIN ") + _como_sql(query), params)
+                    return "\n".join(linha[0] for linha in cur.fetchall())
+        except psycopg.Error as e:
+            return f"(EXPLAIN indisponível: {e})"
+
+
+class CursorAsyncInstrumentado(psycopg.AsyncCursor):
+    """
+    Equivalente assíncrono de `CursorInstrumentado`, usado pelo pool do modo
+    ASGI (`database.database_async`).
+
+    Registra as mesmas métricas, spans e agregados por fingerprint. O log de
+    consultas lentas não inclui o EXPLAIN, que exigiria outra ida ao banco
+    dentro da requisição.
+    """
+
+    async def execute(self, query, params=None, **kwargs):
+        texto = _texto_sql(query, self)
+        fingerprint = gerar_fingerprint(texto)
+        inicio = time.perf_counter()
+        try:
+            with medir_upstream("postgres", operacao_sql(texto), consulta=fingerprint):
+                return await super().execute(query, params, **kwargs)
+        finally:
+            _registrar_async(fingerprint, time.perf_counter() - inicio)
+
+    async def executemany(self, query, params_seq, **kwargs):
+        texto = _texto_sql(query, self)
+        fingerprint = gerar_fingerprint(texto)
+        inicio = time.perf_counter()
+        try:
+            with medir_upstream("postgres", operacao_sql(texto), consulta=fingerprint):
+                return await super().executemany(query, params_seq, **kwargs)
+        finally:
+            _registrar_async(fingerprint, time.perf_counter() - inicio)
+
+
+def _registrar_async(fingerprint, duracao):
+    estatisticas_consultas.registrar(fingerprint, duracao)
+
+    if duracao * 1000 >= _limite_lenta_ms:
+        print(f"[SQL lenta] {duracao * 1000:.1f} ms: {fingerprint}")
+
+
+def _como_sql(query):
+    if isinstance(query, sql.Composable):
+        return query
+    return sql.SQL(query.decode("utf-8") if isinstance(query, bytes) else query)
+
+
+@registro.registrar_coletor
+def _coletar_consultas():
+    # As três séries saem do mesmo resumo, calculado uma vez por exportação
+    resumo = estatisticas_consultas.resumo()
+    return [
+        (
+            "sql_consultas_total",
+            "counter",
+            "Execuções de SQL por fingerprint da consulta.",
+            [({"consulta": item["consulta"]}, item["quantidade"]) for item in resumo],
+        ),
+        (
+            "sql_duracao_segundos_total",
+            "counter",
+            "Tempo total gasto em cada fingerprint de consulta.",
+            [
+                ({"consulta": item["consulta"]}, item["total_segundos"])
+                for item in resumo
+            ],
+        ),
+        (
+            "sql_duracao_p95_segundos",
+            "gauge",
+            "Percentil 95 das últimas execuções de cada fingerprint de consulta.",
+            [({"consulta": item["consulta"]}, item["p95_segundos"]) for item in resumo],
+        ),
+    ]
@@ -21,6 +21,8 @@ CREATE TABLE fotografo (
     senha_hash VARCHAR(255) NOT NULL,
     token_recuperacao VARCHAR(255),
     token_expiracao TIMESTAMP,
+    -- Época de sessão: incrementada no "sair de todos" e na troca de senha (claim token_epoch)
+    token_epoch INTEGER NOT NULL DEFAULT 0,
     criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -29,9 +31,10 @@ CREATE TABLE fotografo (
 -- 3. Tabela: tokens_recuperacao
 ---------------------------------------------------------------------
 -- Armazena tokens usados para recuperação de senha do usuário.
+-- Apenas o digest SHA-256 do token é gravado (32 bytes), nunca o texto puro.
 CREATE TABLE tokens_recuperacao (
     id SERIAL PRIMARY KEY,
-    token VARCHAR(500) UNIQUE NOT NULL,
+    token_hash BYTEA UNIQUE NOT NULL CHECK (octet_length(token_hash) = 32),
     fotografo_id INTEGER NOT NULL REFERENCES fotografo(id),
     usado BOOLEAN DEFAULT FALSE,
     criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -45,16 +48,56 @@ CREATE INDEX idx_tokens_nao_usados ON tokens_recuperacao(fotografo_id) WHERE usa
 -- 4. Tabela: tokens_denylist
 ---------------------------------------------------------------------
 -- Lista negra de tokens JWT que foram invalidados (por logout, etc.).
+-- Cada linha guarda a expiração do token (claim `exp`) e é removida depois dela.
+-- A busca por token_jti usa o índice criado pela constraint UNIQUE.
 CREATE TABLE tokens_denylist (
     id SERIAL PRIMARY KEY,
     token_jti VARCHAR(36) NOT NULL UNIQUE,
     fotografo_id INTEGER NOT NULL REFERENCES fotografo(id),
     data_denylist TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    motivo VARCHAR(50) DEFAULT 'logout'
+    motivo VARCHAR(50) DEFAULT 'logout',
+    expira_em TIMESTAMP NOT NULL
 );
 
--- Índice para busca rápida de tokens JWT revogados
-CREATE INDEX idx_tokens_denylist_jti ON tokens_denylist(token_jti);
+-- Índice para a limpeza periódica de tokens expirados
+CREATE INDEX idx_tokens_denylist_expira_em ON tokens_denylist(expira_em);
+
+---------------------------------------------------------------------
+-- 4.1. Tabela: tokens_refresh
+---------------------------------------------------------------------
+-- Refresh tokens rotativos (uso único). Cada login cria uma família;
+-- o reuso de um token já trocado revoga a família inteira.
+CREATE TABLE tokens_refresh (
+    jti VARCHAR(36) PRIMARY KEY,
+    familia VARCHAR(36) NOT NULL,
+    fotografo_id INTEGER NOT NULL REFERENCES fotografo(id),
+    usado BOOLEAN NOT NULL DEFAULT FALSE,
+    revogado BOOLEAN NOT NULL DEFAULT FALSE,
+    criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    expira_em TIMESTAMP NOT NULL
+);
+
+-- Índices para revogação por família e limpeza de tokens expirados
+CREATE INDEX idx_tokens_refresh_familia ON tokens_refresh(familia);
+CREATE INDEX idx_tokens_refresh_expira_em ON tokens_refresh(expira_em);
+
+---------------------------------------------------------------------
+-- 4.2. Tabelas: tentativas_login e falhas_login
+---------------------------------------------------------------------
+-- Usadas apenas com LOGIN_LIMITE_BACKEND=postgres, para compartilhar o limite
+-- de tentativas de login entre workers. `momento` é um timestamp Unix.
+CREATE TABLE tentativas_login (
+    chave VARCHAR(320) NOT NULL,
+    momento DOUBLE PRECISION NOT NULL
+);
+
+CREATE INDEX idx_tentativas_login_chave_momento ON tentativas_login(chave, momento);
+
+CREATE TABLE falhas_login (
+    chave VARCHAR(320) PRIMARY KEY,
+    falhas INTEGER NOT NULL,
+    ultima_falha DOUBLE PRECISION NOT NULL
+);
 
 ---------------------------------------------------------------------
 -- 5. Tabela: contatos
@@ -66,17 +109,36 @@ CREATE TABLE contatos (
     telefone VARCHAR(20),
     email VARCHAR(100),
     mensagem TEXT NOT NULL,
-    data_envio TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    data_envio TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    -- Identificador do registro no journal local (modo de ingestão "journal"),
+    -- usado para não duplicar contatos ao reprocessar um lote
+    journal_id UUID UNIQUE,
+    lido BOOLEAN NOT NULL DEFAULT FALSE,
+    arquivado BOOLEAN NOT NULL DEFAULT FALSE,
+    -- Momento real do INSERT (margem de segurança das estatísticas incrementais)
+    inserido_em TIMESTAMP DEFAULT clock_timestamp()
 );
 
+-- Índices parciais da caixa de entrada (listagem e contagem por data de envio)
+CREATE INDEX idx_contatos_nao_lidos ON contatos(data_envio DESC, id DESC)
+    WHERE lido = FALSE AND arquivado = FALSE;
+CREATE INDEX idx_contatos_caixa_entrada ON contatos(data_envio DESC, id DESC)
+    WHERE arquivado = FALSE;
+CREATE INDEX idx_contatos_arquivados ON contatos(data_envio DESC, id DESC)
+    WHERE arquivado = TRUE;
+-- Filtro por lido em todas as pastas (lido=...&arquivado=todos)
+CREATE INDEX idx_contatos_lido ON contatos(lido, data_envio DESC, id DESC);
+
 ---------------------------------------------------------------------
 -- 6. Tabela: formas_contato
 ---------------------------------------------------------------------
 -- Armazena informações públicas sobre como entrar em contato.
 CREATE TABLE formas_contato (
     id SERIAL PRIMARY KEY,
-    tipo VARCHAR(255),
-    contato VARCHAR(255),
+    redesocial_nome VARCHAR(255),
+    redesocial_perfil VARCHAR(255),
+    email VARCHAR(255),
+    telefone VARCHAR(255),
     atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -84,13 +146,158 @@ CREATE TABLE formas_contato (
 -- 7. Tabela: logs
 ---------------------------------------------------------------------
 -- Armazena registros de acesso e erros para auditoria e depuração.
+-- Particionada por mês (data_hora): a retenção remove partições inteiras.
 CREATE TABLE logs (
-    id SERIAL PRIMARY KEY,
+    id BIGSERIAL,
     tipo_log VARCHAR(255),
-    data_hora TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    ip_usuario VARCHAR(45),
+    data_hora TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    ip_usuario INET,
     user_agent VARCHAR(255),
     url VARCHAR(255),
     metodo VARCHAR(10),
-    status VARCHAR(50)
-);
\ No newline at end of file
+    status VARCHAR(255),
+    -- Momento real do INSERT (data_hora é o início da transação)
+    inserido_em TIMESTAMP DEFAULT clock_timestamp(),
+    PRIMARY KEY (id, data_hora)
+) PARTITION BY RANGE (data_hora);
+
+-- Recebe linhas de meses sem partição (ex: manutenção atrasada), evitando erro no INSERT
+CREATE TABLE logs_padrao PARTITION OF logs DEFAULT;
+
+-- Índice particionado: criado automaticamente em cada partição
+CREATE INDEX idx_logs_tipo_data_hora ON logs(tipo_log, data_hora);
+-- Paginação por keyset (data_hora, id) da consulta de logs (GET /api/logs): a chave
+-- primária (id, data_hora) não serve ao ORDER BY data_hora DESC, id DESC
+CREATE INDEX idx_logs_data_hora_id ON logs(data_hora, id);
+-- Filtro por IP (seletivo). O filtro por URL (poucos valores) usa o índice acima
+CREATE INDEX idx_logs_ip_data_hora ON logs(ip_usuario, data_hora);
+-- Índice parcial dos logs de erro (GET /api/logs/erros-por-endpoint); só recebe as linhas de erro
+CREATE INDEX idx_logs_erros ON logs(data_hora) WHERE tipo_log LIKE 'Erro%';
+
+-- Cria as partições mensais de `logs` desde o mês de `desde` até `meses_a_frente`
+-- meses após o mês atual. Linhas que já caíram na partição padrão para um mês
+-- criado agora são movidas para a nova partição antes do ATTACH.
+CREATE OR REPLACE FUNCTION criar_particoes_logs(
+    meses_a_frente INTEGER DEFAULT 3,
+    desde DATE DEFAULT CURRENT_DATE
+) RETURNS INTEGER
+LANGUAGE plpgsql AS $$
+DECLARE
+    mes DATE := date_trunc('month', desde)::date;
+    ultimo DATE := (date_trunc('month', CURRENT_DATE) + make_interval(months => meses_a_frente))::date;
+    proximo DATE;
+    particao TEXT;
+    criadas INTEGER := 0;
+BEGIN
+    -- Vários workers podem chamar a função ao mesmo tempo
+    PERFORM pg_advisory_xact_lock(hashtext('particoes_logs'));
+
+    WHILE mes <= ultimo LOOP
+        proximo := (mes + INTERVAL '1 month')::date;
+        particao := 'logs_' || to_char(mes, 'YYYY_MM');
+
+        IF to_regclass(particao) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I (LIKE logs INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+                particao
+            );
+            EXECUTE format(
+                'WITH movidas AS (DELETE FROM logs_padrao WHERE data_hora >= %L AND data_hora < %L RETURNING *)
+                 INSERT INTO %I SELECT * FROM movidas',
+                mes, proximo, particao
+            );
+            EXECUTE format(
+                'ALTER TABLE logs ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                particao, mes, proximo
+            );
+            criadas := criadas + 1;
+        END IF;
+
+        mes := proximo;
+    END LOOP;
+
+    RETURN criadas;
+END;
+$$;
+
+-- Retenção: remove (DROP) as partições mensais inteiramente anteriores aos
+-- últimos `meses_retencao` meses, sem DELETE linha a linha nem VACUUM depois.
+CREATE OR REPLACE FUNCTION remover_particoes_logs(meses_retencao INTEGER)
+RETURNS INTEGER
+LANGUAGE plpgsql AS $$
+DECLARE
+    limite DATE := (date_trunc('month', CURRENT_DATE) - make_interval(months => meses_retencao))::date;
+    particao TEXT;
+    removidas INTEGER := 0;
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('particoes_logs'));
+
+    FOR particao IN
+        SELECT filha.relname
+        FROM pg_inherits
+        JOIN pg_class filha ON filha.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = 'logs'::regclass
+          AND filha.relname ~ '^logs_[0-9]{4}_[0-9]{2}$'
+          AND to_date(substr(filha.relname, 6), 'YYYY_MM') < limite
+        ORDER BY filha.relname
+    LOOP
+        EXECUTE format('DROP TABLE %I', particao);
+        removidas := removidas + 1;
+    END LOOP;
+
+    -- A partição padrão só recebe linhas fora das partições mensais (deve ser pequena)
+    DELETE FROM logs_padrao WHERE data_hora < limite;
+
+    RETURN removidas;
+END;
+$$;
+
+-- Partições do mês atual e dos próximos 3 meses
+SELECT criar_particoes_logs(3);
+
+---------------------------------------------------------------------
+-- 8. Tabelas: estatísticas do painel
+---------------------------------------------------------------------
+-- Resumos do painel (/api/estatisticas), atualizados incrementalmente a partir
+-- das tabelas de origem: cada atualização processa apenas as linhas com id acima
+-- da marca (high-water mark) guardada em estatisticas_marcas.
+CREATE TABLE estatisticas_marcas (
+    fonte VARCHAR(50) PRIMARY KEY,
+    ultimo_id BIGINT NOT NULL DEFAULT 0,
+    atualizado_em TIMESTAMP
+);
+
+INSERT INTO estatisticas_marcas (fonte) VALUES ('contatos'), ('logs');
+
+-- Contatos recebidos por semana (segunda-feira da semana)
+CREATE TABLE estatisticas_contatos_semana (
+    semana DATE PRIMARY KEY,
+    total INTEGER NOT NULL
+);
+
+-- Visualizações da galeria ("Requisição de Galeria") por pasta e dia
+CREATE TABLE estatisticas_galeria_pasta (
+    dia DATE NOT NULL,
+    pasta VARCHAR(255) NOT NULL,
+    visualizacoes INTEGER NOT NULL,
+    PRIMARY KEY (dia, pasta)
+);
+
+-- Falhas de login ("Login falhou") por dia
+CREATE TABLE estatisticas_falhas_login (
+    dia DATE PRIMARY KEY,
+    total INTEGER NOT NULL
+);
+
+---------------------------------------------------------------------
+-- 9. Tabela: visualizacoes_fotos
+---------------------------------------------------------------------
+-- Visualizações por foto (public_id do Cloudinary), somadas em lote pela aplicação
+CREATE TABLE visualizacoes_fotos (
+    foto_id VARCHAR(255) PRIMARY KEY,
+    visualizacoes BIGINT NOT NULL,
+    ultima_visualizacao TIMESTAMP
+);
+
+-- Índice para a listagem das fotos mais vistas
+CREATE INDEX idx_visualizacoes_fotos_total ON visualizacoes_fotos(visualizacoes DESC);
@@ -0,0 +1,23 @@
+-- 001_tokens_recuperacao_hash.sql
+-- Substitui o token de recuperação em texto puro pelo seu digest SHA-256.
+-- Aplicar em bancos criados com a versão anterior de migration.sql.
+
+BEGIN;
+
+ALTER TABLE tokens_recuperacao ADD COLUMN token_hash BYTEA;
+
+-- Converte os tokens existentes para o digest (mesmo cálculo feito em utils/token.py)
+UPDATE tokens_recuperacao SET token_hash = sha256(convert_to(token, 'UTF8'));
+
+ALTER TABLE tokens_recuperacao
+    ALTER COLUMN token_hash SET NOT NULL,
+    ADD CONSTRAINT tokens_recuperacao_token_hash_key UNIQUE (token_hash),
+    ADD CONSTRAINT tokens_recuperacao_token_hash_check CHECK (octet_length(token_hash) = 32);
+
+-- Remove a coluna antiga (e o índice UNIQUE de 500 caracteres junto com ela)
+ALTER TABLE tokens_recuperacao DROP COLUMN token;
+
+-- Limpa tokens usados ou expirados acumulados até aqui
+DELETE FROM tokens_recuperacao WHERE usado = TRUE OR expira_em < CURRENT_TIMESTAMP;
+
+COMMIT;
@@ -0,0 +1,18 @@
+-- 002_tokens_denylist_expiracao.sql
+-- Guarda a expiração de cada token na denylist e remove o índice redundante.
+
+BEGIN;
+
+-- Tokens antigos não têm `exp` registrado: assume a validade máxima (24 horas)
+ALTER TABLE tokens_denylist ADD COLUMN expira_em TIMESTAMP;
+UPDATE tokens_denylist SET expira_em = data_denylist + INTERVAL '24 hours';
+ALTER TABLE tokens_denylist ALTER COLUMN expira_em SET NOT NULL;
+
+-- O UNIQUE de token_jti já cria um índice equivalente
+DROP INDEX IF EXISTS idx_tokens_denylist_jti;
+
+CREATE INDEX idx_tokens_denylist_expira_em ON tokens_denylist(expira_em);
+
+DELETE FROM tokens_denylist WHERE expira_em < CURRENT_TIMESTAMP;
+
+COMMIT;
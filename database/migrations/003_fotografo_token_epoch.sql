@@ -0,0 +1,4 @@
+-- 003_fotografo_token_epoch.sql
+-- Época de sessão usada na revogação de tokens sem estado (claim token_epoch).
+
+ALTER TABLE fotografo ADD COLUMN token_epoch INTEGER NOT NULL DEFAULT 0;
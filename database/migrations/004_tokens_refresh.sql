@@ -0,0 +1,19 @@
+-- 004_tokens_refresh.sql
+-- Refresh tokens rotativos (uso único) agrupados por família de sessão.
+
+BEGIN;
+
+CREATE TABLE tokens_refresh (
+    jti VARCHAR(36) PRIMARY KEY,
+    familia VARCHAR(36) NOT NULL,
+    fotografo_id INTEGER NOT NULL REFERENCES fotografo(id),
+    usado BOOLEAN NOT NULL DEFAULT FALSE,
+    revogado BOOLEAN NOT NULL DEFAULT FALSE,
+    criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    expira_em TIMESTAMP NOT NULL
+);
+
+CREATE INDEX idx_tokens_refresh_familia ON tokens_refresh(familia);
+CREATE INDEX idx_tokens_refresh_expira_em ON tokens_refresh(expira_em);
+
+COMMIT;
@@ -0,0 +1,20 @@
+-- 005_limite_login.sql
+-- Tabelas do backend compartilhado do limite de tentativas de login
+-- (necessárias apenas com LOGIN_LIMITE_BACKEND=postgres).
+
+BEGIN;
+
+CREATE TABLE tentativas_login (
+    chave VARCHAR(320) NOT NULL,
+    momento DOUBLE PRECISION NOT NULL
+);
+
+CREATE INDEX idx_tentativas_login_chave_momento ON tentativas_login(chave, momento);
+
+CREATE TABLE falhas_login (
+    chave VARCHAR(320) PRIMARY KEY,
+    falhas INTEGER NOT NULL,
+    ultima_falha DOUBLE PRECISION NOT NULL
+);
+
+COMMIT;
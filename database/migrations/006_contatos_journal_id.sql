@@ -0,0 +1,4 @@
+-- 006_contatos_journal_id.sql
+-- Identificador do journal local em cada contato (modo de ingestão "journal").
+
+ALTER TABLE contatos ADD COLUMN journal_id UUID UNIQUE;
@@ -0,0 +1,20 @@
+-- 007_contatos_lido_arquivado.sql
+-- Estado de leitura e arquivamento dos contatos, com índices parciais da caixa de entrada.
+
+BEGIN;
+
+-- Mensagens já existentes foram vistas na listagem antiga: entram como lidas.
+-- ADD COLUMN com DEFAULT constante não reescreve a tabela (nem gera um UPDATE de
+-- todas as linhas); em seguida o padrão dos novos contatos passa a ser FALSE.
+ALTER TABLE contatos ADD COLUMN lido BOOLEAN NOT NULL DEFAULT TRUE;
+ALTER TABLE contatos ALTER COLUMN lido SET DEFAULT FALSE;
+ALTER TABLE contatos ADD COLUMN arquivado BOOLEAN NOT NULL DEFAULT FALSE;
+
+CREATE INDEX idx_contatos_nao_lidos ON contatos(data_envio DESC, id DESC)
+    WHERE lido = FALSE AND arquivado = FALSE;
+CREATE INDEX idx_contatos_caixa_entrada ON contatos(data_envio DESC, id DESC)
+    WHERE arquivado = FALSE;
+CREATE INDEX idx_contatos_arquivados ON contatos(data_envio DESC, id DESC)
+    WHERE arquivado = TRUE;
+
+COMMIT;
@@ -0,0 +1,137 @@
+-- 008_logs_particionado.sql
+-- Converte `logs` em tabela particionada por mês (data_hora), com `inet` para o IP,
+-- índice em (tipo_log, data_hora), partição padrão e funções de manutenção
+-- (criação de partições futuras e retenção por DROP de partições antigas).
+--
+-- Os logs existentes são copiados para as novas partições. Em tabelas muito
+-- grandes, rode em uma janela de manutenção (a tabela antiga fica bloqueada).
+
+BEGIN;
+
+LOCK TABLE logs IN ACCESS EXCLUSIVE MODE;
+ALTER TABLE logs RENAME TO logs_antiga;
+ALTER SEQUENCE logs_id_seq RENAME TO logs_antiga_id_seq;
+
+CREATE TABLE logs (
+    id BIGSERIAL,
+    tipo_log VARCHAR(255),
+    data_hora TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    ip_usuario INET,
+    user_agent VARCHAR(255),
+    url VARCHAR(255),
+    metodo VARCHAR(10),
+    status VARCHAR(50),
+    PRIMARY KEY (id, data_hora)
+) PARTITION BY RANGE (data_hora);
+
+-- Recebe linhas de meses sem partição (ex: manutenção atrasada), evitando erro no INSERT
+CREATE TABLE logs_padrao PARTITION OF logs DEFAULT;
+
+-- Índice particionado: criado automaticamente em cada partição
+CREATE INDEX idx_logs_tipo_data_hora ON logs(tipo_log, data_hora);
+
+-- Cria as partições mensais de `logs` desde o mês de `desde` até `meses_a_frente`
+-- meses após o mês atual. Linhas que já caíram na partição padrão para um mês
+-- criado agora são movidas para a nova partição antes do ATTACH.
+CREATE OR REPLACE FUNCTION criar_particoes_logs(
+    meses_a_frente INTEGER DEFAULT 3,
+    desde DATE DEFAULT CURRENT_DATE
+) RETURNS INTEGER
+LANGUAGE plpgsql AS $$
+DECLARE
+    mes DATE := date_trunc('month', desde)::date;
+    ultimo DATE := (date_trunc('month', CURRENT_DATE) + make_interval(months => meses_a_frente))::date;
+    proximo DATE;
+    particao TEXT;
+    criadas INTEGER := 0;
+BEGIN
+    -- Vários workers podem chamar a função ao mesmo tempo
+    PERFORM pg_advisory_xact_lock(hashtext('particoes_logs'));
+
+    WHILE mes <= ultimo LOOP
+        proximo := (mes + INTERVAL '1 month')::date;
+        particao := 'logs_' || to_char(mes, 'YYYY_MM');
+
+        IF to_regclass(particao) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I (LIKE logs INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+                particao
+            );
+            EXECUTE format(
+                'WITH movidas AS (DELETE FROM logs_padrao WHERE data_hora >= %L AND data_hora < %L RETURNING *)
+                 INSERT INTO %I SELECT * FROM movidas',
+                mes, proximo, particao
+            );
+            EXECUTE format(
+                'ALTER TABLE logs ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                particao, mes, proximo
+            );
+            criadas := criadas + 1;
+        END IF;
+
+        mes := proximo;
+    END LOOP;
+
+    RETURN criadas;
+END;
+$$;
+
+-- Retenção: remove (DROP) as partições mensais inteiramente anteriores aos
+-- últimos `meses_retencao` meses, sem DELETE linha a linha nem VACUUM depois.
+CREATE OR REPLACE FUNCTION remover_particoes_logs(meses_retencao INTEGER)
+RETURNS INTEGER
+LANGUAGE plpgsql AS $$
+DECLARE
+    limite DATE := (date_trunc('month', CURRENT_DATE) - make_interval(months => meses_retencao))::date;
+    particao TEXT;
+    removidas INTEGER := 0;
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('particoes_logs'));
+
+    FOR particao IN
+        SELECT filha.relname
+        FROM pg_inherits
+        JOIN pg_class filha ON filha.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = 'logs'::regclass
+          AND filha.relname ~ '^logs_[0-9]{4}_[0-9]{2}$'
+          AND to_date(substr(filha.relname, 6), 'YYYY_MM') < limite
+        ORDER BY filha.relname
+    LOOP
+        EXECUTE format('DROP TABLE %I', particao);
+        removidas := removidas + 1;
+    END LOOP;
+
+    -- A partição padrão só recebe linhas fora das partições mensais (deve ser pequena)
+    DELETE FROM logs_padrao WHERE data_hora < limite;
+
+    RETURN removidas;
+END;
+$$;
+
+-- Partições desde o log mais antigo até 3 meses à frente
+SELECT criar_particoes_logs(
+    3,
+    COALESCE((SELECT min(data_hora) FROM logs_antiga)::date, CURRENT_DATE)
+);
+
+-- IPs inválidos (fora do formato IPv4/IPv6) viram NULL em vez de abortar a migração
+INSERT INTO logs (id, tipo_log, data_hora, ip_usuario, user_agent, url, metodo, status)
+SELECT
+    id,
+    tipo_log,
+    COALESCE(data_hora, CURRENT_TIMESTAMP),
+    CASE
+        WHEN ip_usuario ~ '^[0-9]{1,3}(\.[0-9]{1,3}){3}$' OR ip_usuario ~ '^[0-9a-fA-F:.]*:[0-9a-fA-F:.]*$'
+        THEN ip_usuario::inet
+    END,
+    user_agent,
+    url,
+    metodo,
+    status
+FROM logs_antiga;
+
+SELECT setval('logs_id_seq', COALESCE((SELECT max(id) FROM logs), 0) + 1, false);
+
+DROP TABLE logs_antiga;
+
+COMMIT;
@@ -0,0 +1,15 @@
+-- 009_logs_indices_consulta.sql
+-- Índices da API de consulta de logs: keyset em (data_hora, id), filtros por IP
+-- e URL e índice parcial dos logs de erro. Criados na tabela particionada,
+-- valem para as partições existentes e para as criadas depois.
+
+BEGIN;
+
+-- Paginação por keyset (data_hora, id) e filtros da consulta de logs (GET /api/logs)
+CREATE INDEX idx_logs_data_hora_id ON logs(data_hora, id);
+CREATE INDEX idx_logs_ip_data_hora ON logs(ip_usuario, data_hora);
+CREATE INDEX idx_logs_url_data_hora ON logs(url, data_hora);
+-- Índice parcial dos logs de erro (GET /api/logs/erros-por-endpoint)
+CREATE INDEX idx_logs_erros ON logs(data_hora) WHERE tipo_log LIKE 'Erro%';
+
+COMMIT;
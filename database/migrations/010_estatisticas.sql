@@ -0,0 +1,42 @@
+-- 010_estatisticas.sql
+-- Tabelas de resumo do painel (/api/estatisticas) e marcas de atualização incremental.
+-- Também amplia logs.status, que truncava (e fazia falhar) descrições como
+-- "Usuário solicitou fotos da pasta '...'" usadas na contagem por pasta.
+-- Aumentar o limite de um VARCHAR não reescreve a tabela.
+
+BEGIN;
+
+ALTER TABLE logs ALTER COLUMN status TYPE VARCHAR(255);
+
+-- Resumos do painel (/api/estatisticas), atualizados incrementalmente a partir
+-- das tabelas de origem: cada atualização processa apenas as linhas com id acima
+-- da marca (high-water mark) guardada em estatisticas_marcas.
+CREATE TABLE estatisticas_marcas (
+    fonte VARCHAR(50) PRIMARY KEY,
+    ultimo_id BIGINT NOT NULL DEFAULT 0,
+    atualizado_em TIMESTAMP
+);
+
+INSERT INTO estatisticas_marcas (fonte) VALUES ('contatos'), ('logs');
+
+-- Contatos recebidos por semana (segunda-feira da semana)
+CREATE TABLE estatisticas_contatos_semana (
+    semana DATE PRIMARY KEY,
+    total INTEGER NOT NULL
+);
+
+-- Visualizações da galeria ("Requisição de Galeria") por pasta e dia
+CREATE TABLE estatisticas_galeria_pasta (
+    dia DATE NOT NULL,
+    pasta VARCHAR(255) NOT NULL,
+    visualizacoes INTEGER NOT NULL,
+    PRIMARY KEY (dia, pasta)
+);
+
+-- Falhas de login ("Login falhou") por dia
+CREATE TABLE estatisticas_falhas_login (
+    dia DATE PRIMARY KEY,
+    total INTEGER NOT NULL
+);
+
+COMMIT;
@@ -0,0 +1,16 @@
+-- 011_visualizacoes_fotos.sql
+-- Contadores de visualização por foto da galeria.
+
+BEGIN;
+
+-- Visualizações por foto (public_id do Cloudinary), somadas em lote pela aplicação
+CREATE TABLE visualizacoes_fotos (
+    foto_id VARCHAR(255) PRIMARY KEY,
+    visualizacoes BIGINT NOT NULL,
+    ultima_visualizacao TIMESTAMP
+);
+
+-- Índice para a listagem das fotos mais vistas
+CREATE INDEX idx_visualizacoes_fotos_total ON visualizacoes_fotos(visualizacoes DESC);
+
+COMMIT;
@@ -0,0 +1,9 @@
+-- 012_contatos_indice_lido.sql
+-- Índice para os filtros por lido em todas as pastas (lido=...&arquivado=todos),
+-- que nenhum dos índices parciais da migração 007 cobre.
+
+BEGIN;
+
+CREATE INDEX idx_contatos_lido ON contatos(lido, data_envio DESC, id DESC);
+
+COMMIT;
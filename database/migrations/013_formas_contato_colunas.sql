@@ -0,0 +1,25 @@
+-- 013_formas_contato_colunas.sql
+-- Alinha formas_contato às colunas usadas pelo controller (redesocial_nome,
+-- redesocial_perfil, email, telefone). Bancos criados por versões antigas do
+-- migration.sql tinham tipo/contato; nos demais esta migração não altera nada.
+
+BEGIN;
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM information_schema.columns
+               WHERE table_name = 'formas_contato' AND column_name = 'tipo') THEN
+        ALTER TABLE formas_contato RENAME COLUMN tipo TO redesocial_nome;
+    END IF;
+    IF EXISTS (SELECT 1 FROM information_schema.columns
+               WHERE table_name = 'formas_contato' AND column_name = 'contato') THEN
+        ALTER TABLE formas_contato RENAME COLUMN contato TO redesocial_perfil;
+    END IF;
+END $$;
+
+ALTER TABLE formas_contato ADD COLUMN IF NOT EXISTS redesocial_nome VARCHAR(255);
+ALTER TABLE formas_contato ADD COLUMN IF NOT EXISTS redesocial_perfil VARCHAR(255);
+ALTER TABLE formas_contato ADD COLUMN IF NOT EXISTS email VARCHAR(255);
+ALTER TABLE formas_contato ADD COLUMN IF NOT EXISTS telefone VARCHAR(255);
+
+COMMIT;
@@ -0,0 +1,14 @@
+-- 014_logs_remover_indice_url.sql
+-- Remove idx_logs_url_data_hora (migração 009). A coluna url tem poucos valores
+-- distintos: a listagem filtrada por URL já é atendida por idx_logs_data_hora_id
+-- (varredura na ordem da paginação, descartando as outras URLs), e só a agregação
+-- por hora de uma URL, limitada a LOGS_CONSULTA_MAX_DIAS, dependia do índice.
+-- Não compensa manter mais um índice atualizado a cada INSERT em logs.
+--
+-- Os demais índices da 009 continuam:
+--   idx_logs_data_hora_id  a chave primária é (id, data_hora) e não serve ao
+--                          ORDER BY data_hora DESC, id DESC da paginação
+--   idx_logs_ip_data_hora  filtro seletivo por IP (investigação de abuso)
+--   idx_logs_erros         parcial: só recebe as linhas de erro
+
+DROP INDEX IF EXISTS idx_logs_url_data_hora;
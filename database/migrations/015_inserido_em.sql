@@ -0,0 +1,20 @@
+-- 015_inserido_em.sql
+-- Momento real do INSERT (clock_timestamp()) em contatos e logs, usado pela
+-- margem de segurança da atualização incremental das estatísticas. data_envio
+-- (contatos do journal chegam com a data do envio original) e data_hora
+-- (CURRENT_TIMESTAMP, início da transação) podem parecer antigas logo após
+-- o INSERT, e a marca passaria por ids menores ainda não confirmados.
+--
+-- ADD COLUMN sem DEFAULT não reescreve as tabelas: as linhas existentes ficam
+-- com NULL (tratadas como antigas) e só as novas recebem o DEFAULT.
+
+BEGIN;
+
+ALTER TABLE contatos ADD COLUMN inserido_em TIMESTAMP;
+ALTER TABLE contatos ALTER COLUMN inserido_em SET DEFAULT clock_timestamp();
+
+-- Em logs, vale para as partições existentes e para as criadas depois (LIKE logs INCLUDING DEFAULTS)
+ALTER TABLE logs ADD COLUMN inserido_em TIMESTAMP;
+ALTER TABLE logs ALTER COLUMN inserido_em SET DEFAULT clock_timestamp();
+
+COMMIT;
@@ -0,0 +1,177 @@
+from flask import current_app
+from services.metricas import registro
+from collections import Counter, OrderedDict
+import hashlib
+import re
+import threading
+import time
+
+# Padrão simples para contar links em mensagens
+_padrao_link = re.compile(r"https?://|www\.", re.IGNORECASE)
+
+# Hashes de mensagens recentes: {hash: instante} em ordem de chegada
+_mensagens_recentes = OrderedDict()
+_mensagens_recentes_lock = threading.Lock()
+_max_mensagens_recentes = 5000
+
+# Contadores de rejeição por motivo
+_contadores = Counter()
+_contadores_lock = threading.Lock()
+
+
+def registrar_rejeicao(motivo):
+    """
+    Incrementa o contador de rejeições do formulário de contato para o motivo.
+
+    Args:
+        motivo (str): Motivo da rejeição (ex: 'honeypot', 'limite_taxa').
+
+    Returns:
+        None
+    """
+    with _contadores_lock:
+        _contadores[motivo] += 1
+
+
+def obter_contadores():
+    """
+    Retorna uma cópia dos contadores de rejeição do processo.
+
+    Returns:
+        dict: {motivo: quantidade}
+    """
+    with _contadores_lock:
+        return dict(_contadores)
+
+
+def gerar_hash_conteudo(mensagem, remetente=""):
+    """
+    Gera o hash do remetente com a mensagem normalizada (minúsculas e espaços colapsados).
+
+    Args:
+        mensagem (str): Texto da mensagem enviada.
+        remetente (str): Identificação do remetente (ex: e-mail e telefone normalizados).
+
+    Returns:
+        str: Digest SHA-256 em hexadecimal.
+    """
+    normalizada = " ".join(mensagem.lower().split())
+    return hashlib.sha256(f"{remetente}\x00{normalizada}".encode("utf-8")).hexdigest()
+
+
+def verificar_spam(dados):
+    """
+    Aplica filtros baratos, sem acesso ao banco, sobre um envio do formulário de contato.
+
+    Filtros, em ordem:
+        - honeypot: campo invisível (`ANTISPAM_CAMPO_HONEYPOT`) preenchido
+        - preenchimento_rapido: formulário enviado antes de `ANTISPAM_TEMPO_MINIMO_SEGUNDOS`
+          (usa o campo opcional `iniciado_em`, timestamp Unix em milissegundos)
+        - links: mais de `ANTISPAM_MAX_LINKS` links na mensagem
+
+    Cada rejeição incrementa o contador do respectivo motivo.
+
+    Args:
+        dados (dict): Corpo JSON recebido em `POST /api/contatos`.
+
+    Returns:
+        str | None: Motivo da rejeição, ou None se o envio passou pelos filtros.
+    """
+    config = current_app.config
+    motivo = None
+
+    if dados.get(config["ANTISPAM_CAMPO_HONEYPOT"]):
+        motivo = "honeypot"
+
+    elif _preenchido_rapido_demais(
+        dados.get("iniciado_em"), config["ANTISPAM_TEMPO_MINIMO_SEGUNDOS"]
+    ):
+        motivo = "preenchimento_rapido"
+
+    elif (
+        len(_padrao_link.findall(str(dados.get("mensagem") or "")))
+        > config["ANTISPAM_MAX_LINKS"]
+    ):
+        motivo = "links"
+
+    if motivo is not None:
+        registrar_rejeicao(motivo)
+
+    return motivo
+
+
+def mensagem_duplicada(mensagem, remetente):
+    """
+    Verifica se o mesmo remetente já enviou a mesma mensagem dentro da janela
+    de duplicados. Visitantes diferentes podem enviar o mesmo texto (ex:
+    "Gostaria de um orçamento") sem que o segundo envio seja descartado.
+
+    Deve ser chamada depois da validação dos campos, imediatamente antes da
+    gravação, para que envios inválidos não bloqueiem uma nova tentativa.
+    Uma duplicata incrementa o contador 'duplicado'.
+
+    Args:
+        mensagem (str): Texto da mensagem enviada.
+        remetente (str): Identificação do remetente (ex: e-mail e telefone normalizados).
+
+    Returns:
+        bool: True se a mensagem é uma duplicata recente, False caso contrário.
+    """
+    hash_conteudo = gerar_hash_conteudo(mensagem, remetente)
+    janela = current_app.config["ANTISPAM_JANELA_DUPLICADOS_SEGUNDOS"]
+    agora = time.monotonic()
+
+    with _mensagens_recentes_lock:
+        # Remove as entradas mais antigas que a janela (ou além do limite de memória)
+        while _mensagens_recentes:
+            mais_antigo, instante = next(iter(_mensagens_recentes.items()))
+            if (
+                agora - instante < janela
+                and len(_mensagens_recentes) < _max_mensagens_recentes
+            ):
+                break
+            del _mensagens_recentes[mais_antigo]
+
+        duplicada = hash_conteudo in _mensagens_recentes
+        if not duplicada:
+            _mensagens_recentes[hash_conteudo] = agora
+
+    if duplicada:
+        registrar_rejeicao("duplicado")
+
+    return duplicada
+
+
+def liberar_mensagem(mensagem, remetente):
+    """
+    Remove a mensagem da janela de duplicados (ex: quando a gravação falhou),
+    permitindo que o visitante tente enviá-la novamente.
+
+    Args:
+        mensagem (str): Texto da mensagem enviada.
+        remetente (str): O mesmo valor passado a `mensagem_duplicada`.
+
+    Returns:
+        None
+    """
+    with _mensagens_recentes_lock:
+        _mensagens_recentes.pop(gerar_hash_conteudo(mensagem, remetente), None)
+
+
+def _preenchido_rapido_demais(iniciado_em, tempo_minimo):
+    # Clientes que não enviam o campo não são filtrados
+    if not isinstance(iniciado_em, (int, float)):
+        return False
+
+    return time.time() - iniciado_em / 1000 < tempo_minimo
+
+
+@registro.registrar_coletor
+def _coletar_rejeicoes():
+    # Exporta os contadores de rejeição em /metrics
+    return (
+        "contatos_rejeitados_total",
+        "counter",
+        "Envios do formulário de contato rejeitados, por motivo.",
+        [({"motivo": motivo}, total) for motivo, total in obter_contadores().items()],
+    )
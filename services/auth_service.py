@@ -1,5 +1,6 @@
 from database.database import get_cursor
-from utils.token import gerar_token_jwt
+from utils.token import gerar_hash_token
+from services.token_service import emitir_sessao
 from services.logs import registrar_log
 from itsdangerous import URLSafeTimedSerializer as Serializer
 from flask import current_app
@@ -12,16 +13,16 @@ def login_usuario(email, senha):
     Autentica um fotógrafo com base no e-mail e senha fornecidos.
 
     Realiza uma busca no banco de dados pelo e-mail, verifica se a senha está correta,
-    e gera um token JWT caso a autenticação seja bem-sucedida.
+    e gera um token JWT de acesso e um refresh token caso a autenticação seja bem-sucedida.
 
     Args:
         email (str): E-mail do usuário.
         senha (str): Senha fornecida pelo usuário.
 
     Returns:
-        dict: Com 'token' em caso de sucesso ou mensagem de erro em caso de falha.
+        dict: Com 'token' e 'refresh_token' em caso de sucesso ou mensagem de erro em caso de falha.
             Exemplos:
-                {'token': '...'}  # Login bem-sucedido
+                {'token': '...', 'refresh_token': '...'}  # Login bem-sucedido
                 {'erro': 'Dados incorretos', 'codigo': 401}  # Credenciais inválidas
                 {'erro': 'Erro interno no servidor', 'codigo': 500}  # Erro inesperado
 
@@ -31,7 +32,7 @@ def login_usuario(email, senha):
     try:
         with get_cursor() as cur:
             cur.execute(
-                "SELECT id, email, senha_hash FROM fotografo WHERE email = %s",
+                "SELECT id, email, senha_hash, token_epoch FROM fotografo WHERE email = %s",
                 (email,),
             )
             usuario = cur.fetchone()
@@ -40,18 +41,19 @@ def login_usuario(email, senha):
             registrar_log("Login falhou", "Usuário não encontrado")
             return {"erro": "Dados incorretos", "codigo": 404}
 
-        fotografo_id, email_db, senha_hash = usuario.values()
+        fotografo_id, email_db, senha_hash, token_epoch = usuario.values()
 
         # Verifica a senha com hash
         if not verificar_senha(senha, senha_hash):
             registrar_log("Login falhou", f"Senha inválida para {email_db}")
             return {"erro": "Dados incorretos", "codigo": 401}
 
-        # Geração de token JWT contendo o ID do fotógrafo — usado para autenticação nas rotas protegidas
-        token = gerar_token_jwt(fotografo_id)
+        # Geração dos tokens contendo o ID do fotógrafo — o de acesso autentica as rotas
+        # protegidas e o refresh token renova a sessão sem passar pelo bcrypt novamente
+        sessao = emitir_sessao(fotografo_id, token_epoch)
 
         registrar_log("Login bem-sucedido", f"Usuário {email_db} logado")
-        return {"token": token}
+        return sessao
 
     except Exception as e:
         print(str(e))
@@ -107,6 +109,9 @@ def gerar_token_recuperacao(email):
     O token tem validade de 1 hora e só pode ser usado uma vez.
     Usado para criar links seguros de redefinição de senha via e-mail.
 
+    Apenas o hash SHA-256 do token é gravado no banco. A cada nova solicitação,
+    tokens já usados ou expirados são removidos, mantendo a tabela pequena.
+
     Args:
         email (str): E-mail do usuário que solicitou recuperação de senha.
 
@@ -129,11 +134,18 @@ def gerar_token_recuperacao(email):
         token = s.dumps({"fid": fotografo_id, "timestamp": datetime.now().timestamp()})
 
         with get_cursor() as cur:
+            # Remove tokens usados ou expirados antes de inserir o novo
+            cur.execute(
+                """
+                DELETE FROM tokens_recuperacao
+                WHERE usado = TRUE OR expira_em < CURRENT_TIMESTAMP
+                """
+            )
             cur.execute(
                 """
-                INSERT INTO tokens_recuperacao (token, fotografo_id) VALUES (%s, %s)
+                INSERT INTO tokens_recuperacao (token_hash, fotografo_id) VALUES (%s, %s)
                 """,
-                (token, fotografo_id),
+                (gerar_hash_token(token), fotografo_id),
             )
             cur.connection.commit()
         return {"token": token}
@@ -152,6 +164,7 @@ def verificar_token_recuperacao(token):
     Valida um token de recuperação de senha.
 
     Verifica se o token existe, ainda é válido e não foi usado anteriormente.
+    A busca é feita pelo hash SHA-256 do token, nunca pelo texto puro.
 
     Args:
         token (str): Token recebido via e-mail.
@@ -172,11 +185,11 @@ def verificar_token_recuperacao(token):
         with get_cursor() as cur:
             cur.execute(
                 """
-                SELECT fotografo_id, usado, expira_em FROM tokens_recuperacao 
-                WHERE token = %s 
+                SELECT fotografo_id, usado, expira_em FROM tokens_recuperacao
+                WHERE token_hash = %s
                 FOR UPDATE  -- Bloqueia o registro para evitar race condition
             """,
-                (token,),
+                (gerar_hash_token(token),),
             )
 
             resultado = cur.fetchone()
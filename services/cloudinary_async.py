@@ -0,0 +1,91 @@
+from services.metricas import medir_upstream
+
+try:
+    import httpx
+except ImportError:  # httpx só é necessário no modo ASGI (asgi.py)
+    httpx = None
+
+URL_API_CLOUDINARY = "https://api.cloudinary.com/v1_1"
+
+# Cliente HTTP compartilhado (mantém as conexões com a API do Cloudinary abertas)
+_cliente = None
+
+
+def abrir_cliente_http(config):
+    """
+    Cria o cliente HTTP assíncrono usado nas chamadas ao Cloudinary no modo ASGI.
+
+    Args:
+        config (dict): Configuração da aplicação (`ASGI_HTTP_MAX_CONEXOES`).
+
+    Returns:
+        httpx.AsyncClient: Cliente compartilhado.
+
+    Raises:
+        RuntimeError: Se o pacote httpx não estiver instalado.
+    """
+    global _cliente
+
+    if _cliente is not None:
+        return _cliente
+
+    if httpx is None:
+        raise RuntimeError("O modo ASGI requer o pacote httpx.")
+
+    maximo = config["ASGI_HTTP_MAX_CONEXOES"]
+    _cliente = httpx.AsyncClient(
+        base_url=URL_API_CLOUDINARY,
+        timeout=httpx.Timeout(10.0, connect=5.0),
+        limits=httpx.Limits(max_connections=maximo, max_keepalive_connections=maximo),
+    )
+    return _cliente
+
+
+async def fechar_cliente_http():
+    """
+    Fecha o cliente HTTP compartilhado (shutdown do servidor ASGI).
+
+    Returns:
+        None
+    """
+    global _cliente
+
+    if _cliente is not None:
+        cliente, _cliente = _cliente, None
+        await cliente.aclose()
+
+
+async def buscar_fotos_pasta(config, pasta, next_cursor=None, max_results=18):
+    """
+    Lista as fotos de uma pasta do Cloudinary sem bloquear o event loop.
+
+    Faz a mesma chamada de `cloudinary.api.resources_by_asset_folder` (Admin API,
+    autenticação básica com API_KEY/API_SECRET).
+
+    Args:
+        config (dict): Configuração da aplicação (CLOUD_NAME, API_KEY, API_SECRET).
+        pasta (str): Nome da pasta no Cloudinary.
+        next_cursor (str, opcional): Cursor da próxima página.
+        max_results (int): Quantidade máxima de fotos retornadas.
+
+    Returns:
+        dict: Resposta da API (`resources` e, se houver, `next_cursor`).
+
+    Raises:
+        httpx.HTTPError: Se a chamada falhar ou a API responder com erro.
+    """
+    parametros = {"asset_folder": pasta, "max_results": max_results}
+    if next_cursor:
+        parametros["next_cursor"] = next_cursor
+
+    cliente = abrir_cliente_http(config)
+
+    with medir_upstream("cloudinary", "resources_by_asset_folder"):
+        resposta = await cliente.get(
+            f"/{config['CLOUD_NAME']}/resources/by_asset_folder",
+            params=parametros,
+            auth=(config["API_KEY"], config["API_SECRET"]),
+        )
+        resposta.raise_for_status()
+
+    return resposta.json()
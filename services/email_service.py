@@ -1,5 +1,6 @@
 from flask_mail import Message, Mail
 from flask import current_app
+from services.metricas import medir_upstream
 
 mail = Mail()
 
@@ -70,4 +71,5 @@ def enviar_email_recuperacao(email, token):
     </html>
     """
 
-    mail.send(msg)
+    with medir_upstream("smtp", "enviar_email_recuperacao"):
+        mail.send(msg)
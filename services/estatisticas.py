@@ -0,0 +1,220 @@
+from database.database import criar_conexao
+import threading
+import time
+
+# Descrição gravada pelo get_fotos: "Usuário solicitou fotos da pasta '<pasta>'"
+_padrao_pasta = r"pasta '(.*)'$"
+
+# Resumos alimentados por cada tabela de origem, a partir das linhas com
+# id em (%(marca)s, %(limite)s]
+_RESUMOS = {
+    "contatos": (
+        """
+        INSERT INTO estatisticas_contatos_semana (semana, total)
+        SELECT date_trunc('week', data_envio)::date, COUNT(*)
+        FROM contatos
+        WHERE id > %(marca)s AND id <= %(limite)s
+        GROUP BY 1
+        ON CONFLICT (semana)
+        DO UPDATE SET total = estatisticas_contatos_semana.total + EXCLUDED.total
+        """,
+    ),
+    "logs": (
+        """
+        INSERT INTO estatisticas_galeria_pasta (dia, pasta, visualizacoes)
+        SELECT data_hora::date, substring(status FROM %(padrao_pasta)s), COUNT(*)
+        FROM logs
+        WHERE id > %(marca)s AND id <= %(limite)s
+          AND data_hora >= %(desde)s
+          AND tipo_log = 'Requisição de Galeria'
+          AND substring(status FROM %(padrao_pasta)s) IS NOT NULL
+        GROUP BY 1, 2
+        ON CONFLICT (dia, pasta)
+        DO UPDATE SET visualizacoes = estatisticas_galeria_pasta.visualizacoes + EXCLUDED.visualizacoes
+        """,
+        """
+        INSERT INTO estatisticas_falhas_login (dia, total)
+        SELECT data_hora::date, COUNT(*)
+        FROM logs
+        WHERE id > %(marca)s AND id <= %(limite)s
+          AND data_hora >= %(desde)s
+          AND tipo_log = 'Login falhou'
+        GROUP BY 1
+        ON CONFLICT (dia)
+        DO UPDATE SET total = estatisticas_falhas_login.total + EXCLUDED.total
+        """,
+    ),
+}
+
+# Coluna de data de cada origem, usada para limitar as partições lidas em `logs`
+_COLUNA_DATA = {"contatos": "data_envio", "logs": "data_hora"}
+
+
+def _atualizar_fonte(conexao, fonte, atraso_segundos, tamanho_lote):
+    """
+    Processa um lote de linhas novas de `fonte` e avança a marca.
+
+    Só entram linhas inseridas (`inserido_em`, gravado com clock_timestamp()
+    no INSERT) há mais de `atraso_segundos`, e o lote para na primeira linha
+    mais nova que isso: uma transação ainda aberta com id menor não é pulada
+    quando a marca avançar. `data_envio`/`data_hora` não servem para isso,
+    pois podem ser bem anteriores ao INSERT (contatos do journal, início da
+    transação). Linhas anteriores à migração 015 (`inserido_em` nulo) contam
+    como antigas.
+
+    Returns:
+        int: Quantidade de linhas processadas no lote (0 quando está em dia).
+    """
+    coluna_data = _COLUNA_DATA[fonte]
+
+    with conexao.cursor() as cur:
+        # FOR UPDATE: serializa com outra atualização que tenha escapado do advisory lock
+        cur.execute(
+            "SELECT ultimo_id FROM estatisticas_marcas WHERE fonte = %s FOR UPDATE",
+            (fonte,),
+        )
+        marca = cur.fetchone()["ultimo_id"]
+
+        cur.execute(
+            f"""
+            WITH proximas AS (
+                SELECT id, {coluna_data} AS data, inserido_em FROM {fonte}
+                WHERE id > %(marca)s
+                ORDER BY id
+                LIMIT %(lote)s
+            ), recente AS (
+                SELECT MIN(id) AS id
+                FROM proximas
+                WHERE inserido_em >= LOCALTIMESTAMP - make_interval(secs => %(atraso)s)
+            ), faixa AS (
+                SELECT MAX(proximas.id) AS limite, MIN(proximas.data) AS desde
+                FROM proximas, recente
+                WHERE recente.id IS NULL OR proximas.id < recente.id
+            )
+            SELECT faixa.limite, faixa.desde,
+                (SELECT COUNT(*) FROM proximas WHERE id <= faixa.limite) AS linhas
+            FROM faixa
+            """,
+            {"marca": marca, "lote": tamanho_lote, "atraso": atraso_segundos},
+        )
+        faixa = cur.fetchone()
+
+        if faixa["limite"] is None:
+            return 0
+
+        parametros = {
+            "marca": marca,
+            "limite": faixa["limite"],
+            "desde": faixa["desde"],
+            "padrao_pasta": _padrao_pasta,
+        }
+        for instrucao in _RESUMOS[fonte]:
+            cur.execute(instrucao, parametros)
+
+        cur.execute(
+            """
+            UPDATE estatisticas_marcas
+            SET ultimo_id = %s, atualizado_em = CURRENT_TIMESTAMP
+            WHERE fonte = %s
+            """,
+            (faixa["limite"], fonte),
+        )
+
+    return faixa["linhas"]
+
+
+def atualizar_estatisticas(conexao, atraso_segundos=30, tamanho_lote=100_000):
+    """
+    Atualiza os resumos do painel com as linhas novas de `contatos` e `logs`.
+
+    Cada lote (até `tamanho_lote` linhas por tabela) é somado aos resumos na mesma
+    transação que avança a marca, então um lote nunca é contado duas vezes.
+    Um advisory lock garante que apenas um processo atualize por vez; os demais
+    retornam sem fazer nada.
+
+    Args:
+        conexao (psycopg.Connection): Conexão dedicada (as transações são confirmadas aqui).
+        atraso_segundos (int): Tempo mínimo desde o INSERT das linhas processadas.
+        tamanho_lote (int): Máximo de linhas de cada tabela por transação.
+
+    Returns:
+        dict | None: {fonte: linhas processadas}, ou None se outro processo está atualizando.
+    """
+    processados = {fonte: 0 for fonte in _RESUMOS}
+
+    for fonte in _RESUMOS:
+        while True:
+            with conexao.cursor() as cur:
+                cur.execute(
+                    "SELECT pg_try_advisory_xact_lock(hashtext('estatisticas')) AS obtido"
+                )
+                if not cur.fetchone()["obtido"]:
+                    conexao.rollback()
+                    return None
+
+            quantidade = _atualizar_fonte(conexao, fonte, atraso_segundos, tamanho_lote)
+            conexao.commit()
+
+            processados[fonte] += quantidade
+            if quantidade < tamanho_lote:
+                break
+
+    return processados
+
+
+def recalcular_estatisticas(conexao):
+    """
+    Zera os resumos e as marcas, para que a próxima atualização os reconstrua
+    a partir de todo o conteúdo atual de `contatos` e `logs`.
+
+    Args:
+        conexao (psycopg.Connection): Conexão usada (a transação é confirmada ao final).
+
+    Returns:
+        None
+    """
+    with conexao.cursor() as cur:
+        cur.execute("SELECT pg_advisory_xact_lock(hashtext('estatisticas'))")
+        cur.execute(
+            """
+            TRUNCATE estatisticas_contatos_semana, estatisticas_galeria_pasta,
+                     estatisticas_falhas_login
+            """
+        )
+        cur.execute(
+            "UPDATE estatisticas_marcas SET ultimo_id = 0, atualizado_em = NULL"
+        )
+    conexao.commit()
+
+
+def iniciar_atualizacao_estatisticas(app):
+    """
+    Inicia a thread que atualiza os resumos do painel a cada
+    `ESTATISTICAS_INTERVALO_SEGUNDOS`, com uma conexão própria.
+
+    Args:
+        app (Flask): Aplicação Flask (lida apenas a configuração).
+
+    Returns:
+        None
+    """
+    intervalo = app.config["ESTATISTICAS_INTERVALO_SEGUNDOS"]
+    atraso = app.config["ESTATISTICAS_ATRASO_SEGUNDOS"]
+
+    def atualizar():
+        conexao = None
+        while True:
+            try:
+                if conexao is None or conexao.closed:
+                    conexao = criar_conexao()
+                atualizar_estatisticas(conexao, atraso)
+            except Exception as e:
+                print(f"Erro ao atualizar estatísticas: {e}")
+                if conexao is not None:
+                    conexao.close()
+
+            time.sleep(intervalo)
+
+    threading.Thread(
+        target=atualizar, name="atualizacao-estatisticas", daemon=True
+    ).start()
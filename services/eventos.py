@@ -0,0 +1,172 @@
+from database.database import criar_conexao
+from flask import current_app
+from collections import deque
+import json
+import threading
+import time
+
+# Canal do PostgreSQL usado no modo EVENTOS_BACKEND = "postgres"
+CANAL_CONTATOS = "contatos_novos"
+
+
+class Barramento:
+    """
+    Pub/sub em memória para eventos de novos contatos.
+
+    Guarda os últimos eventos em um buffer circular, numerados por uma sequência
+    local do processo. Cada assinante acompanha a última sequência que recebeu
+    e espera por novas publicações em uma `threading.Condition`.
+    """
+
+    def __init__(self, tamanho_buffer=100):
+        self._eventos = deque(maxlen=tamanho_buffer)
+        self._sequencia = 0
+        self._condicao = threading.Condition()
+
+    def sequencia_atual(self):
+        """Retorna a sequência do último evento publicado no processo."""
+        with self._condicao:
+            return self._sequencia
+
+    def publicar(self, evento):
+        """
+        Publica um evento e acorda todos os assinantes.
+
+        Args:
+            evento (dict): Resumo do contato (precisa conter 'id').
+
+        Returns:
+            None
+        """
+        with self._condicao:
+            self._sequencia += 1
+            self._eventos.append((self._sequencia, evento))
+            self._condicao.notify_all()
+
+    def aguardar(self, ultima_sequencia, timeout):
+        """
+        Espera por eventos publicados depois de `ultima_sequencia`.
+
+        Args:
+            ultima_sequencia (int): Última sequência já entregue ao assinante.
+            timeout (float): Tempo máximo de espera em segundos.
+
+        Returns:
+            tuple: (eventos, sequencia) — eventos novos (possivelmente vazio) e
+                   a sequência a usar na próxima chamada.
+        """
+        with self._condicao:
+            self._condicao.wait_for(
+                lambda: self._sequencia > ultima_sequencia, timeout=timeout
+            )
+            eventos = [e for seq, e in self._eventos if seq > ultima_sequencia]
+            return eventos, self._sequencia
+
+
+barramento_contatos = Barramento()
+
+
+def resumir_contato(contato_id, nome, mensagem, data_envio):
+    """
+    Monta o resumo de um contato enviado no feed de eventos.
+
+    Args:
+        contato_id (int): ID do contato.
+        nome (str): Nome do remetente.
+        mensagem (str): Mensagem completa (apenas o início é enviado).
+        data_envio (datetime): Data de envio gravada no banco.
+
+    Returns:
+        dict: {'id', 'nome', 'previa', 'data_envio'}
+    """
+    return {
+        "id": contato_id,
+        "nome": nome,
+        "previa": mensagem[:120],
+        "data_envio": data_envio.isoformat(),
+    }
+
+
+def publicar_contatos(resumos, cur):
+    """
+    Publica os resumos de contatos recém-gravados para os assinantes do feed.
+
+    Deve ser chamada depois do commit que gravou os contatos. No modo "memoria"
+    publica direto no barramento do processo; no modo "postgres" envia um
+    `pg_notify` por contato (e faz commit), entregue a todos os workers.
+
+    Args:
+        resumos (list): Resumos gerados por `resumir_contato`.
+        cur (psycopg.Cursor): Cursor da conexão que gravou os contatos.
+
+    Returns:
+        None
+    """
+    if not resumos:
+        return
+
+    if current_app.config["EVENTOS_BACKEND"] == "postgres":
+        for resumo in resumos:
+            cur.execute(
+                "SELECT pg_notify(%s, %s)", (CANAL_CONTATOS, json.dumps(resumo))
+            )
+        cur.connection.commit()
+    else:
+        for resumo in resumos:
+            barramento_contatos.publicar(resumo)
+
+
+async def publicar_contatos_async(resumos, conexao):
+    """
+    Versão assíncrona de `publicar_contatos`, usada pelas rotas do modo ASGI.
+
+    Args:
+        resumos (list): Resumos gerados por `resumir_contato`.
+        conexao (psycopg.AsyncConnection): Conexão do pool assíncrono; no modo
+            "postgres" os `pg_notify` são confirmados ao devolvê-la ao pool.
+
+    Returns:
+        None
+    """
+    if not resumos:
+        return
+
+    if current_app.config["EVENTOS_BACKEND"] == "postgres":
+        for resumo in resumos:
+            await conexao.execute(
+                "SELECT pg_notify(%s, %s)", (CANAL_CONTATOS, json.dumps(resumo))
+            )
+    else:
+        for resumo in resumos:
+            barramento_contatos.publicar(resumo)
+
+
+def iniciar_ouvinte_postgres():
+    """
+    Inicia a thread que escuta o canal `contatos_novos` e repassa as notificações
+    ao barramento do processo. Reconecta automaticamente em caso de erro.
+
+    Returns:
+        None
+    """
+
+    def ouvir():
+        while True:
+            conexao = None
+            try:
+                conexao = criar_conexao()
+                conexao.autocommit = True
+                conexao.execute(f"LISTEN {CANAL_CONTATOS}")
+
+                for notificacao in conexao.notifies():
+                    barramento_contatos.publicar(json.loads(notificacao.payload))
+
+            except Exception as e:
+                print(f"Erro no ouvinte de eventos de contatos: {e}")
+                time.sleep(5)
+
+            finally:
+                if conexao is not None:
+                    conexao.close()
+
+    threading.Thread(target=ouvir, name="ouvinte-contatos", daemon=True).start()
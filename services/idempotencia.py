@@ -0,0 +1,138 @@
+from flask import current_app
+from collections import OrderedDict
+import hashlib
+import threading
+import time
+
+# Estados de uma chave de idempotência
+NOVA = "nova"
+EM_ANDAMENTO = "em_andamento"
+CONCLUIDA = "concluida"
+
+
+class ArmazemIdempotencia:
+    """
+    Guarda em memória as respostas de requisições já processadas, por chave.
+
+    Cada entrada vale por `ttl` segundos e o armazém guarda no máximo
+    `max_chaves` entradas (as mais antigas são descartadas primeiro).
+    Uma chave reservada e ainda sem resposta fica "em andamento" por até
+    `ttl_reserva` segundos, o que impede que duas tentativas simultâneas
+    gravem o mesmo conteúdo sem travar a chave caso o processamento falhe.
+    """
+
+    def __init__(self, ttl, max_chaves, ttl_reserva=30):
+        self.ttl = ttl
+        self.max_chaves = max_chaves
+        self.ttl_reserva = ttl_reserva
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obter(self, chave):
+        """
+        Retorna a resposta armazenada para a chave, se houver.
+
+        Args:
+            chave (str): Chave de idempotência.
+
+        Returns:
+            tuple | None: (corpo, status) da resposta original, ou None.
+        """
+        with self._lock:
+            self._descartar_expiradas()
+            entrada = self._entradas.get(chave)
+
+        if entrada is None:
+            return None
+        return entrada[1]
+
+    def reservar(self, chave):
+        """
+        Reserva a chave para processamento, se ela ainda não foi usada.
+
+        Args:
+            chave (str): Chave de idempotência.
+
+        Returns:
+            tuple: (estado, resposta) — estado é NOVA (reserva feita),
+                   EM_ANDAMENTO ou CONCLUIDA (com a resposta original).
+        """
+        with self._lock:
+            self._descartar_expiradas()
+            entrada = self._entradas.get(chave)
+
+            if entrada is not None:
+                instante, resposta = entrada
+                if resposta is not None:
+                    return CONCLUIDA, resposta
+                if time.monotonic() - instante < self.ttl_reserva:
+                    return EM_ANDAMENTO, None
+                # Reserva abandonada: a chave volta a ficar disponível
+                del self._entradas[chave]
+
+            if len(self._entradas) >= self.max_chaves:
+                self._entradas.popitem(last=False)
+
+            self._entradas[chave] = (time.monotonic(), None)
+            return NOVA, None
+
+    def concluir(self, chave, corpo, status):
+        """Armazena a resposta da chave reservada."""
+        with self._lock:
+            self._entradas[chave] = (time.monotonic(), (corpo, status))
+            self._entradas.move_to_end(chave)
+
+    def cancelar(self, chave):
+        """Libera a chave reservada (ex: quando a gravação falhou)."""
+        with self._lock:
+            self._entradas.pop(chave, None)
+
+    def _descartar_expiradas(self):
+        limite = time.monotonic() - self.ttl
+        while self._entradas:
+            instante, _ = next(iter(self._entradas.values()))
+            if instante > limite:
+                break
+            self._entradas.popitem(last=False)
+
+
+def gerar_chave_conteudo(*campos):
+    """
+    Gera uma chave de idempotência a partir dos campos já normalizados.
+
+    Usada quando o cliente não envia o cabeçalho `Idempotency-Key`.
+
+    Args:
+        *campos (str | None): Campos normalizados do envio (nome, telefone, ...).
+
+    Returns:
+        str: Chave no formato 'conteudo:<sha256>'.
+    """
+    conteudo = "\x1f".join(campo or "" for campo in campos)
+    return "conteudo:" + hashlib.sha256(conteudo.encode("utf-8")).hexdigest()
+
+
+_armazem_contatos = None
+_armazem_contatos_lock = threading.Lock()
+
+
+def obter_armazem_contatos():
+    """
+    Retorna o armazém de idempotência do formulário de contato.
+
+    Configurado por `IDEMPOTENCIA_TTL_SEGUNDOS` e `IDEMPOTENCIA_MAX_CHAVES`.
+
+    Returns:
+        ArmazemIdempotencia: Instância compartilhada pelo processo.
+    """
+    global _armazem_contatos
+
+    if _armazem_contatos is None:
+        with _armazem_contatos_lock:
+            if _armazem_contatos is None:
+                _armazem_contatos = ArmazemIdempotencia(
+                    current_app.config["IDEMPOTENCIA_TTL_SEGUNDOS"],
+                    current_app.config["IDEMPOTENCIA_MAX_CHAVES"],
+                )
+
+    return _armazem_contatos
@@ -0,0 +1,578 @@
+from database.database import criar_conexao
+from services.eventos import resumir_contato, publicar_contatos
+import atexit
+import fcntl
+import json
+import mmap
+import os
+import psycopg
+import struct
+import threading
+import time
+import uuid
+import zlib
+
+# Cabeçalho de cada registro: tamanho do conteúdo e CRC32 (little-endian)
+_CABECALHO = struct.Struct("<II")
+
+# Erros que se repetiriam a cada nova tentativa com o mesmo registro
+_ERROS_PERMANENTES = (psycopg.DataError, psycopg.IntegrityError)
+
+# Intervalo (s) entre as verificações de diretórios de workers que não existem mais
+_INTERVALO_ORFAOS = 60
+
+
+class Journal:
+    """
+    Journal append-only e durável para contatos recebidos, em segmentos mapeados em memória.
+
+    Cada segmento é um arquivo de tamanho fixo (pré-alocado com zeros) mapeado com
+    `mmap`. Um registro é gravado como [tamanho][crc32][json]: primeiro o conteúdo,
+    depois o cabeçalho, seguido de `msync` — um registro só passa a existir quando o
+    cabeçalho completo está no disco, e o CRC descarta gravações interrompidas.
+
+    O progresso da drenagem fica no arquivo `checkpoint` (segmento e posição); os
+    segmentos já drenados são apagados. Cada processo usa um diretório exclusivo
+    (travado com `flock`), então vários workers podem conviver no mesmo `diretorio`.
+
+    Registros que o banco recusa de forma permanente são movidos para
+    `quarentena.jsonl`, no mesmo diretório, para não travar os seguintes.
+    """
+
+    def __init__(self, diretorio, tamanho_segmento=4 * 1024 * 1024, trava=None):
+        """
+        Args:
+            diretorio (str): Diretório base; o processo usa o primeiro subdiretório livre.
+            tamanho_segmento (int): Tamanho de cada segmento, em bytes.
+            trava (file, opcional): Trava já obtida de `diretorio`, que passa a ser
+                usado diretamente (ver `adotar`).
+        """
+        self.tamanho_segmento = tamanho_segmento
+        self._lock = threading.Lock()
+        if trava is None:
+            self.diretorio, self._trava = self._travar_diretorio(diretorio)
+        else:
+            self.diretorio, self._trava = diretorio, trava
+        self._segmento, self._mmap, self._posicao = self._abrir_ultimo_segmento()
+        self.posicao_confirmada = self._ler_checkpoint()
+
+    @classmethod
+    def adotar(cls, diretorio, tamanho_segmento=4 * 1024 * 1024):
+        """
+        Abre o diretório de outro worker, se nenhum processo o estiver usando.
+
+        Usado para drenar o que ficou pendente em diretórios de workers que não
+        voltaram após um reinício (ex: com menos workers).
+
+        Args:
+            diretorio (str): Subdiretório do worker (ex: 'journal/3').
+            tamanho_segmento (int): Tamanho de cada segmento, em bytes.
+
+        Returns:
+            Journal | None: Journal do diretório, ou None se ele está em uso.
+        """
+        trava = open(os.path.join(diretorio, "lock"), "w")
+        try:
+            fcntl.flock(trava, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            trava.close()
+            return None
+        return cls(diretorio, tamanho_segmento, trava=trava)
+
+    def fechar(self):
+        """Libera o mapeamento e a trava do diretório."""
+        with self._lock:
+            self._mmap.close()
+            self._trava.close()
+
+    def anexar(self, registro):
+        """
+        Grava um registro no journal e só retorna após ele estar no disco.
+
+        Args:
+            registro (dict): Dados serializáveis em JSON.
+
+        Returns:
+            None
+
+        Raises:
+            OSError: Se não for possível gravar no disco.
+        """
+        conteudo = json.dumps(registro, ensure_ascii=False).encode("utf-8")
+        necessario = _CABECALHO.size + len(conteudo)
+
+        with self._lock:
+            if self._posicao + necessario > len(self._mmap):
+                self._rotacionar(necessario)
+
+            inicio = self._posicao
+            self._mmap[inicio + _CABECALHO.size : inicio + necessario] = conteudo
+            self._mmap[inicio : inicio + _CABECALHO.size] = _CABECALHO.pack(
+                len(conteudo), zlib.crc32(conteudo)
+            )
+
+            # msync apenas das páginas alteradas (o offset precisa ser alinhado)
+            alinhado = inicio - inicio % mmap.ALLOCATIONGRANULARITY
+            self._mmap.flush(alinhado, inicio + necessario - alinhado)
+            self._posicao += necessario
+
+    def ler_pendentes(self, max_registros):
+        """
+        Lê os registros ainda não confirmados, a partir do checkpoint.
+
+        Args:
+            max_registros (int): Quantidade máxima de registros retornados.
+
+        Returns:
+            tuple: (registros, posicao) — lista de dicts e a posição
+                   (segmento, offset) a confirmar depois de gravá-los.
+        """
+        segmento, offset = self._ler_checkpoint()
+        registros = []
+
+        with self._lock:
+            segmento_atual = self._segmento
+            if (segmento, offset) == (segmento_atual, self._posicao):
+                # Nada foi anexado desde o último checkpoint
+                return registros, (segmento, offset)
+
+        while len(registros) < max_registros:
+            caminho = self._caminho_segmento(segmento)
+            if not os.path.exists(caminho):
+                break
+
+            with open(caminho, "rb") as arquivo:
+                dados = arquivo.read()
+
+            while len(registros) < max_registros:
+                registro, proximo = _ler_registro(dados, offset)
+                if registro is None:
+                    break
+                registros.append(registro)
+                offset = proximo
+
+            if len(registros) >= max_registros or segmento >= segmento_atual:
+                break
+
+            # Segmento anterior lido até o fim: segue para o próximo
+            segmento, offset = segmento + 1, 0
+
+        return registros, (segmento, offset)
+
+    def confirmar(self, posicao):
+        """
+        Registra que tudo até `posicao` já foi gravado no banco.
+
+        Grava o checkpoint de forma atômica e apaga os segmentos anteriores.
+
+        Args:
+            posicao (tuple): (segmento, offset) retornado por `ler_pendentes`.
+
+        Returns:
+            None
+        """
+        segmento, offset = posicao
+        temporario = os.path.join(self.diretorio, "checkpoint.tmp")
+
+        with open(temporario, "w") as arquivo:
+            arquivo.write(f"{segmento} {offset}")
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.replace(temporario, os.path.join(self.diretorio, "checkpoint"))
+        self._fsync_diretorio()
+
+        for nome in os.listdir(self.diretorio):
+            if nome.endswith(".seg") and int(nome[:-4]) < segmento:
+                os.remove(os.path.join(self.diretorio, nome))
+
+        self.posicao_confirmada = posicao
+
+    def quarentenar(self, registro, erro):
+        """
+        Move um registro recusado pelo banco para `quarentena.jsonl` (uma linha
+        JSON por registro, com o erro), gravado no disco antes do retorno.
+
+        Args:
+            registro (dict): Registro lido do journal.
+            erro (str): Mensagem do erro do banco.
+
+        Returns:
+            None
+        """
+        linha = json.dumps(
+            {"registro": registro, "erro": erro, "em": time.time()},
+            ensure_ascii=False,
+        )
+        with open(os.path.join(self.diretorio, "quarentena.jsonl"), "a") as arquivo:
+            arquivo.write(linha + "\n")
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+
+    def _rotacionar(self, necessario):
+        # Abre um novo segmento; registros maiores que o padrão ganham um segmento próprio
+        self._mmap.close()
+        self._segmento += 1
+        self._mmap = self._mapear_segmento(
+            self._segmento, max(self.tamanho_segmento, necessario)
+        )
+        self._posicao = 0
+
+    def _abrir_ultimo_segmento(self):
+        segmentos = sorted(
+            int(nome[:-4])
+            for nome in os.listdir(self.diretorio)
+            if nome.endswith(".seg")
+        )
+        segmento = segmentos[-1] if segmentos else self._ler_checkpoint()[0]
+        mapa = self._mapear_segmento(segmento, self.tamanho_segmento)
+
+        # Procura o fim dos registros válidos (após uma queda, descarta o registro incompleto)
+        posicao = 0
+        while True:
+            registro, proximo = _ler_registro(mapa, posicao)
+            if registro is None:
+                break
+            posicao = proximo
+
+        return segmento, mapa, posicao
+
+    def _mapear_segmento(self, segmento, tamanho):
+        caminho = self._caminho_segmento(segmento)
+        novo = not os.path.exists(caminho)
+
+        fd = os.open(caminho, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.fstat(fd).st_size < tamanho:
+                os.ftruncate(fd, tamanho)
+            mapa = mmap.mmap(fd, 0)
+        finally:
+            os.close(fd)
+
+        if novo:
+            self._fsync_diretorio()
+        return mapa
+
+    def _ler_checkpoint(self):
+        try:
+            with open(os.path.join(self.diretorio, "checkpoint")) as arquivo:
+                segmento, offset = arquivo.read().split()
+                return int(segmento), int(offset)
+        except FileNotFoundError:
+            return 0, 0
+
+    def _caminho_segmento(self, segmento):
+        return os.path.join(self.diretorio, f"{segmento:010d}.seg")
+
+    def _fsync_diretorio(self):
+        fd = os.open(self.diretorio, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _travar_diretorio(diretorio):
+        # Cada processo usa o primeiro subdiretório livre; ao reiniciar, um novo
+        # processo assume o subdiretório e drena o que ficou pendente nele
+        slot = 0
+        while True:
+            caminho = os.path.join(diretorio, str(slot))
+            os.makedirs(caminho, exist_ok=True)
+            trava = open(os.path.join(caminho, "lock"), "w")
+            try:
+                fcntl.flock(trava, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return caminho, trava
+            except BlockingIOError:
+                trava.close()
+                slot += 1
+
+
+def _ler_registro(dados, offset):
+    # Retorna (registro, próximo offset) ou (None, offset) no fim dos registros válidos
+    if offset + _CABECALHO.size > len(dados):
+        return None, offset
+
+    tamanho, crc = _CABECALHO.unpack_from(dados, offset)
+    inicio = offset + _CABECALHO.size
+
+    if tamanho == 0 or inicio + tamanho > len(dados):
+        return None, offset
+
+    conteudo = bytes(dados[inicio : inicio + tamanho])
+    if zlib.crc32(conteudo) != crc:
+        return None, offset
+
+    return json.loads(conteudo), inicio + tamanho
+
+
+class DrenadorContatos:
+    """
+    Thread em segundo plano que grava no banco, em lotes, os contatos do journal.
+
+    Usa uma conexão própria. Cada contato carrega um `journal_id` único e o INSERT
+    usa `ON CONFLICT (journal_id) DO NOTHING`, então reprocessar um lote após uma
+    queda (entre o commit e o checkpoint) não duplica mensagens.
+
+    Se o banco recusar o lote por causa dos dados (ex: valor longo demais), os
+    registros são gravados um a um e os recusados vão para a quarentena. Quando
+    está em dia, também drena os diretórios de workers que não existem mais.
+    """
+
+    def __init__(self, journal, app, tamanho_lote=500, intervalo=1.0):
+        self.journal = journal
+        self.app = app
+        self.tamanho_lote = tamanho_lote
+        self.intervalo = intervalo
+        self._conexao = None
+        self._proxima_busca_orfaos = 0
+        self._acordar = threading.Event()
+        self._parar = threading.Event()
+        self._thread = threading.Thread(
+            target=self._executar, name="drenador-contatos", daemon=True
+        )
+
+    def iniciar(self):
+        """Inicia a thread de drenagem (os pendentes de execuções anteriores vêm primeiro)."""
+        self._thread.start()
+
+    def notificar(self):
+        """Acorda o drenador sem esperar o próximo intervalo."""
+        self._acordar.set()
+
+    def parar(self, timeout=5):
+        """Interrompe a thread após uma última drenagem."""
+        self._parar.set()
+        self._acordar.set()
+        self._thread.join(timeout)
+
+    def drenar(self, journal=None):
+        """
+        Grava no banco um lote de contatos pendentes e confirma o checkpoint.
+
+        Args:
+            journal (Journal, opcional): Journal drenado (padrão: o do processo).
+
+        Returns:
+            int: Quantidade de contatos processados no lote.
+        """
+        journal = journal or self.journal
+        registros, posicao = journal.ler_pendentes(self.tamanho_lote)
+        if not registros:
+            if posicao != journal.posicao_confirmada:
+                # Segmento anterior esgotado: avança o checkpoint para não relê-lo
+                journal.confirmar(posicao)
+            return 0
+
+        if self._conexao is None or self._conexao.closed:
+            self._conexao = criar_conexao()
+
+        try:
+            with self._conexao.cursor() as cur:
+                try:
+                    resumos = self._gravar_lote(cur, registros)
+                except _ERROS_PERMANENTES as e:
+                    self._conexao.rollback()
+                    print(f"Lote do journal recusado ({e}); gravando um a um")
+                    resumos = self._gravar_individualmente(cur, journal, registros)
+
+                self._conexao.commit()
+
+                try:
+                    publicar_contatos(resumos, cur)
+                except Exception as e:
+                    print(f"Erro ao publicar eventos de contatos: {e}")
+        except Exception:
+            self._conexao.close()
+            raise
+
+        journal.confirmar(posicao)
+        return len(registros)
+
+    def _gravar_lote(self, cur, registros):
+        cur.executemany(
+            _INSERT_CONTATO,
+            [_parametros_contato(r) for r in registros],
+            returning=True,
+        )
+
+        # Um conjunto de resultados por registro (vazio se já estava gravado)
+        resumos = []
+        while True:
+            for c in cur.fetchall():
+                resumos.append(
+                    resumir_contato(c["id"], c["nome"], c["mensagem"], c["data_envio"])
+                )
+            if not cur.nextset():
+                break
+        return resumos
+
+    def _gravar_individualmente(self, cur, journal, registros):
+        # Cada registro em um savepoint: um recusado não desfaz os demais
+        resumos = []
+        for registro in registros:
+            try:
+                with self._conexao.transaction():
+                    cur.execute(_INSERT_CONTATO, _parametros_contato(registro))
+                    c = cur.fetchone()
+            except _ERROS_PERMANENTES as e:
+                journal.quarentenar(registro, str(e))
+                print(f"Contato {registro['journal_id']} movido para a quarentena: {e}")
+                continue
+
+            if c is not None:
+                resumos.append(
+                    resumir_contato(c["id"], c["nome"], c["mensagem"], c["data_envio"])
+                )
+        return resumos
+
+    def drenar_orfaos(self):
+        """
+        Drena por completo os diretórios de outros workers que não estão em uso
+        (ex: após reiniciar com menos workers).
+
+        Returns:
+            int: Quantidade de contatos processados.
+        """
+        base = os.path.dirname(self.journal.diretorio)
+        processados = 0
+
+        for nome in sorted(os.listdir(base)):
+            caminho = os.path.join(base, nome)
+            if (
+                not nome.isdigit()
+                or caminho == self.journal.diretorio
+                or not os.path.isdir(caminho)
+            ):
+                continue
+
+            orfao = Journal.adotar(caminho, self.journal.tamanho_segmento)
+            if orfao is None:
+                continue
+
+            try:
+                while True:
+                    quantidade = self.drenar(orfao)
+                    if not quantidade:
+                        break
+                    processados += quantidade
+            finally:
+                orfao.fechar()
+
+        return processados
+
+    def _executar(self):
+        espera = self.intervalo
+
+        while True:
+            try:
+                with self.app.app_context():
+                    processados = self.drenar()
+                    if (
+                        not processados
+                        and time.monotonic() >= self._proxima_busca_orfaos
+                    ):
+                        self._proxima_busca_orfaos = (
+                            time.monotonic() + _INTERVALO_ORFAOS
+                        )
+                        processados = self.drenar_orfaos()
+                espera = self.intervalo
+                if processados:
+                    print(f"Drenador de contatos: {processados} contatos gravados")
+                    continue
+            except Exception as e:
+                # Banco indisponível: tenta de novo com espera crescente (até 60s)
+                print(f"Erro ao drenar contatos do journal: {e}")
+                espera = min(espera * 2, 60)
+
+            if self._parar.is_set():
+                return
+
+            self._acordar.wait(espera)
+            self._acordar.clear()
+
+
+_INSERT_CONTATO = """
+    INSERT INTO contatos (journal_id, nome, telefone, email, mensagem, data_envio)
+    VALUES (%s, %s, %s, %s, %s, to_timestamp(%s))
+    ON CONFLICT (journal_id) DO NOTHING
+    RETURNING id, nome, mensagem, data_envio
+"""
+
+
+def _parametros_contato(registro):
+    return (
+        registro["journal_id"],
+        registro["nome"],
+        registro["telefone"],
+        registro["email"],
+        registro["mensagem"],
+        registro["recebido_em"],
+    )
+
+
+_journal = None
+_drenador = None
+
+
+def iniciar_ingestao_journal(app):
+    """
+    Abre o journal de contatos e inicia o drenador em segundo plano.
+
+    Chamada por `create_app()` quando `CONTATOS_MODO_INGESTAO = "journal"`.
+    Contatos pendentes de execuções anteriores são drenados logo no início.
+
+    Args:
+        app (Flask): Aplicação com as configurações `JOURNAL_*`.
+
+    Returns:
+        None
+    """
+    global _journal, _drenador
+
+    if _journal is not None:
+        return
+
+    _journal = Journal(
+        app.config["JOURNAL_DIR"], app.config["JOURNAL_TAMANHO_SEGMENTO"]
+    )
+    _drenador = DrenadorContatos(
+        _journal,
+        app,
+        tamanho_lote=app.config["JOURNAL_TAMANHO_LOTE"],
+        intervalo=app.config["JOURNAL_INTERVALO_SEGUNDOS"],
+    )
+    _drenador.iniciar()
+    atexit.register(_drenador.parar)
+
+
+def enfileirar_contato(nome, telefone, email, mensagem):
+    """
+    Grava um contato validado no journal para inserção posterior no banco.
+
+    Args:
+        nome (str): Nome padronizado do remetente.
+        telefone (str | None): Telefone sem formatação.
+        email (str | None): E-mail em minúsculas.
+        mensagem (str): Mensagem enviada.
+
+    Returns:
+        str: `journal_id` atribuído ao contato.
+
+    Raises:
+        OSError: Se não for possível gravar o journal no disco.
+    """
+    journal_id = str(uuid.uuid4())
+
+    _journal.anexar(
+        {
+            "journal_id": journal_id,
+            "nome": nome,
+            "telefone": telefone,
+            "email": email,
+            "mensagem": mensagem,
+            "recebido_em": time.time(),
+        }
+    )
+    _drenador.notificar()
+
+    return journal_id
@@ -0,0 +1,384 @@
+from database.database import get_cursor
+from flask import current_app
+from collections import OrderedDict, deque
+import math
+import threading
+import time
+
+
+class BackendMemoria:
+    """
+    Armazena as tentativas de login em memória, no próprio processo.
+
+    Cada chave guarda os instantes das tentativas dentro da janela (janela
+    deslizante) e o número de falhas consecutivas. É o backend mais rápido,
+    mas cada worker mantém sua própria contagem.
+
+    Os dois mapas guardam no máximo `max_chaves` chaves cada; ao atingir o
+    limite, a chave usada há mais tempo é descartada (LRU), em tempo constante.
+    """
+
+    def __init__(self, max_chaves=10000):
+        self._tentativas = OrderedDict()
+        self._falhas = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_chaves = max_chaves
+
+    def registrar_tentativa(self, chave, agora, janela, limite):
+        """
+        Registra uma tentativa se a chave ainda estiver abaixo do limite da janela.
+
+        Args:
+            chave (str): Chave do limite (ex: 'ip:1.2.3.4', 'email:a@b.com').
+            agora (float): Instante atual (timestamp Unix).
+            janela (int): Tamanho da janela deslizante em segundos.
+            limite (int): Máximo de tentativas permitidas na janela.
+
+        Returns:
+            float: Segundos até a próxima tentativa permitida (0 se a tentativa foi aceita).
+        """
+        with self._lock:
+            tentativas = self._tentativas.get(chave)
+            if tentativas is None:
+                if len(self._tentativas) >= self._max_chaves:
+                    self._tentativas.popitem(last=False)
+                tentativas = self._tentativas[chave] = deque()
+            else:
+                self._tentativas.move_to_end(chave)
+
+            while tentativas and tentativas[0] <= agora - janela:
+                tentativas.popleft()
+
+            if len(tentativas) >= limite:
+                return tentativas[0] + janela - agora
+
+            tentativas.append(agora)
+            return 0
+
+    def registrar_falha(self, chave, agora):
+        """Incrementa as falhas consecutivas da chave e retorna o novo total."""
+        with self._lock:
+            falhas, _ = self._falhas.pop(chave, (0, agora))
+            if len(self._falhas) >= self._max_chaves:
+                # Descarta a chave com a falha mais antiga
+                self._falhas.popitem(last=False)
+            self._falhas[chave] = (falhas + 1, agora)
+            return falhas + 1
+
+    def obter_falhas(self, chave):
+        """Retorna (falhas consecutivas, instante da última falha) da chave."""
+        with self._lock:
+            return self._falhas.get(chave, (0, 0))
+
+    def limpar_falhas(self, chave):
+        """Zera as falhas consecutivas da chave (após um login bem-sucedido)."""
+        with self._lock:
+            self._falhas.pop(chave, None)
+
+
+class BackendPostgres:
+    """
+    Armazena as tentativas de login no PostgreSQL, compartilhadas entre workers.
+
+    Usa as tabelas `tentativas_login` (janela deslizante) e `falhas_login`
+    (falhas consecutivas). Cada verificação custa poucas consultas indexadas,
+    ainda bem mais baratas que a busca do usuário somada ao bcrypt.
+
+    A cada `intervalo_limpeza` segundos, uma das verificações também apaga as
+    tentativas fora da janela e as falhas sem novidade há mais de
+    `retencao_falhas` segundos, de chaves que deixaram de aparecer.
+    """
+
+    def __init__(self, retencao_falhas=86400, intervalo_limpeza=60):
+        self.retencao_falhas = retencao_falhas
+        self.intervalo_limpeza = intervalo_limpeza
+        self._proxima_limpeza = 0
+        self._lock = threading.Lock()
+
+    def registrar_tentativa(self, chave, agora, janela, limite):
+        """Mesmo contrato de `BackendMemoria.registrar_tentativa`."""
+        with get_cursor() as cur:
+            if self._limpeza_pendente(agora):
+                cur.execute(
+                    "DELETE FROM tentativas_login WHERE momento <= %s",
+                    (agora - janela,),
+                )
+                cur.execute(
+                    "DELETE FROM falhas_login WHERE ultima_falha <= %s",
+                    (agora - self.retencao_falhas,),
+                )
+
+            cur.execute(
+                "DELETE FROM tentativas_login WHERE chave = %s AND momento <= %s",
+                (chave, agora - janela),
+            )
+            cur.execute(
+                """
+                SELECT COUNT(*) AS total, MIN(momento) AS mais_antiga
+                FROM tentativas_login WHERE chave = %s
+                """,
+                (chave,),
+            )
+            resultado = cur.fetchone()
+
+            if resultado["total"] >= limite:
+                cur.connection.commit()
+                return resultado["mais_antiga"] + janela - agora
+
+            cur.execute(
+                "INSERT INTO tentativas_login (chave, momento) VALUES (%s, %s)",
+                (chave, agora),
+            )
+            cur.connection.commit()
+            return 0
+
+    def registrar_falha(self, chave, agora):
+        """Mesmo contrato de `BackendMemoria.registrar_falha`."""
+        with get_cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO falhas_login (chave, falhas, ultima_falha) VALUES (%s, 1, %s)
+                ON CONFLICT (chave) DO UPDATE
+                SET falhas = falhas_login.falhas + 1, ultima_falha = EXCLUDED.ultima_falha
+                RETURNING falhas
+                """,
+                (chave, agora),
+            )
+            falhas = cur.fetchone()["falhas"]
+            cur.connection.commit()
+            return falhas
+
+    def obter_falhas(self, chave):
+        """Mesmo contrato de `BackendMemoria.obter_falhas`."""
+        with get_cursor() as cur:
+            cur.execute(
+                "SELECT falhas, ultima_falha FROM falhas_login WHERE chave = %s",
+                (chave,),
+            )
+            resultado = cur.fetchone()
+
+        if resultado is None:
+            return (0, 0)
+        return (resultado["falhas"], resultado["ultima_falha"])
+
+    def limpar_falhas(self, chave):
+        """Mesmo contrato de `BackendMemoria.limpar_falhas`."""
+        with get_cursor() as cur:
+            cur.execute("DELETE FROM falhas_login WHERE chave = %s", (chave,))
+            cur.connection.commit()
+
+    def _limpeza_pendente(self, agora):
+        # Apenas uma requisição por intervalo (neste processo) faz a limpeza
+        with self._lock:
+            if agora < self._proxima_limpeza:
+                return False
+            self._proxima_limpeza = agora + self.intervalo_limpeza
+            return True
+
+
+class LimitadorLogin:
+    """
+    Limita tentativas de login por IP e por e-mail antes de qualquer consulta ao
+    usuário ou verificação bcrypt.
+
+    Combina duas regras:
+        - Janela deslizante: no máximo N tentativas por IP e por e-mail na janela.
+        - Atraso progressivo: após X falhas consecutivas, cada nova tentativa
+          precisa esperar 2^(falhas - X) segundos (limitado a um máximo).
+    """
+
+    def __init__(
+        self,
+        backend,
+        limite_ip=20,
+        limite_email=5,
+        janela=300,
+        falhas_antes_atraso=3,
+        atraso_maximo=900,
+    ):
+        self.backend = backend
+        self.limite_ip = limite_ip
+        self.limite_email = limite_email
+        self.janela = janela
+        self.falhas_antes_atraso = falhas_antes_atraso
+        self.atraso_maximo = atraso_maximo
+
+    def verificar(self, ip, email):
+        """
+        Verifica se a tentativa pode seguir para a autenticação.
+
+        Args:
+            ip (str): Endereço IP do cliente.
+            email (str): E-mail informado na tentativa.
+
+        Returns:
+            int: Segundos que o cliente deve aguardar (0 se a tentativa foi liberada).
+        """
+        agora = time.time()
+        chaves = (f"ip:{ip}", f"email:{email.strip().lower()}")
+
+        # Atraso progressivo após falhas consecutivas
+        for chave in chaves:
+            falhas, ultima_falha = self.backend.obter_falhas(chave)
+            if falhas >= self.falhas_antes_atraso:
+                atraso = min(
+                    2 ** (falhas - self.falhas_antes_atraso), self.atraso_maximo
+                )
+                if agora - ultima_falha < atraso:
+                    return math.ceil(ultima_falha + atraso - agora)
+
+        # Janelas deslizantes por IP e por e-mail
+        for chave, limite in zip(chaves, (self.limite_ip, self.limite_email)):
+            espera = self.backend.registrar_tentativa(chave, agora, self.janela, limite)
+            if espera > 0:
+                return math.ceil(espera)
+
+        return 0
+
+    def registrar_falha(self, ip, email):
+        """Registra uma falha de autenticação para o IP e para o e-mail."""
+        agora = time.time()
+        self.backend.registrar_falha(f"ip:{ip}", agora)
+        self.backend.registrar_falha(f"email:{email.strip().lower()}", agora)
+
+    def registrar_sucesso(self, ip, email):
+        """Zera as falhas consecutivas do IP e do e-mail após um login válido."""
+        self.backend.limpar_falhas(f"ip:{ip}")
+        self.backend.limpar_falhas(f"email:{email.strip().lower()}")
+
+
+class BaldeDeFichas:
+    """
+    Limitador por balde de fichas (token bucket), mantido em memória por chave.
+
+    Cada chave começa com `capacidade` fichas e recupera `fichas_por_segundo`
+    continuamente. Cada requisição consome uma ficha; sem fichas, é rejeitada.
+    Permite pequenas rajadas legítimas e limita o ritmo sustentado.
+
+    Guarda no máximo `max_chaves` baldes; ao atingir o limite, descarta o
+    balde usado há mais tempo (LRU), em tempo constante.
+    """
+
+    def __init__(self, capacidade, fichas_por_segundo, max_chaves=10000):
+        self.capacidade = capacidade
+        self.fichas_por_segundo = fichas_por_segundo
+        self._baldes = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_chaves = max_chaves
+
+    def consumir(self, chave):
+        """
+        Tenta consumir uma ficha do balde da chave.
+
+        Args:
+            chave (str): Chave do limite (ex: IP do cliente).
+
+        Returns:
+            float: Segundos até haver uma ficha disponível (0 se a ficha foi consumida).
+        """
+        agora = time.monotonic()
+
+        with self._lock:
+            balde = self._baldes.pop(chave, None)
+            if balde is None:
+                if len(self._baldes) >= self._max_chaves:
+                    self._baldes.popitem(last=False)
+                fichas = self.capacidade
+            else:
+                fichas, ultimo = balde
+                fichas = min(
+                    self.capacidade, fichas + (agora - ultimo) * self.fichas_por_segundo
+                )
+
+            if fichas < 1:
+                self._baldes[chave] = (fichas, agora)
+                return (1 - fichas) / self.fichas_por_segundo
+
+            self._baldes[chave] = (fichas - 1, agora)
+            return 0
+
+
+_limitador_login = None
+_limitador_login_lock = threading.Lock()
+_limitador_contatos = None
+_limitador_visualizacoes = None
+
+
+def obter_limitador_login():
+    """
+    Retorna o limitador de login do processo, criando-o a partir do `Config`.
+
+    O backend é escolhido por `LOGIN_LIMITE_BACKEND` ("memoria" ou "postgres").
+
+    Returns:
+        LimitadorLogin: Instância compartilhada pelo processo.
+    """
+    global _limitador_login
+
+    if _limitador_login is None:
+        with _limitador_login_lock:
+            if _limitador_login is None:
+                config = current_app.config
+                backend = (
+                    BackendPostgres(config["LOGIN_FALHAS_RETENCAO_SEGUNDOS"])
+                    if config["LOGIN_LIMITE_BACKEND"] == "postgres"
+                    else BackendMemoria()
+                )
+                _limitador_login = LimitadorLogin(
+                    backend,
+                    limite_ip=config["LOGIN_LIMITE_IP"],
+                    limite_email=config["LOGIN_LIMITE_EMAIL"],
+                    janela=config["LOGIN_JANELA_SEGUNDOS"],
+                    falhas_antes_atraso=config["LOGIN_FALHAS_ANTES_ATRASO"],
+                    atraso_maximo=config["LOGIN_ATRASO_MAXIMO_SEGUNDOS"],
+                )
+
+    return _limitador_login
+
+
+def obter_limitador_contatos():
+    """
+    Retorna o balde de fichas por IP do formulário público de contato.
+
+    Configurado por `CONTATOS_LIMITE_CAPACIDADE` (rajada máxima) e
+    `CONTATOS_LIMITE_POR_MINUTO` (ritmo sustentado).
+
+    Returns:
+        BaldeDeFichas: Instância compartilhada pelo processo.
+    """
+    global _limitador_contatos
+
+    if _limitador_contatos is None:
+        with _limitador_login_lock:
+            if _limitador_contatos is None:
+                config = current_app.config
+                _limitador_contatos = BaldeDeFichas(
+                    capacidade=config["CONTATOS_LIMITE_CAPACIDADE"],
+                    fichas_por_segundo=config["CONTATOS_LIMITE_POR_MINUTO"] / 60,
+                )
+
+    return _limitador_contatos
+
+
+def obter_limitador_visualizacoes():
+    """
+    Retorna o balde de fichas por IP da rota pública de visualizações de fotos.
+
+    Configurado por `VISUALIZACOES_LIMITE_CAPACIDADE` (rajada máxima) e
+    `VISUALIZACOES_LIMITE_POR_MINUTO` (ritmo sustentado).
+
+    Returns:
+        BaldeDeFichas: Instância compartilhada pelo processo.
+    """
+    global _limitador_visualizacoes
+
+    if _limitador_visualizacoes is None:
+        with _limitador_login_lock:
+            if _limitador_visualizacoes is None:
+                config = current_app.config
+                _limitador_visualizacoes = BaldeDeFichas(
+                    capacidade=config["VISUALIZACOES_LIMITE_CAPACIDADE"],
+                    fichas_por_segundo=config["VISUALIZACOES_LIMITE_POR_MINUTO"] / 60,
+                )
+
+    return _limitador_visualizacoes
@@ -1,8 +1,143 @@
-from database.database import connection, get_cursor
+from database.database import connection, criar_conexao, get_cursor
+from services.metricas import registro
 from flask import request
+from collections import Counter
+import random
+import threading
+import time
 
 
-def registrar_log(tipo_log, status):
+# Níveis de severidade dos logs
+DEBUG = 10
+INFO = 20
+AVISO = 30
+ERRO = 40
+
+NIVEIS = {"debug": DEBUG, "info": INFO, "aviso": AVISO, "erro": ERRO}
+
+# Eventos de autenticação: sempre gravados, como os de nível ERRO
+TIPOS_AUTENTICACAO = frozenset(
+    {
+        "Login bem-sucedido",
+        "Login falhou",
+        "Logout realizado",
+        "Logout em todos os dispositivos",
+        "Token inválido",
+        "Cadastro bem-sucedido",
+        "Reuso de refresh token",
+    }
+)
+
+# Política de gravação (ajustada por `configurar_registro_logs` a partir do `Config`)
+_nivel_minimo = INFO
+_taxas_amostragem = {}
+_limites_por_minuto = {}
+
+# Janela atual do limite por tipo: {tipo_log: [início da janela, gravados na janela]}
+_janelas = {}
+# Eventos não gravados: {(tipo_log, motivo): quantidade}
+_suprimidos = Counter()
+_politica_lock = threading.Lock()
+
+
+def ler_mapa_tipos(valor, conversor):
+    """
+    Converte uma configuração "Tipo A=0.1,Tipo B=0.5" em dicionário.
+
+    Args:
+        valor (str): Pares `tipo_log=valor` separados por vírgula.
+        conversor (callable): Conversão do valor (ex: float, int).
+
+    Returns:
+        dict: {tipo_log: valor convertido}
+    """
+    mapa = {}
+    for par in (valor or "").split(","):
+        tipo, separador, numero = par.rpartition("=")
+        if separador and tipo.strip():
+            mapa[tipo.strip()] = conversor(numero.strip())
+    return mapa
+
+
+def configurar_registro_logs(nivel_minimo, taxas_amostragem, limites_por_minuto):
+    """
+    Ajusta quais eventos `registrar_log` grava (chamada em `create_app()`).
+
+    Args:
+        nivel_minimo (str): 'debug', 'info', 'aviso' ou 'erro'.
+        taxas_amostragem (dict): {tipo_log: fração gravada, entre 0 e 1}.
+        limites_por_minuto (dict): {tipo_log: máximo de linhas por minuto no processo}.
+
+    Returns:
+        None
+    """
+    global _nivel_minimo, _taxas_amostragem, _limites_por_minuto
+
+    _nivel_minimo = NIVEIS.get(nivel_minimo.lower(), INFO)
+    _taxas_amostragem = dict(taxas_amostragem)
+    _limites_por_minuto = dict(limites_por_minuto)
+
+
+def _motivo_supressao(tipo_log, nivel):
+    """
+    Decide se o evento deve ser descartado.
+
+    Erros e eventos de autenticação nunca são descartados. Os demais passam,
+    nesta ordem, pelo nível mínimo, pela amostragem e pelo limite por minuto.
+
+    Returns:
+        str | None: 'nivel', 'amostragem' ou 'limite'; None se o evento deve ser gravado.
+    """
+    if nivel >= ERRO or tipo_log in TIPOS_AUTENTICACAO:
+        return None
+
+    if nivel < _nivel_minimo:
+        return "nivel"
+
+    taxa = _taxas_amostragem.get(tipo_log)
+    if taxa is not None and random.random() >= taxa:
+        return "amostragem"
+
+    limite = _limites_por_minuto.get(tipo_log)
+    if limite is not None:
+        agora = time.monotonic()
+        with _politica_lock:
+            janela = _janelas.get(tipo_log)
+            if janela is None or agora - janela[0] >= 60:
+                janela = _janelas[tipo_log] = [agora, 0]
+            if janela[1] >= limite:
+                return "limite"
+            janela[1] += 1
+
+    return None
+
+
+def _suprimir(tipo_log, nivel):
+    """Aplica a política de gravação; conta e retorna True se o evento deve ser descartado."""
+    if nivel is None:
+        nivel = ERRO if tipo_log.startswith("Erro") else INFO
+
+    motivo = _motivo_supressao(tipo_log, nivel)
+    if motivo is None:
+        return False
+
+    with _politica_lock:
+        _suprimidos[(tipo_log, motivo)] += 1
+    return True
+
+
+def obter_logs_suprimidos():
+    """
+    Retorna uma cópia dos contadores de eventos não gravados pelo processo.
+
+    Returns:
+        dict: {(tipo_log, motivo): quantidade}
+    """
+    with _politica_lock:
+        return dict(_suprimidos)
+
+
+def registrar_log(tipo_log, status, nivel=None):
     """
     Registra informações de log no banco de dados para auditoria e rastreabilidade.
 
@@ -12,10 +147,17 @@ def registrar_log(tipo_log, status):
         - URL acessada
         - Método HTTP utilizado (GET, POST, etc.)
 
+    Nem todo evento é gravado: os abaixo de `LOGS_NIVEL_MINIMO`, os não sorteados
+    pela taxa de `LOGS_AMOSTRAGEM` e os acima de `LOGS_LIMITE_POR_MINUTO` são
+    descartados e apenas contados (`logs_suprimidos_total` em /metrics).
+    Erros e eventos de autenticação são sempre gravados.
+
     Args:
         tipo_log (str): Categoria ou tipo do evento registrado.
                         Ex: 'Login bem-sucedido', 'Erro ao salvar contato', 'Cadastro realizado'.
         status (str): Descrição detalhada do evento ocorrido.
+        nivel (int, opcional): DEBUG, INFO, AVISO ou ERRO. Por padrão, ERRO para
+                               tipos iniciados por "Erro" e INFO para os demais.
 
     Returns:
         None: A função não retorna valor, mas insere um registro na tabela `logs`.
@@ -25,6 +167,8 @@ def registrar_log(tipo_log, status):
                    O erro é capturado internamente e exibido no console,
                    mas não interrompe a execução principal.
     """
+    if _suprimir(tipo_log, nivel):
+        return
 
     try:
         with get_cursor() as cur:
@@ -46,3 +190,130 @@ def registrar_log(tipo_log, status):
         connection.rollback()
         print(f"Erro ao registrar log: {e}")
         print(f"Erro ao registrar log: {repr(e)}")
+
+
+async def registrar_log_async(pool, tipo_log, status, nivel=None):
+    """
+    Versão assíncrona de `registrar_log`, usada pelas rotas do modo ASGI (asgi.py).
+
+    Aplica a mesma política de gravação e grava com uma conexão do pool
+    assíncrono, sem bloquear o event loop.
+
+    Args:
+        pool (psycopg_pool.AsyncConnectionPool): Pool de conexões assíncronas.
+        tipo_log (str): Categoria ou tipo do evento registrado.
+        status (str): Descrição detalhada do evento ocorrido.
+        nivel (int, opcional): DEBUG, INFO, AVISO ou ERRO (mesmo padrão de `registrar_log`).
+
+    Returns:
+        None
+    """
+    if _suprimir(tipo_log, nivel):
+        return
+
+    try:
+        async with pool.connection() as conexao:
+            await conexao.execute(
+                """ INSERT INTO logs (tipo_log, ip_usuario, user_agent, url, metodo, status)
+                VALUES (%s, %s, %s, %s, %s, %s) """,
+                (
+                    tipo_log,
+                    request.remote_addr,
+                    request.headers.get("User-Agent"),
+                    request.path,
+                    request.method,
+                    status,
+                ),
+            )
+
+    except Exception as e:
+        print(f"Erro ao registrar log: {e}")
+
+
+@registro.registrar_coletor
+def _coletar_logs_suprimidos():
+    # Exporta em /metrics os eventos descartados pela política de gravação
+    return (
+        "logs_suprimidos_total",
+        "counter",
+        "Eventos de log não gravados, por tipo e motivo (nivel, amostragem, limite).",
+        [
+            ({"tipo_log": tipo_log, "motivo": motivo}, total)
+            for (tipo_log, motivo), total in obter_logs_suprimidos().items()
+        ],
+    )
+
+
+def manter_particoes_logs(conexao, meses_a_frente, meses_retencao, desde=None):
+    """
+    Executa a manutenção das partições mensais da tabela `logs`.
+
+    Cria as partições até `meses_a_frente` meses após o mês atual (função SQL
+    `criar_particoes_logs`) e, se `meses_retencao` > 0, remove as partições
+    inteiramente anteriores à retenção (`remover_particoes_logs`), o que é
+    um DROP TABLE por mês em vez de um DELETE seguido de VACUUM.
+
+    Args:
+        conexao (psycopg.Connection): Conexão usada (a transação é confirmada ao final).
+        meses_a_frente (int): Meses futuros com partição já criada.
+        meses_retencao (int): Meses de logs mantidos (0 mantém todos).
+        desde (date, opcional): Cria também as partições a partir deste mês (ex: carga de dados antigos).
+
+    Returns:
+        dict: {'criadas': int, 'removidas': int}
+    """
+    with conexao.cursor() as cur:
+        cur.execute(
+            "SELECT criar_particoes_logs(%s, COALESCE(%s::date, CURRENT_DATE)) AS criadas",
+            (meses_a_frente, desde),
+        )
+        criadas = cur.fetchone()["criadas"]
+
+        removidas = 0
+        if meses_retencao > 0:
+            cur.execute(
+                "SELECT remover_particoes_logs(%s) AS removidas", (meses_retencao,)
+            )
+            removidas = cur.fetchone()["removidas"]
+
+    conexao.commit()
+    return {"criadas": criadas, "removidas": removidas}
+
+
+def iniciar_manutencao_logs(app):
+    """
+    Inicia a thread que mantém as partições de `logs` (na inicialização e
+    depois a cada `LOGS_MANUTENCAO_INTERVALO_HORAS`), com uma conexão própria.
+
+    A função SQL usa um advisory lock, então vários workers podem executá-la
+    ao mesmo tempo. Se a manutenção atrasar, os logs caem na partição padrão
+    e são movidos para a partição do mês quando ela for criada.
+
+    Args:
+        app (Flask): Aplicação Flask (lida apenas a configuração).
+
+    Returns:
+        None
+    """
+    meses_a_frente = app.config["LOGS_PARTICOES_FUTURAS"]
+    meses_retencao = app.config["LOGS_RETENCAO_MESES"]
+    intervalo = app.config["LOGS_MANUTENCAO_INTERVALO_HORAS"] * 3600
+
+    def manter():
+        while True:
+            try:
+                with criar_conexao() as conexao:
+                    resultado = manter_particoes_logs(
+                        conexao, meses_a_frente, meses_retencao
+                    )
+                if resultado["criadas"] or resultado["removidas"]:
+                    print(
+                        f"Partições de logs: {resultado['criadas']} criada(s), "
+                        f"{resultado['removidas']} removida(s)"
+                    )
+            except Exception as e:
+                print(f"Erro na manutenção das partições de logs: {e}")
+
+            time.sleep(intervalo)
+
+    threading.Thread(target=manter, name="manutencao-logs", daemon=True).start()
@@ -0,0 +1,301 @@
+from flask import g, request
+from services.tracing import abrir_span
+from contextlib import contextmanager
+import bisect
+import threading
+import time
+
+# Limites (em segundos) dos buckets dos histogramas de latência
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _formatar_rotulos(nomes, valores, extra=None):
+    pares = list(zip(nomes, valores))
+    if extra is not None:
+        pares.append(extra)
+    if not pares:
+        return ""
+
+    def escapar(valor):
+        return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+    return "{" + ",".join(f'{nome}="{escapar(valor)}"' for nome, valor in pares) + "}"
+
+
+class Contador:
+    """Contador monotônico, separado por combinação de rótulos."""
+
+    tipo = "counter"
+
+    def __init__(self, nome, ajuda, rotulos=()):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self._valores = {}
+        self._lock = threading.Lock()
+
+    def incrementar(self, *valores_rotulos, valor=1):
+        """Soma `valor` ao contador dos rótulos informados (na ordem de `rotulos`)."""
+        with self._lock:
+            self._valores[valores_rotulos] = (
+                self._valores.get(valores_rotulos, 0) + valor
+            )
+
+    def exportar(self):
+        """Retorna as amostras no formato de texto do Prometheus."""
+        with self._lock:
+            valores = list(self._valores.items())
+        return [
+            f"{self.nome}{_formatar_rotulos(self.rotulos, rotulos)} {valor}"
+            for rotulos, valor in valores
+        ]
+
+
+class Medidor(Contador):
+    """Valor que sobe e desce (ex: requisições em andamento)."""
+
+    tipo = "gauge"
+
+    def decrementar(self, *valores_rotulos, valor=1):
+        """Subtrai `valor` do medidor dos rótulos informados."""
+        self.incrementar(*valores_rotulos, valor=-valor)
+
+
+class Histograma:
+    """
+    Histograma cumulativo de observações (ex: latências em segundos).
+
+    Guarda, por combinação de rótulos, a contagem por bucket, a soma e o total
+    de observações, como esperado pelo formato do Prometheus.
+    """
+
+    tipo = "histogram"
+
+    def __init__(self, nome, ajuda, rotulos=(), buckets=BUCKETS_LATENCIA):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observar(self, valor, *valores_rotulos):
+        """
+        Registra uma observação.
+
+        Args:
+            valor (float): Valor observado (ex: duração em segundos).
+            *valores_rotulos (str): Valores dos rótulos, na ordem de `rotulos`.
+
+        Returns:
+            None
+        """
+        indice = bisect.bisect_left(self.buckets, valor)
+
+        with self._lock:
+            serie = self._series.get(valores_rotulos)
+            if serie is None:
+                # [contagens por bucket (+Inf no fim), soma, total]
+                serie = self._series[valores_rotulos] = [
+                    [0] * (len(self.buckets) + 1),
+                    0.0,
+                    0,
+                ]
+            serie[0][indice] += 1
+            serie[1] += valor
+            serie[2] += 1
+
+    def exportar(self):
+        """Retorna as amostras no formato de texto do Prometheus."""
+        with self._lock:
+            series = [
+                (rotulos, list(contagens), soma, total)
+                for rotulos, (contagens, soma, total) in self._series.items()
+            ]
+
+        linhas = []
+        for rotulos, contagens, soma, total in series:
+            acumulado = 0
+            for limite, contagem in zip(self.buckets + ("+Inf",), contagens):
+                acumulado += contagem
+                linhas.append(
+                    f"{self.nome}_bucket"
+                    f"{_formatar_rotulos(self.rotulos, rotulos, ('le', limite))} {acumulado}"
+                )
+            sufixo = _formatar_rotulos(self.rotulos, rotulos)
+            linhas.append(f"{self.nome}_sum{sufixo} {soma}")
+            linhas.append(f"{self.nome}_count{sufixo} {total}")
+        return linhas
+
+
+class RegistroMetricas:
+    """
+    Conjunto das métricas do processo, exportado em `/metrics`.
+
+    Além das métricas registradas, aceita coletores: funções chamadas no momento
+    da exportação que devolvem (nome, tipo, ajuda, [(rótulos, valor), ...]) para
+    valores mantidos por outros módulos (ex: contadores do antispam).
+    """
+
+    def __init__(self):
+        self._metricas = []
+        self._coletores = []
+
+    def registrar(self, metrica):
+        """Adiciona uma métrica ao registro e a retorna."""
+        self._metricas.append(metrica)
+        return metrica
+
+    def registrar_coletor(self, coletor):
+        """
+        Adiciona uma função coletora, chamada a cada exportação.
+
+        A coletora retorna uma série (nome, tipo, ajuda, amostras) ou uma lista
+        delas, quando várias séries saem da mesma leitura dos dados.
+        """
+        self._coletores.append(coletor)
+        return coletor
+
+    def exportar(self):
+        """
+        Gera o texto de exposição do Prometheus (versão 0.0.4).
+
+        Returns:
+            str: Todas as métricas, com as linhas HELP e TYPE de cada uma.
+        """
+        linhas = []
+
+        for metrica in self._metricas:
+            linhas.append(f"# HELP {metrica.nome} {metrica.ajuda}")
+            linhas.append(f"# TYPE {metrica.nome} {metrica.tipo}")
+            linhas.extend(metrica.exportar())
+
+        for coletor in self._coletores:
+            try:
+                series = coletor()
+            except Exception as e:
+                print(f"Erro no coletor de métricas {coletor.__name__}: {e}")
+                continue
+
+            if isinstance(series, tuple):
+                series = [series]
+
+            for nome, tipo, ajuda, amostras in series:
+                linhas.append(f"# HELP {nome} {ajuda}")
+                linhas.append(f"# TYPE {nome} {tipo}")
+                for rotulos, valor in amostras:
+                    linhas.append(
+                        f"{nome}{_formatar_rotulos(rotulos.keys(), rotulos.values())} {valor}"
+                    )
+
+        return "\n".join(linhas) + "\n"
+
+
+registro = RegistroMetricas()
+
+duracao_requisicoes = registro.registrar(
+    Histograma(
+        "http_requisicao_duracao_segundos",
+        "Duração das requisições HTTP por endpoint.",
+        ("endpoint", "metodo"),
+    )
+)
+total_requisicoes = registro.registrar(
+    Contador(
+        "http_requisicoes_total",
+        "Requisições HTTP atendidas por endpoint e status.",
+        ("endpoint", "metodo", "status"),
+    )
+)
+requisicoes_em_andamento = registro.registrar(
+    Medidor(
+        "http_requisicoes_em_andamento",
+        "Requisições HTTP sendo processadas no momento.",
+    )
+)
+duracao_upstream = registro.registrar(
+    Histograma(
+        "upstream_duracao_segundos",
+        "Duração das chamadas a serviços externos (banco, Cloudinary, SMTP).",
+        ("servico", "operacao"),
+    )
+)
+erros_upstream = registro.registrar(
+    Contador(
+        "upstream_erros_total",
+        "Chamadas a serviços externos que terminaram em exceção.",
+        ("servico", "operacao"),
+    )
+)
+
+
+@contextmanager
+def medir_upstream(servico, operacao, **atributos):
+    """
+    Mede a duração de uma chamada a um serviço externo.
+
+    Além da métrica, abre um span filho no rastro da requisição (ver `services.tracing`).
+
+    Exemplo:
+        with medir_upstream("cloudinary", "resources_by_asset_folder"):
+            cloudinary.api.resources_by_asset_folder(...)
+
+    Args:
+        servico (str): Serviço chamado ('postgres', 'cloudinary', 'smtp').
+        operacao (str): Operação realizada (ex: 'SELECT', 'enviar_email').
+        **atributos: Atributos extras do span (ex: consulta normalizada).
+
+    Yields:
+        None
+    """
+    inicio = time.perf_counter()
+    try:
+        with abrir_span(
+            f"{servico} {operacao}", "cliente", servico=servico, **atributos
+        ):
+            yield
+    except Exception:
+        erros_upstream.incrementar(servico, operacao)
+        raise
+    finally:
+        duracao_upstream.observar(time.perf_counter() - inicio, servico, operacao)
+
+
+def iniciar_metricas(app):
+    """
+    Registra os hooks que medem cada requisição da aplicação.
+
+    Para respostas em stream (ex: feed SSE), a duração medida vai até o início
+    do envio, não até o fim da conexão.
+
+    Args:
+        app (Flask): Aplicação Flask.
+
+    Returns:
+        None
+    """
+
+    @app.before_request
+    def iniciar_medicao():
+        g.inicio_requisicao = time.perf_counter()
+        g.requisicao_em_andamento = True
+        requisicoes_em_andamento.incrementar()
+
+    @app.after_request
+    def registrar_medicao(response):
+        inicio = g.pop("inicio_requisicao", None)
+        if inicio is not None:
+            # O endpoint (e não a URL) mantém a cardinalidade dos rótulos baixa
+            endpoint = request.endpoint or "desconhecido"
+            duracao_requisicoes.observar(
+                time.perf_counter() - inicio, endpoint, request.method
+            )
+            total_requisicoes.incrementar(
+                endpoint, request.method, str(response.status_code)
+            )
+        return response
+
+    @app.teardown_request
+    def finalizar_medicao(exc):
+        if g.pop("requisicao_em_andamento", False):
+            requisicoes_em_andamento.decrementar()
@@ -0,0 +1,187 @@
+from flask import g, request
+from collections import deque
+from datetime import datetime, timezone
+import cProfile
+import hashlib
+import hmac
+import io
+import marshal
+import pstats
+import random
+import threading
+import time
+import uuid
+
+# Cabeçalho que pede o profiling de uma requisição: "<timestamp>:<assinatura>"
+CABECALHO_PROFILING = "X-Profile"
+
+# Validade (s) de um cabeçalho assinado, para que não possa ser reutilizado depois
+_validade_assinatura = 300
+
+
+def assinar_profiling(segredo, timestamp, caminho):
+    """
+    Gera a assinatura HMAC-SHA256 que autoriza o profiling de uma requisição.
+
+    Exemplo (gerando o cabeçalho para `/api/contatos`):
+        ts = int(time.time())
+        f"{ts}:{assinar_profiling(segredo, ts, '/api/contatos')}"
+
+    Args:
+        segredo (str): Valor de `PROFILING_SEGREDO`.
+        timestamp (int): Instante (timestamp Unix) da assinatura.
+        caminho (str): Caminho da requisição a ser perfilada.
+
+    Returns:
+        str: Assinatura em hexadecimal.
+    """
+    mensagem = f"{timestamp}:{caminho}".encode("utf-8")
+    return hmac.new(segredo.encode("utf-8"), mensagem, hashlib.sha256).hexdigest()
+
+
+def _cabecalho_valido(valor, segredo, caminho):
+    if not valor or not segredo:
+        return False
+
+    timestamp, _, assinatura = valor.partition(":")
+    try:
+        timestamp = int(timestamp)
+    except ValueError:
+        return False
+
+    if abs(time.time() - timestamp) > _validade_assinatura:
+        return False
+
+    return hmac.compare_digest(
+        assinatura, assinar_profiling(segredo, timestamp, caminho)
+    )
+
+
+class ArmazemPerfis:
+    """
+    Guarda em memória os últimos resultados de profiling (buffer circular).
+
+    Cada resultado traz o resumo em texto (pstats, ordenado por tempo acumulado)
+    e as estatísticas completas no formato do `pstats`, para download.
+    """
+
+    def __init__(self, max_resultados=20):
+        self._resultados = deque(maxlen=max_resultados)
+        self._lock = threading.Lock()
+
+    def redimensionar(self, max_resultados):
+        """Altera o tamanho do buffer, mantendo os resultados mais recentes."""
+        with self._lock:
+            self._resultados = deque(self._resultados, maxlen=max_resultados)
+
+    def guardar(self, resultado):
+        """Adiciona um resultado, descartando o mais antigo se o buffer estiver cheio."""
+        with self._lock:
+            self._resultados.append(resultado)
+
+    def listar(self):
+        """Retorna os metadados dos resultados guardados, do mais recente ao mais antigo."""
+        with self._lock:
+            resultados = list(self._resultados)
+
+        return [
+            {
+                campo: valor
+                for campo, valor in resultado.items()
+                if campo not in ("resumo", "estatisticas")
+            }
+            for resultado in reversed(resultados)
+        ]
+
+    def obter(self, perfil_id):
+        """Retorna o resultado completo pelo ID, ou None."""
+        with self._lock:
+            for resultado in self._resultados:
+                if resultado["id"] == perfil_id:
+                    return resultado
+        return None
+
+
+armazem_perfis = ArmazemPerfis()
+
+# Apenas uma requisição é perfilada por vez em cada processo
+_profiler_lock = threading.Lock()
+
+
+def iniciar_profiling(app):
+    """
+    Registra os hooks de profiling sob demanda (apenas se `PROFILING_ATIVO`).
+
+    Uma requisição é perfilada com cProfile quando traz o cabeçalho `X-Profile`
+    assinado com `PROFILING_SEGREDO` ou quando é sorteada pela taxa
+    `PROFILING_TAXA_AMOSTRAGEM`. Sem o modo ativo, nenhum hook é registrado.
+
+    Args:
+        app (Flask): Aplicação Flask.
+
+    Returns:
+        None
+    """
+    config = app.config
+    segredo = config["PROFILING_SEGREDO"]
+    taxa = config["PROFILING_TAXA_AMOSTRAGEM"]
+    armazem_perfis.redimensionar(config["PROFILING_MAX_RESULTADOS"])
+
+    @app.before_request
+    def iniciar_profiler():
+        assinado = _cabecalho_valido(
+            request.headers.get(CABECALHO_PROFILING), segredo, request.path
+        )
+        if not assinado and (taxa <= 0 or random.random() >= taxa):
+            return
+
+        # Se outra requisição já está sendo perfilada, esta segue sem profiling
+        if not _profiler_lock.acquire(blocking=False):
+            return
+
+        g.profiler = cProfile.Profile()
+        g.profiler_inicio = time.perf_counter()
+        g.profiler_origem = "cabecalho" if assinado else "amostragem"
+        g.profiler.enable()
+
+    @app.after_request
+    def finalizar_profiler(response):
+        profiler = g.get("profiler")
+        if profiler is None:
+            return response
+
+        profiler.disable()
+        duracao = time.perf_counter() - g.profiler_inicio
+
+        resultado = _montar_resultado(profiler, duracao, response.status_code)
+        armazem_perfis.guardar(resultado)
+        response.headers["X-Profile-Id"] = resultado["id"]
+        return response
+
+    @app.teardown_request
+    def liberar_profiler(exc):
+        profiler = g.pop("profiler", None)
+        if profiler is not None:
+            # Garante que o profiler pare mesmo se a requisição terminou em exceção
+            profiler.disable()
+            _profiler_lock.release()
+
+
+def _montar_resultado(profiler, duracao, status):
+    saida = io.StringIO()
+    estatisticas = pstats.Stats(profiler, stream=saida)
+    estatisticas.sort_stats("cumulative").print_stats(40)
+
+    return {
+        "id": uuid.uuid4().hex,
+        "endpoint": request.endpoint,
+        "metodo": request.method,
+        "caminho": request.path,
+        "status": status,
+        "origem": g.profiler_origem,
+        "duracao_ms": round(duracao * 1000, 2),
+        "criado_em": datetime.now(timezone.utc).isoformat(),
+        "resumo": saida.getvalue(),
+        # Mesmo formato de `pstats.Stats.dump_stats` (abre no snakeviz, pstats etc.)
+        "estatisticas": marshal.dumps(estatisticas.stats),
+    }
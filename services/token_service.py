@@ -0,0 +1,297 @@
+from database.database import get_cursor
+from utils.token import gerar_token_jwt, gerar_refresh_token
+from flask import current_app
+import threading
+import time
+import uuid
+
+# Cache em memória da época de sessão por fotógrafo: {fotografo_id: (época, obtida_em)}
+_cache_epocas = {}
+_cache_epocas_lock = threading.Lock()
+
+
+def revogar_token(jti, fotografo_id, expira_em, motivo="logout"):
+    """
+    Adiciona um token JWT à lista negra (denylist) até o momento da sua expiração.
+
+    Depois que o token expira o Flask-JWT-Extended já o rejeita sozinho, então a
+    linha só precisa existir até `expira_em`. Aproveita a mesma transação para
+    remover as linhas que já passaram da validade, mantendo a tabela pequena.
+
+    Args:
+        jti (str): Identificador único do token (claim `jti`).
+        fotografo_id (int): ID do fotógrafo dono do token.
+        expira_em (int): Claim `exp` do token (timestamp Unix em segundos).
+        motivo (str): Motivo da revogação (padrão: 'logout').
+
+    Returns:
+        None: A função não retorna valor, mas insere o registro em `tokens_denylist`.
+
+    Raises:
+        psycopg.DatabaseError: Se ocorrer erro ao gravar no banco.
+    """
+    with get_cursor() as cur:
+        cur.execute(
+            """
+            INSERT INTO tokens_denylist (token_jti, fotografo_id, motivo, expira_em)
+            VALUES (%s, %s, %s, to_timestamp(%s))
+            ON CONFLICT (token_jti) DO NOTHING
+            """,
+            (jti, fotografo_id, motivo, expira_em),
+        )
+        cur.execute("DELETE FROM tokens_denylist WHERE expira_em < CURRENT_TIMESTAMP")
+        cur.connection.commit()
+
+
+def limpar_denylist_expirada():
+    """
+    Remove da denylist os tokens que já expiraram.
+
+    Pode ser chamada periodicamente (ex: cron) além da limpeza feita a cada logout.
+
+    Returns:
+        int: Quantidade de linhas removidas.
+    """
+    with get_cursor() as cur:
+        cur.execute("DELETE FROM tokens_denylist WHERE expira_em < CURRENT_TIMESTAMP")
+        removidos = cur.rowcount
+        cur.connection.commit()
+
+    return removidos
+
+
+def token_revogado(jti):
+    """
+    Verifica se um token está na denylist.
+
+    A consulta usa o índice UNIQUE de `token_jti` sobre uma tabela que contém
+    apenas tokens ainda não expirados.
+
+    Args:
+        jti (str): Identificador único do token (claim `jti`).
+
+    Returns:
+        bool: True se o token foi revogado, False caso contrário.
+    """
+    with get_cursor() as cur:
+        cur.execute("SELECT 1 FROM tokens_denylist WHERE token_jti = %s", (jti,))
+        return cur.fetchone() is not None
+
+
+def obter_epoca_token(fotografo_id):
+    """
+    Retorna a época de sessão atual do fotógrafo, usando cache em memória.
+
+    O valor é relido do banco no máximo uma vez a cada `JWT_EPOCA_CACHE_SEGUNDOS`
+    por processo. Incrementos feitos no próprio processo atualizam o cache na hora;
+    os demais processos passam a enxergá-los quando o cache expira.
+
+    Args:
+        fotografo_id (int): ID do fotógrafo.
+
+    Returns:
+        int | None: Época atual, ou None se o fotógrafo não existir.
+    """
+    ttl = current_app.config.get("JWT_EPOCA_CACHE_SEGUNDOS", 30)
+    agora = time.monotonic()
+
+    with _cache_epocas_lock:
+        em_cache = _cache_epocas.get(fotografo_id)
+
+    if em_cache is not None and agora - em_cache[1] < ttl:
+        return em_cache[0]
+
+    with get_cursor() as cur:
+        cur.execute("SELECT token_epoch FROM fotografo WHERE id = %s", (fotografo_id,))
+        resultado = cur.fetchone()
+
+    if resultado is None:
+        return None
+
+    registrar_epoca_token(fotografo_id, resultado["token_epoch"])
+    return resultado["token_epoch"]
+
+
+def registrar_epoca_token(fotografo_id, epoca):
+    """
+    Atualiza a época de sessão do fotógrafo no cache do processo.
+
+    Args:
+        fotografo_id (int): ID do fotógrafo.
+        epoca (int): Época atual lida ou gravada no banco.
+
+    Returns:
+        None
+    """
+    with _cache_epocas_lock:
+        _cache_epocas[fotografo_id] = (epoca, time.monotonic())
+
+
+def incrementar_epoca_token(fotografo_id):
+    """
+    Incrementa a época de sessão do fotógrafo, invalidando todos os tokens emitidos.
+
+    Usado no "sair de todos os dispositivos" e, no modo de revogação por época,
+    também no logout comum.
+
+    Args:
+        fotografo_id (int): ID do fotógrafo.
+
+    Returns:
+        int: Nova época do fotógrafo.
+
+    Raises:
+        psycopg.DatabaseError: Se ocorrer erro ao gravar no banco.
+    """
+    with get_cursor() as cur:
+        cur.execute(
+            """
+            UPDATE fotografo SET token_epoch = token_epoch + 1
+            WHERE id = %s
+            RETURNING token_epoch
+            """,
+            (fotografo_id,),
+        )
+        epoca = cur.fetchone()["token_epoch"]
+        cur.connection.commit()
+
+    registrar_epoca_token(fotografo_id, epoca)
+    return epoca
+
+
+def token_epoca_revogada(jwt_payload):
+    """
+    Verifica se o token foi emitido numa época de sessão anterior à atual.
+
+    Tokens emitidos antes da existência da claim `token_epoch` são tratados
+    como época 0.
+
+    Args:
+        jwt_payload (dict): Conteúdo decodificado do token.
+
+    Returns:
+        bool: True se a época do token estiver desatualizada, False caso contrário.
+    """
+    epoca_atual = obter_epoca_token(int(jwt_payload["fotografo_id"]))
+
+    if epoca_atual is None:
+        return True
+
+    return jwt_payload.get("token_epoch", 0) < epoca_atual
+
+
+def emitir_sessao(fotografo_id, token_epoch, familia=None, cur=None):
+    """
+    Emite um par token de acesso + refresh token e registra o refresh token no banco.
+
+    Sem `familia`, uma nova família é criada (novo login). Na renovação, a família
+    do refresh token anterior é reaproveitada.
+
+    Args:
+        fotografo_id (int): ID do fotógrafo autenticado.
+        token_epoch (int): Época de sessão atual do fotógrafo.
+        familia (str | None): Família de refresh tokens (None cria uma nova).
+        cur (psycopg.Cursor | None): Cursor de uma transação em andamento. Sem ele,
+            a função abre um cursor próprio e faz o commit.
+
+    Returns:
+        dict: {'token': '...', 'refresh_token': '...'}
+    """
+    familia = familia or str(uuid.uuid4())
+
+    token = gerar_token_jwt(fotografo_id, token_epoch, familia)
+    refresh_token, jti, validade = gerar_refresh_token(
+        fotografo_id, token_epoch, familia
+    )
+
+    sql = """
+        INSERT INTO tokens_refresh (jti, familia, fotografo_id, expira_em)
+        VALUES (%s, %s, %s, CURRENT_TIMESTAMP + %s)
+    """
+    parametros = (jti, familia, fotografo_id, validade)
+
+    if cur is not None:
+        cur.execute(sql, parametros)
+    else:
+        with get_cursor() as cur:
+            cur.execute(sql, parametros)
+            cur.connection.commit()
+
+    return {"token": token, "refresh_token": refresh_token}
+
+
+def rotacionar_refresh_token(jwt_payload):
+    """
+    Troca um refresh token válido por um novo par de tokens da mesma família.
+
+    O refresh token é marcado como usado numa única instrução UPDATE. Se ele já
+    tiver sido usado (ou revogado), trata-se de reuso: a família inteira é
+    revogada e o usuário precisa fazer login novamente.
+
+    Args:
+        jwt_payload (dict): Conteúdo decodificado do refresh token.
+
+    Returns:
+        dict: Novo par de tokens ou mensagem de erro.
+            Exemplos:
+                {'token': '...', 'refresh_token': '...'}
+                {'erro': 'Sessão inválida...', 'codigo': 401, 'reuso': True}
+    """
+    jti = jwt_payload["jti"]
+    familia = jwt_payload["familia"]
+
+    with get_cursor() as cur:
+        cur.execute(
+            """
+            UPDATE tokens_refresh SET usado = TRUE
+            WHERE jti = %s AND usado = FALSE AND revogado = FALSE
+            RETURNING fotografo_id
+            """,
+            (jti,),
+        )
+        resultado = cur.fetchone()
+
+        if resultado is None:
+            cur.execute(
+                "UPDATE tokens_refresh SET revogado = TRUE WHERE familia = %s",
+                (familia,),
+            )
+            cur.connection.commit()
+            return {
+                "erro": "Sessão inválida. Faça login novamente.",
+                "codigo": 401,
+                "reuso": True,
+            }
+
+        sessao = emitir_sessao(
+            resultado["fotografo_id"],
+            jwt_payload.get("token_epoch", 0),
+            familia,
+            cur,
+        )
+        cur.execute("DELETE FROM tokens_refresh WHERE expira_em < CURRENT_TIMESTAMP")
+        cur.connection.commit()
+
+    return sessao
+
+
+def revogar_familia_refresh(familia):
+    """
+    Revoga todos os refresh tokens de uma família (usado no logout).
+
+    Args:
+        familia (str | None): Família de refresh tokens da sessão. Tokens emitidos
+            antes da existência da claim `familia` não têm família e são ignorados.
+
+    Returns:
+        None
+    """
+    if not familia:
+        return
+
+    with get_cursor() as cur:
+        cur.execute(
+            "UPDATE tokens_refresh SET revogado = TRUE WHERE familia = %s",
+            (familia,),
+        )
+        cur.connection.commit()
@@ -0,0 +1,367 @@
+from flask import g, request
+from contextlib import contextmanager
+from contextvars import ContextVar
+import atexit
+import json
+import os
+import queue
+import re
+import threading
+import time
+import urllib.request
+
+# Rastro (trace) da requisição atual e span aberto no momento
+_rastro_atual = ContextVar("rastro_atual", default=None)
+_span_atual = ContextVar("span_atual", default=None)
+
+# Cabeçalho W3C Trace Context: "00-<trace_id>-<span_id>-<flags>"
+_padrao_traceparent = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+
+class Span:
+    """
+    Trecho cronometrado de uma requisição (a própria requisição, uma consulta,
+    uma chamada ao Cloudinary, um envio de e-mail...).
+    """
+
+    __slots__ = (
+        "nome",
+        "trace_id",
+        "span_id",
+        "pai_id",
+        "tipo",
+        "atributos",
+        "inicio_ns",
+        "fim_ns",
+        "erro",
+    )
+
+    def __init__(self, nome, trace_id, pai_id=None, tipo="interno", atributos=None):
+        self.nome = nome
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.pai_id = pai_id
+        self.tipo = tipo
+        self.atributos = atributos or {}
+        self.inicio_ns = time.time_ns()
+        self.fim_ns = None
+        self.erro = None
+
+    def finalizar(self, erro=None):
+        """Marca o fim do span (e o erro, se houver)."""
+        self.fim_ns = time.time_ns()
+        if erro is not None:
+            self.erro = f"{type(erro).__name__}: {erro}"
+
+    @property
+    def duracao_ms(self):
+        """Duração do span em milissegundos (0 se ainda aberto)."""
+        if self.fim_ns is None:
+            return 0.0
+        return (self.fim_ns - self.inicio_ns) / 1_000_000
+
+    def como_dict(self):
+        """Representação do span usada pelo exportador JSON-lines."""
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "pai_id": self.pai_id,
+            "nome": self.nome,
+            "tipo": self.tipo,
+            "inicio_ns": self.inicio_ns,
+            "fim_ns": self.fim_ns,
+            "duracao_ms": round(self.duracao_ms, 3),
+            "atributos": self.atributos,
+            "erro": self.erro,
+        }
+
+
+class ExportadorJSONL:
+    """Grava cada span como uma linha JSON em um arquivo local."""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._lock = threading.Lock()
+
+    def exportar(self, spans):
+        """
+        Acrescenta os spans ao arquivo.
+
+        Args:
+            spans (list): Spans finalizados de uma requisição.
+
+        Returns:
+            None
+        """
+        linhas = "".join(
+            json.dumps(span.como_dict(), ensure_ascii=False) + "\n" for span in spans
+        )
+        with self._lock:
+            with open(self.caminho, "a", encoding="utf-8") as arquivo:
+                arquivo.write(linhas)
+
+
+class ExportadorOTLP:
+    """
+    Envia os spans a um coletor OpenTelemetry via OTLP/HTTP com corpo JSON
+    (`POST <endpoint>/v1/traces`).
+
+    Os spans são acumulados em uma fila e enviados em lote por uma thread em
+    segundo plano, para que a requisição não espere pelo coletor.
+    """
+
+    def __init__(self, endpoint, nome_servico, intervalo=5, tamanho_lote=512):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.nome_servico = nome_servico
+        self.intervalo = intervalo
+        self.tamanho_lote = tamanho_lote
+        self._fila = queue.Queue(maxsize=tamanho_lote * 20)
+        self._thread = threading.Thread(
+            target=self._enviar_continuamente, name="exportador-otlp", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self._enviar_pendentes)
+
+    def exportar(self, spans):
+        """Enfileira os spans para envio (descarta-os se a fila estiver cheia)."""
+        for span in spans:
+            try:
+                self._fila.put_nowait(span)
+            except queue.Full:
+                return
+
+    def _enviar_continuamente(self):
+        while True:
+            time.sleep(self.intervalo)
+            self._enviar_pendentes()
+
+    def _enviar_pendentes(self):
+        while True:
+            lote = []
+            while len(lote) < self.tamanho_lote:
+                try:
+                    lote.append(self._fila.get_nowait())
+                except queue.Empty:
+                    break
+
+            if not lote:
+                return
+
+            try:
+                corpo = json.dumps(self._montar_payload(lote)).encode("utf-8")
+                requisicao = urllib.request.Request(
+                    self.url,
+                    data=corpo,
+                    headers={"Content-Type": "application/json"},
+                    method="POST",
+                )
+                with urllib.request.urlopen(requisicao, timeout=5):
+                    pass
+            except Exception as e:
+                print(f"Erro ao exportar spans (OTLP): {e}")
+                return
+
+    def _montar_payload(self, spans):
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            _atributo_otlp("service.name", self.nome_servico)
+                        ]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "portfolio-fotografo"},
+                            "spans": [_span_otlp(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+
+def _atributo_otlp(chave, valor):
+    if isinstance(valor, bool):
+        return {"key": chave, "value": {"boolValue": valor}}
+    if isinstance(valor, int):
+        return {"key": chave, "value": {"intValue": str(valor)}}
+    if isinstance(valor, float):
+        return {"key": chave, "value": {"doubleValue": valor}}
+    return {"key": chave, "value": {"stringValue": str(valor)}}
+
+
+def _span_otlp(span):
+    # SpanKind do OTLP: 1 = interno, 2 = servidor, 3 = cliente
+    tipos = {"interno": 1, "servidor": 2, "cliente": 3}
+    dados = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.nome,
+        "kind": tipos.get(span.tipo, 1),
+        "startTimeUnixNano": str(span.inicio_ns),
+        "endTimeUnixNano": str(span.fim_ns),
+        "attributes": [_atributo_otlp(k, v) for k, v in span.atributos.items()],
+        "status": ({"code": 2, "message": span.erro} if span.erro else {"code": 1}),
+    }
+    if span.pai_id:
+        dados["parentSpanId"] = span.pai_id
+    return dados
+
+
+@contextmanager
+def abrir_span(nome, tipo="interno", **atributos):
+    """
+    Abre um span filho do span atual da requisição.
+
+    Fora de uma requisição rastreada (ex: threads em segundo plano ou com o
+    tracing desativado), não faz nada.
+
+    Args:
+        nome (str): Nome do span (ex: 'postgres SELECT').
+        tipo (str): 'interno', 'servidor' ou 'cliente' (chamada a serviço externo).
+        **atributos: Atributos do span (ex: servico='cloudinary').
+
+    Yields:
+        Span | None: O span aberto, ou None se não há rastro ativo.
+    """
+    spans = _rastro_atual.get()
+    if spans is None:
+        yield None
+        return
+
+    pai = _span_atual.get()
+    span = Span(nome, pai.trace_id, pai.span_id, tipo, atributos)
+    token = _span_atual.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.finalizar(e)
+        raise
+    else:
+        span.finalizar()
+    finally:
+        _span_atual.reset(token)
+        spans.append(span)
+
+
+def gerar_server_timing(spans, raiz):
+    """
+    Resume os spans de uma requisição no formato do cabeçalho `Server-Timing`.
+
+    Os spans filhos são somados por serviço (atributo `servico`), por exemplo:
+    `postgres;dur=4.2;desc="3 chamadas", cloudinary;dur=180.5;desc="1 chamada", total;dur=190.1`.
+
+    Args:
+        spans (list): Spans filhos finalizados.
+        raiz (Span): Span da requisição.
+
+    Returns:
+        str: Valor do cabeçalho.
+    """
+    por_servico = {}
+    for span in spans:
+        servico = span.atributos.get("servico")
+        if servico is None:
+            continue
+        duracao, quantidade = por_servico.get(servico, (0.0, 0))
+        por_servico[servico] = (duracao + span.duracao_ms, quantidade + 1)
+
+    partes = [
+        f'{servico};dur={duracao:.1f};desc="{quantidade} chamada{"s" if quantidade > 1 else ""}"'
+        for servico, (duracao, quantidade) in por_servico.items()
+    ]
+    partes.append(f"total;dur={raiz.duracao_ms:.1f}")
+    return ", ".join(partes)
+
+
+def criar_exportador(config):
+    """
+    Cria o exportador configurado em `TRACING_EXPORTADOR`.
+
+    Args:
+        config (dict): Configuração da aplicação.
+
+    Returns:
+        ExportadorJSONL | ExportadorOTLP | None: None quando nenhum exportador está configurado.
+    """
+    exportador = config["TRACING_EXPORTADOR"]
+
+    if exportador == "jsonl":
+        return ExportadorJSONL(config["TRACING_ARQUIVO"])
+    if exportador == "otlp":
+        return ExportadorOTLP(
+            config["TRACING_OTLP_ENDPOINT"], config["TRACING_NOME_SERVICO"]
+        )
+    return None
+
+
+def iniciar_tracing(app):
+    """
+    Registra os hooks que abrem um rastro (span raiz) por requisição.
+
+    Os spans filhos são abertos por `abrir_span` (usado por `medir_upstream`,
+    ou seja, pelas consultas, pelo Cloudinary e pelo SMTP). Ao final da requisição,
+    os spans vão para o exportador e o cabeçalho `Server-Timing` é adicionado.
+    Um cabeçalho `traceparent` recebido continua o rastro do cliente.
+
+    Args:
+        app (Flask): Aplicação Flask.
+
+    Returns:
+        None
+    """
+    exportador = criar_exportador(app.config)
+    server_timing = app.config["TRACING_SERVER_TIMING"]
+
+    @app.before_request
+    def abrir_rastro():
+        trace_id, pai_id = os.urandom(16).hex(), None
+
+        traceparent = _padrao_traceparent.match(request.headers.get("traceparent", ""))
+        if traceparent:
+            trace_id, pai_id = traceparent.groups()
+
+        raiz = Span(
+            f"{request.method} {request.endpoint or request.path}",
+            trace_id,
+            pai_id,
+            "servidor",
+            {"http.method": request.method, "http.target": request.path},
+        )
+        g.span_raiz = raiz
+        g.tokens_tracing = (_rastro_atual.set([]), _span_atual.set(raiz))
+
+    @app.after_request
+    def fechar_rastro(response):
+        raiz = g.pop("span_raiz", None)
+        if raiz is None:
+            return response
+
+        raiz.atributos["http.status_code"] = response.status_code
+        raiz.finalizar()
+        spans = _rastro_atual.get() or []
+
+        if server_timing:
+            response.headers["Server-Timing"] = gerar_server_timing(spans, raiz)
+
+        if exportador is not None:
+            try:
+                exportador.exportar(spans + [raiz])
+            except Exception as e:
+                print(f"Erro ao exportar spans: {e}")
+
+        return response
+
+    @app.teardown_request
+    def limpar_rastro(exc):
+        # Threads são reaproveitadas entre requisições: o rastro não pode vazar
+        tokens = g.pop("tokens_tracing", None)
+        if tokens is not None:
+            try:
+                _rastro_atual.reset(tokens[0])
+                _span_atual.reset(tokens[1])
+            except ValueError:
+                # Teardown em outro contexto (ex: fim de uma resposta em stream)
+                _rastro_atual.set(None)
+                _span_atual.set(None)
@@ -0,0 +1,264 @@
+from database.database import criar_conexao
+from services.metricas import registro
+from datetime import datetime, timezone
+import atexit
+import psycopg
+import re
+import threading
+
+# public_id do Cloudinary: segmentos de letras, números, "_", "-" e "." separados
+# por "/" (sem espaços, caracteres de controle, barras nas pontas nem "." e "..")
+_PADRAO_FOTO = re.compile(
+    r"[A-Za-z0-9_][A-Za-z0-9_.\-]*(?:/[A-Za-z0-9_][A-Za-z0-9_.\-]*)*"
+)
+
+# Tamanho de visualizacoes_fotos.foto_id
+_TAMANHO_MAXIMO_FOTO = 255
+
+# Recusas do banco que se repetiriam em qualquer nova tentativa
+_ERROS_PERMANENTES = (psycopg.DataError, psycopg.IntegrityError)
+
+
+class ContadorVisualizacoes:
+    """
+    Acumula em memória as visualizações de fotos e as grava no banco em lote.
+
+    Cada visualização é apenas um incremento em um dicionário; a thread de
+    gravação troca o dicionário por um vazio e envia tudo em um único
+    `INSERT ... ON CONFLICT DO UPDATE` (via `unnest`), qualquer que seja o
+    número de visualizações no intervalo.
+
+    A memória é limitada a `max_fotos` fotos distintas pendentes: ao atingir
+    o limite, a gravação é antecipada e as visualizações de fotos novas são
+    descartadas (e contadas) até o dicionário ser esvaziado.
+
+    Só entram IDs no formato de public_id do Cloudinary e, se `prefixos` for
+    informado, dentro de uma das pastas da galeria (`foto_valida`).
+    """
+
+    def __init__(self, max_fotos=10_000, intervalo=10, prefixos=()):
+        self.max_fotos = max_fotos
+        self.intervalo = intervalo
+        self.prefixos = tuple(prefixos)
+        self._pendentes = {}
+        self._descartadas = 0
+        self._lock = threading.Lock()
+        self._gravacao_lock = threading.Lock()
+        self._acordar = threading.Event()
+        self._conexao = None
+        self._thread = None
+
+    def foto_valida(self, foto):
+        """
+        Verifica se `foto` é um public_id aceito para contagem.
+
+        Args:
+            foto (str): ID recebido do site.
+
+        Returns:
+            bool: True se o ID tem o formato de public_id do Cloudinary, cabe em
+                  `visualizacoes_fotos.foto_id` e está em uma das pastas de `prefixos`
+                  (quando configuradas).
+        """
+        return (
+            isinstance(foto, str)
+            and len(foto) <= _TAMANHO_MAXIMO_FOTO
+            and _PADRAO_FOTO.fullmatch(foto) is not None
+            and (not self.prefixos or foto.startswith(self.prefixos))
+        )
+
+    def registrar(self, fotos):
+        """
+        Soma uma visualização a cada foto.
+
+        Args:
+            fotos (list): IDs (public_id do Cloudinary) das fotos vistas.
+
+        Returns:
+            int: Quantidade de visualizações aceitas.
+        """
+        aceitas = 0
+        with self._lock:
+            for foto in fotos:
+                if foto in self._pendentes:
+                    self._pendentes[foto] += 1
+                elif len(self._pendentes) < self.max_fotos:
+                    self._pendentes[foto] = 1
+                else:
+                    self._descartadas += 1
+                    continue
+                aceitas += 1
+
+            cheio = len(self._pendentes) >= self.max_fotos
+
+        if cheio:
+            self._acordar.set()
+        return aceitas
+
+    def pendentes(self):
+        """Quantidade de fotos com visualizações ainda não gravadas."""
+        with self._lock:
+            return len(self._pendentes)
+
+    def descartadas(self):
+        """Visualizações descartadas (falta de espaço ou ID recusado) desde o início do processo."""
+        with self._lock:
+            return self._descartadas
+
+    def gravar(self):
+        """
+        Grava no banco as visualizações acumuladas, em uma única instrução.
+
+        Se a gravação falhar, as contagens voltam ao dicionário (respeitando
+        `max_fotos`) para a próxima tentativa. Se o banco recusar o lote de forma
+        permanente (ex: ID inválido), as fotos são gravadas uma a uma e as
+        recusadas são descartadas (e contadas), em vez de voltarem ao dicionário.
+
+        Returns:
+            int: Quantidade de fotos gravadas.
+        """
+        with self._gravacao_lock:
+            with self._lock:
+                lote, self._pendentes = self._pendentes, {}
+
+            if not lote:
+                return 0
+
+            # Ordem fixa das chaves: dois workers gravando ao mesmo tempo
+            # travam as linhas na mesma ordem (sem deadlock)
+            fotos = sorted(lote)
+            agora = datetime.now(timezone.utc).replace(tzinfo=None)
+
+            try:
+                if self._conexao is None or self._conexao.closed:
+                    self._conexao = criar_conexao()
+
+                with self._conexao.cursor() as cur:
+                    try:
+                        cur.execute(
+                            _UPSERT_VISUALIZACOES,
+                            (agora, fotos, [lote[foto] for foto in fotos]),
+                        )
+                    except _ERROS_PERMANENTES as e:
+                        self._conexao.rollback()
+                        print(
+                            f"Lote de visualizações recusado ({e}); gravando uma a uma"
+                        )
+                        fotos = self._gravar_individualmente(cur, lote, fotos, agora)
+                self._conexao.commit()
+
+            except Exception:
+                if self._conexao is not None:
+                    self._conexao.close()
+                self._devolver(lote)
+                raise
+
+            return len(fotos)
+
+    def _gravar_individualmente(self, cur, lote, fotos, agora):
+        # Cada foto em sua própria transação: uma recusada não desfaz as demais.
+        # As gravadas saem do lote, para não voltarem ao dicionário se algo falhar depois
+        gravadas = []
+        for foto in fotos:
+            quantidade = lote.pop(foto)
+            try:
+                with self._conexao.transaction():
+                    cur.execute(_UPSERT_VISUALIZACOES, (agora, [foto], [quantidade]))
+            except _ERROS_PERMANENTES as e:
+                with self._lock:
+                    self._descartadas += quantidade
+                print(f"Visualizações da foto {foto!r} descartadas: {e}")
+                continue
+            except Exception:
+                lote[foto] = quantidade
+                raise
+            gravadas.append(foto)
+        return gravadas
+
+    def _devolver(self, lote):
+        with self._lock:
+            for foto, quantidade in lote.items():
+                if foto in self._pendentes:
+                    self._pendentes[foto] += quantidade
+                elif len(self._pendentes) < self.max_fotos:
+                    self._pendentes[foto] = quantidade
+                else:
+                    self._descartadas += quantidade
+
+    def iniciar(self):
+        """Inicia a thread de gravação periódica e a gravação final na saída do processo."""
+        if self._thread is not None:
+            return
+
+        self._thread = threading.Thread(
+            target=self._executar, name="contador-visualizacoes", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self._gravar_na_saida)
+
+    def _executar(self):
+        while True:
+            self._acordar.wait(self.intervalo)
+            self._acordar.clear()
+            try:
+                self.gravar()
+            except Exception as e:
+                print(f"Erro ao gravar visualizações de fotos: {e}")
+
+    def _gravar_na_saida(self):
+        try:
+            self.gravar()
+        except Exception as e:
+            print(f"Erro ao gravar visualizações de fotos na saída: {e}")
+
+
+_UPSERT_VISUALIZACOES = """
+    INSERT INTO visualizacoes_fotos (foto_id, visualizacoes, ultima_visualizacao)
+    SELECT foto_id, visualizacoes, %s
+    FROM unnest(%s::varchar[], %s::bigint[]) AS v(foto_id, visualizacoes)
+    ON CONFLICT (foto_id) DO UPDATE
+    SET visualizacoes = visualizacoes_fotos.visualizacoes + EXCLUDED.visualizacoes,
+        ultima_visualizacao = EXCLUDED.ultima_visualizacao
+"""
+
+contador_visualizacoes = ContadorVisualizacoes()
+
+
+def iniciar_contador_visualizacoes(app):
+    """
+    Ajusta o contador de visualizações com o `Config` e inicia a gravação periódica.
+
+    Args:
+        app (Flask): Aplicação Flask.
+
+    Returns:
+        None
+    """
+    contador_visualizacoes.max_fotos = app.config["VISUALIZACOES_MAX_FOTOS"]
+    contador_visualizacoes.intervalo = app.config["VISUALIZACOES_INTERVALO_SEGUNDOS"]
+    contador_visualizacoes.prefixos = tuple(
+        prefixo.strip()
+        for prefixo in app.config["VISUALIZACOES_PREFIXOS"].split(",")
+        if prefixo.strip()
+    )
+    contador_visualizacoes.iniciar()
+
+
+@registro.registrar_coletor
+def _coletar_visualizacoes_pendentes():
+    return (
+        "fotos_visualizacoes_pendentes",
+        "gauge",
+        "Fotos com visualizações acumuladas em memória, ainda não gravadas.",
+        [({}, contador_visualizacoes.pendentes())],
+    )
+
+
+@registro.registrar_coletor
+def _coletar_visualizacoes_descartadas():
+    return (
+        "fotos_visualizacoes_descartadas_total",
+        "counter",
+        "Visualizações descartadas (limite de fotos pendentes atingido ou ID recusado pelo banco).",
+        [({}, contador_visualizacoes.descartadas())],
+    )
@@ -0,0 +1,257 @@
+"""
+test_ponte_asgi.py – Testes da ponte ASGI (utils/ponte_asgi.py)
+
+Usam uma aplicação Flask mínima, sem banco nem Cloudinary: os módulos do pool
+assíncrono e do cliente HTTP são substituídos antes da importação da ponte.
+
+Uso (na raiz do projeto):
+    python -m unittest discover -s tests
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import types
+import unittest
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, RAIZ)
+
+
+async def _nada(*args, **kwargs):
+    return None
+
+
+# A ponte abre o pool do banco e o cliente HTTP no startup; aqui não há nenhum dos dois
+sys.modules["database.database_async"] = types.SimpleNamespace(
+    abrir_pool=_nada, fechar_pool=_nada
+)
+sys.modules["services.cloudinary_async"] = types.SimpleNamespace(
+    abrir_cliente_http=lambda config: None, fechar_cliente_http=_nada
+)
+
+from flask import (
+    Flask,
+    Response,
+    g,
+    jsonify,
+    request,
+    stream_with_context,
+)  # noqa: E402
+from utils.ponte_asgi import AplicacaoASGI  # noqa: E402
+
+
+def criar_aplicacao():
+    app = Flask(__name__)
+    app.config["ASGI_THREADS_WSGI"] = 4
+    app.config["MAX_CONTENT_LENGTH"] = 100
+    app.encerradas = []
+    trava = threading.Lock()
+
+    @app.route("/stream/<int:numero>")
+    def stream(numero):
+        def gerar():
+            for parte in range(5):
+                time.sleep(0.01)
+                # request só existe aqui se o contexto de stream_with_context está ativo
+                yield f"{request.path}:{parte}\n"
+
+        return Response(stream_with_context(gerar()), mimetype="text/plain")
+
+    @app.route("/infinito")
+    def infinito():
+        def gerar():
+            while True:
+                time.sleep(0.01)
+                yield f"{request.path}\n"
+
+        return Response(stream_with_context(gerar()), mimetype="text/event-stream")
+
+    @app.route("/assincrona", methods=["GET", "POST"])
+    def assincrona():
+        return jsonify(caminho="wsgi")
+
+    @app.route("/eco", methods=["POST"])
+    def eco():
+        return jsonify(tamanho=len(request.get_data()))
+
+    @app.teardown_request
+    def encerrar(erro):
+        with trava:
+            app.encerradas.append(request.path)
+            app.teardown_assincrono = g.get("rota_assincrona", False)
+
+    return app
+
+
+async def assincrona_async():
+    return jsonify(caminho="assincrona", tamanho=len(request.get_data()))
+
+
+ROTAS_ASSINCRONAS = {"assincrona": assincrona_async}
+
+
+async def requisitar(
+    aplicacao, caminho, partes_ate_desconectar=None, corpo=None, cabecalhos=()
+):
+    """
+    Executa uma requisição na aplicação ASGI e devolve (status, corpo).
+
+    Com `partes_ate_desconectar`, o cliente desconecta depois de receber essa
+    quantidade de partes do corpo (como um navegador fechando o feed SSE).
+    Com `corpo` (lista de partes), a requisição é um POST com o corpo enviado
+    em pedaços; `partes_lidas` conta quantos foram pedidos pela ponte.
+    """
+    mensagens = []
+    concluida = asyncio.Event()
+    partes = list(corpo or [b""])
+    requisitar.partes_lidas = 0
+
+    async def receive():
+        if requisitar.partes_lidas < len(partes):
+            requisitar.partes_lidas += 1
+            return {
+                "type": "http.request",
+                "body": partes[requisitar.partes_lidas - 1],
+                "more_body": requisitar.partes_lidas < len(partes),
+            }
+        await concluida.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(mensagem):
+        mensagens.append(mensagem)
+        if mensagem["type"] == "http.response.body" and not mensagem.get("more_body"):
+            concluida.set()
+        enviadas = sum(m["type"] == "http.response.body" for m in mensagens)
+        if partes_ate_desconectar is not None and enviadas >= partes_ate_desconectar:
+            concluida.set()
+
+    scope = {
+        "type": "http",
+        "method": "GET" if corpo is None else "POST",
+        "path": caminho,
+        "query_string": b"",
+        "headers": list(cabecalhos),
+        "server": ("teste", 80),
+        "client": ("127.0.0.1", 1234),
+    }
+    await aplicacao(scope, receive, send)
+
+    status = next(m["status"] for m in mensagens if m["type"] == "http.response.start")
+    corpo = b"".join(
+        m.get("body", b"") for m in mensagens if m["type"] == "http.response.body"
+    )
+    return status, corpo.decode()
+
+
+class TestStreamsConcorrentes(unittest.TestCase):
+    def test_streams_com_contexto_em_paralelo(self):
+        app = criar_aplicacao()
+        aplicacao = AplicacaoASGI(app, ROTAS_ASSINCRONAS)
+
+        async def executar():
+            return await asyncio.gather(
+                *(requisitar(aplicacao, f"/stream/{i}") for i in range(6))
+            )
+
+        resultados = asyncio.run(asyncio.wait_for(executar(), timeout=30))
+
+        for i, (status, corpo) in enumerate(resultados):
+            self.assertEqual(status, 200)
+            self.assertEqual(
+                corpo, "".join(f"/stream/{i}:{parte}\n" for parte in range(5))
+            )
+
+        # Cada requisição desempilhou seu contexto (teardown) exatamente uma vez
+        self.assertEqual(
+            sorted(app.encerradas), sorted(f"/stream/{i}" for i in range(6))
+        )
+
+    def test_desconexao_encerra_stream_infinito(self):
+        app = criar_aplicacao()
+        aplicacao = AplicacaoASGI(app, ROTAS_ASSINCRONAS)
+
+        status, corpo = asyncio.run(
+            asyncio.wait_for(
+                requisitar(aplicacao, "/infinito", partes_ate_desconectar=3),
+                timeout=30,
+            )
+        )
+        self.assertEqual(status, 200)
+        self.assertTrue(corpo.startswith("/infinito\n"))
+
+        # A thread fecha o gerador na parte seguinte, o que dispara o teardown
+        limite = time.monotonic() + 5
+        while not app.encerradas and time.monotonic() < limite:
+            time.sleep(0.01)
+        self.assertEqual(app.encerradas, ["/infinito"])
+
+
+class TestRotasAssincronas(unittest.TestCase):
+    def test_rota_assincrona_marca_teardown(self):
+        app = criar_aplicacao()
+        aplicacao = AplicacaoASGI(app, ROTAS_ASSINCRONAS)
+
+        status, corpo = asyncio.run(
+            asyncio.wait_for(requisitar(aplicacao, "/assincrona"), timeout=30)
+        )
+        self.assertEqual(status, 200)
+        self.assertIn("assincrona", corpo)
+        # O teardown de app.py usa essa marca para não tocar a conexão compartilhada
+        self.assertTrue(app.teardown_assincrono)
+
+    def test_rota_wsgi_nao_marca_teardown(self):
+        app = criar_aplicacao()
+        aplicacao = AplicacaoASGI(app, {})
+
+        status, corpo = asyncio.run(
+            asyncio.wait_for(requisitar(aplicacao, "/assincrona"), timeout=30)
+        )
+        self.assertEqual(status, 200)
+        self.assertIn("wsgi", corpo)
+        self.assertFalse(app.teardown_assincrono)
+
+
+class TestLimiteCorpo(unittest.TestCase):
+    def executar(self, rotas, caminho, corpo, cabecalhos=()):
+        aplicacao = AplicacaoASGI(criar_aplicacao(), rotas)
+        return asyncio.run(
+            asyncio.wait_for(
+                requisitar(aplicacao, caminho, corpo=corpo, cabecalhos=cabecalhos),
+                timeout=30,
+            )
+        )
+
+    def test_corpo_dentro_do_limite(self):
+        for rotas, caminho in ((ROTAS_ASSINCRONAS, "/assincrona"), ({}, "/eco")):
+            status, corpo = self.executar(rotas, caminho, [b"x" * 50, b"x" * 50])
+            self.assertEqual(status, 200)
+            self.assertIn('"tamanho":100', corpo.replace(" ", ""))
+
+    def test_corpo_sem_content_length_acima_do_limite(self):
+        # Sem Content-Length (chunked): a leitura para no pedaço que passa do limite
+        partes = [b"x" * 60] * 10
+        for rotas, caminho in ((ROTAS_ASSINCRONAS, "/assincrona"), ({}, "/eco")):
+            status, _ = self.executar(rotas, caminho, partes)
+            self.assertEqual(status, 413)
+            # Mais no máximo um pedaço lido pela vigia de desconexão
+            self.assertLessEqual(requisitar.partes_lidas, 3)
+
+    def test_content_length_acima_do_limite_nao_le_corpo(self):
+        cabecalhos = [(b"content-length", b"600")]
+        partes = [b"x" * 60] * 10
+        for rotas, caminho in ((ROTAS_ASSINCRONAS, "/assincrona"), ({}, "/eco")):
+            status, _ = self.executar(rotas, caminho, partes, cabecalhos)
+            self.assertEqual(status, 413)
+            self.assertLessEqual(requisitar.partes_lidas, 1)
+
+    def test_rota_inexistente_nao_le_corpo(self):
+        status, _ = self.executar({}, "/nao-existe", [b"x" * 60] * 10)
+        self.assertEqual(status, 404)
+        self.assertLessEqual(requisitar.partes_lidas, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
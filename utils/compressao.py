@@ -0,0 +1,184 @@
+from flask import request
+from collections import OrderedDict
+import hashlib
+import threading
+import zlib
+
+try:
+    import brotli
+except ImportError:  # brotli é opcional; sem ele, apenas gzip é oferecido
+    brotli = None
+
+# Tipos de conteúdo que valem a pena comprimir (imagens já chegam comprimidas do Cloudinary)
+TIPOS_COMPRIMIVEIS = {
+    "application/json",
+    "text/event-stream",
+    "text/csv",
+    "text/plain",
+    "text/html",
+}
+
+
+class CacheCompressao:
+    """
+    Cache LRU em memória de corpos já comprimidos, por codificação e hash do corpo.
+
+    Respostas idênticas (ex: a mesma página da galeria) são comprimidas uma única
+    vez; as próximas requisições só calculam o hash do corpo.
+    """
+
+    def __init__(self, max_entradas=256):
+        self.max_entradas = max_entradas
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obter(self, chave):
+        """Retorna o corpo comprimido da chave, ou None."""
+        with self._lock:
+            corpo = self._entradas.get(chave)
+            if corpo is not None:
+                self._entradas.move_to_end(chave)
+            return corpo
+
+    def guardar(self, chave, corpo):
+        """Armazena o corpo comprimido, descartando o menos usado se necessário."""
+        with self._lock:
+            self._entradas[chave] = corpo
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+
+
+def escolher_codificacao(accept_encoding):
+    """
+    Escolhe a codificação de resposta a partir do cabeçalho `Accept-Encoding`.
+
+    Prefere brotli (quando instalado) a gzip; codificações com `q=0` são recusadas.
+
+    Args:
+        accept_encoding (str): Valor do cabeçalho enviado pelo cliente.
+
+    Returns:
+        str | None: 'br', 'gzip' ou None (sem compressão).
+    """
+    aceitas = {}
+    for parte in accept_encoding.lower().split(","):
+        nome, _, parametros = parte.strip().partition(";")
+        qualidade = 1.0
+        parametros = parametros.strip()
+        if parametros.startswith("q="):
+            try:
+                qualidade = float(parametros[2:])
+            except ValueError:
+                qualidade = 0.0
+        aceitas[nome.strip()] = qualidade
+
+    curinga = aceitas.get("*", 0.0)
+
+    if brotli is not None and aceitas.get("br", curinga) > 0:
+        return "br"
+    if aceitas.get("gzip", curinga) > 0:
+        return "gzip"
+    return None
+
+
+def _comprimir(corpo, codificacao, nivel_gzip, nivel_brotli):
+    if codificacao == "br":
+        return brotli.compress(corpo, quality=nivel_brotli)
+
+    # wbits = 16 + MAX_WBITS gera o formato gzip (cabeçalho e CRC)
+    compressor = zlib.compressobj(nivel_gzip, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(corpo) + compressor.flush()
+
+
+def _comprimir_stream(iteravel, codificacao, nivel_gzip, nivel_brotli):
+    # Cada pedaço é liberado imediatamente (sync flush), para que streams como
+    # SSE continuem chegando ao cliente em tempo real
+    if codificacao == "br":
+        compressor = brotli.Compressor(quality=nivel_brotli)
+        for pedaco in iteravel:
+            if isinstance(pedaco, str):
+                pedaco = pedaco.encode("utf-8")
+            saida = compressor.process(pedaco) + compressor.flush()
+            if saida:
+                yield saida
+        yield compressor.finish()
+        return
+
+    compressor = zlib.compressobj(nivel_gzip, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for pedaco in iteravel:
+        if isinstance(pedaco, str):
+            pedaco = pedaco.encode("utf-8")
+        saida = compressor.compress(pedaco) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if saida:
+            yield saida
+    yield compressor.flush()
+
+
+def iniciar_compressao(app):
+    """
+    Registra a compressão (gzip/brotli) das respostas de `/api/*`.
+
+    Respostas comprimíveis menores que `COMPRESSAO_TAMANHO_MINIMO` bytes são
+    enviadas como estão. Respostas em stream são comprimidas pedaço a pedaço.
+    Os endpoints listados em `COMPRESSAO_ENDPOINTS_CACHE` têm o corpo comprimido
+    guardado em cache (por hash do corpo).
+
+    Args:
+        app (Flask): Aplicação Flask.
+
+    Returns:
+        None
+    """
+    config = app.config
+    tamanho_minimo = config["COMPRESSAO_TAMANHO_MINIMO"]
+    nivel_gzip = config["COMPRESSAO_NIVEL_GZIP"]
+    nivel_brotli = config["COMPRESSAO_NIVEL_BROTLI"]
+    endpoints_cache = set(config["COMPRESSAO_ENDPOINTS_CACHE"])
+    cache = CacheCompressao(config["COMPRESSAO_CACHE_MAX_ENTRADAS"])
+
+    @app.after_request
+    def comprimir_resposta(response):
+        if not request.path.startswith("/api/"):
+            return response
+
+        if (
+            response.mimetype not in TIPOS_COMPRIMIVEIS
+            or response.status_code < 200
+            or response.status_code in (204, 304)
+            or "Content-Encoding" in response.headers
+            or request.method == "HEAD"
+        ):
+            return response
+
+        # A resposta varia conforme o Accept-Encoding, comprimida ou não
+        response.vary.add("Accept-Encoding")
+
+        codificacao = escolher_codificacao(request.headers.get("Accept-Encoding", ""))
+        if codificacao is None:
+            return response
+
+        if response.is_streamed:
+            response.response = _comprimir_stream(
+                response.response, codificacao, nivel_gzip, nivel_brotli
+            )
+            response.headers.pop("Content-Length", None)
+            response.headers["Content-Encoding"] = codificacao
+            return response
+
+        corpo = response.get_data()
+        if len(corpo) < tamanho_minimo:
+            return response
+
+        if request.endpoint in endpoints_cache:
+            chave = (codificacao, hashlib.sha256(corpo).digest())
+            comprimido = cache.obter(chave)
+            if comprimido is None:
+                comprimido = _comprimir(corpo, codificacao, nivel_gzip, nivel_brotli)
+                cache.guardar(chave, comprimido)
+        else:
+            comprimido = _comprimir(corpo, codificacao, nivel_gzip, nivel_brotli)
+
+        response.set_data(comprimido)
+        response.headers["Content-Encoding"] = codificacao
+        return response
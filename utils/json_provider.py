@@ -0,0 +1,157 @@
+from flask.json.provider import DefaultJSONProvider
+from decimal import Decimal
+from datetime import date, datetime, timezone
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional
+    orjson = None
+
+# Nomes fixos em inglês (RFC 7231), independentes do locale do processo
+_DIAS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_MESES = (
+    "Jan",
+    "Feb",
+    "Mar",
+    "Apr",
+    "May",
+    "Jun",
+    "Jul",
+    "Aug",
+    "Sep",
+    "Oct",
+    "Nov",
+    "Dec",
+)
+
+
+def _formatar_http_date(valor):
+    """
+    Formata uma data como HTTP-date, igual ao `werkzeug.http.http_date` usado
+    pelo provedor padrão, mas sem as conversões intermediárias dele.
+
+    Args:
+        valor (datetime | date): Data a formatar (datetime sem fuso é tratado como UTC).
+
+    Returns:
+        str: Data no formato 'Thu, 01 Jan 2026 00:00:00 GMT'.
+    """
+    if isinstance(valor, datetime):
+        if valor.tzinfo is not None:
+            valor = valor.astimezone(timezone.utc)
+        hora, minuto, segundo = valor.hour, valor.minute, valor.second
+    else:
+        hora = minuto = segundo = 0
+
+    return (
+        f"{_DIAS[valor.weekday()]}, {valor.day:02d} {_MESES[valor.month - 1]} "
+        f"{valor.year:04d} {hora:02d}:{minuto:02d}:{segundo:02d} GMT"
+    )
+
+
+def _serializar_padrao(obj):
+    """
+    Serializa os tipos que o orjson não trata (ou trata de outra forma) no
+    mesmo formato que o provedor padrão do Flask, para não mudar as respostas.
+
+    Args:
+        obj (Any): Objeto não serializável nativamente.
+
+    Returns:
+        str: Representação JSON do objeto.
+
+    Raises:
+        TypeError: Se o tipo não for suportado.
+    """
+    # datetime/date saem como HTTP-date ("Thu, 01 Jan 2026 00:00:00 GMT")
+    if isinstance(obj, date):
+        return _formatar_http_date(obj)
+
+    if isinstance(obj, Decimal):
+        return str(obj)
+
+    if hasattr(obj, "__html__"):
+        return str(obj.__html__())
+
+    raise TypeError(f"Objeto do tipo {type(obj).__name__} não é serializável em JSON")
+
+
+class ProvedorJSON(DefaultJSONProvider):
+    """
+    Provedor JSON da aplicação baseado no orjson, usado por `jsonify` e `request.get_json`.
+
+    Trata nativamente `datetime`, `date`, `Decimal` e `UUID`, mantendo o formato
+    das respostas do provedor padrão (datas em HTTP-date, Decimal como string).
+    Sem o orjson instalado, ou em chamadas com opções próprias do `json` da
+    biblioteca padrão, usa o provedor padrão do Flask.
+    """
+
+    # A ordem de inserção das chaves é mantida; ordenar cada objeto só custaria tempo
+    sort_keys = False
+
+    _opcoes = (
+        (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS) if orjson else 0
+    )
+
+    def dumps(self, obj, **kwargs):
+        """
+        Serializa `obj` para uma string JSON.
+
+        Args:
+            obj (Any): Objeto a serializar.
+            **kwargs: Opções do `json.dumps`; quando informadas, usa o provedor padrão.
+
+        Returns:
+            str: Documento JSON.
+        """
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+
+        try:
+            return orjson.dumps(
+                obj, default=_serializar_padrao, option=self._opcoes
+            ).decode("utf-8")
+        except orjson.JSONEncodeError:
+            # Casos que o orjson recusa (ex: inteiros acima de 64 bits)
+            return super().dumps(obj)
+
+    def loads(self, s, **kwargs):
+        """
+        Desserializa um documento JSON (str ou bytes).
+
+        Args:
+            s (str | bytes): Documento JSON.
+            **kwargs: Opções do `json.loads`; quando informadas, usa o provedor padrão.
+
+        Returns:
+            Any: Objeto Python correspondente.
+        """
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """
+        Monta a resposta JSON de `jsonify`, serializando direto para bytes.
+
+        Em modo debug (ou com `compact = False`) a saída é indentada, como no provedor padrão.
+
+        Returns:
+            Response: Resposta com mimetype `application/json`.
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+
+        if orjson is None:
+            return super().response(obj)
+
+        opcoes = self._opcoes
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            opcoes |= orjson.OPT_INDENT_2
+
+        try:
+            corpo = orjson.dumps(obj, default=_serializar_padrao, option=opcoes)
+        except orjson.JSONEncodeError:
+            return super().response(obj)
+
+        return self._app.response_class(corpo + b"\n", mimetype=self.mimetype)
@@ -0,0 +1,427 @@
+from flask import g, request_started
+from werkzeug.exceptions import HTTPException, RequestEntityTooLarge
+from werkzeug.routing import RoutingException
+from werkzeug.wsgi import get_content_length
+from database.database_async import abrir_pool, fechar_pool
+from services.cloudinary_async import abrir_cliente_http, fechar_cliente_http
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import concurrent.futures
+import contextvars
+import io
+import sys
+import threading
+
+# Métodos tratados de forma especial pelo Flask (OPTIONS automático, HEAD sem
+# corpo): seguem sempre pelo caminho WSGI
+_METODOS_WSGI = {"HEAD", "OPTIONS"}
+
+# Partes do corpo de uma resposta WSGI aguardando envio (contrapressão do cliente)
+_PARTES_EM_ESPERA = 8
+# Intervalo em que a thread WSGI verifica se o cliente desconectou enquanto espera a fila
+_ESPERA_FILA_SEGUNDOS = 0.5
+
+
+class AplicacaoASGI:
+    """
+    Servidor ASGI para a aplicação Flask, com rotas assíncronas selecionadas.
+
+    As rotas listadas em `rotas_assincronas` (endpoint -> corrotina) rodam no
+    event loop, dentro do contexto de requisição do Flask: os hooks
+    before/after_request (CORS, métricas, tracing, compressão) são aplicados
+    normalmente. As demais rotas seguem pela aplicação WSGI em um pool de
+    threads próprio: cada requisição roda inteira em uma thread, com o corpo
+    da resposta repassado parte a parte (o feed SSE continua funcionando,
+    ocupando uma thread por conexão).
+
+    No startup (lifespan) abre o pool de conexões assíncronas e o cliente HTTP;
+    servidores sem lifespan os abrem na primeira requisição.
+    """
+
+    def __init__(self, app, rotas_assincronas):
+        self.app = app
+        self.rotas_assincronas = rotas_assincronas
+        self._executor = ThreadPoolExecutor(
+            max_workers=app.config["ASGI_THREADS_WSGI"], thread_name_prefix="wsgi"
+        )
+        self._iniciado = False
+        self._lock_inicio = asyncio.Lock()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+
+        if scope["type"] != "http":
+            return
+
+        await self._iniciar()
+
+        # O corpo só é lido depois de escolhida a rota, e nunca além de MAX_CONTENT_LENGTH
+        environ = montar_environ(scope)
+        limite = self.app.config["MAX_CONTENT_LENGTH"]
+
+        rota = self._rota_assincrona(environ)
+        if rota is None:
+            environ["wsgi.input"] = _EntradaASGI(
+                receive, asyncio.get_running_loop(), limite
+            )
+            await self._executar_wsgi(environ, receive, send)
+            return
+
+        declarado = get_content_length(environ)
+        if limite is not None and declarado is not None and declarado > limite:
+            corpo = None
+        else:
+            corpo = await _ler_corpo(receive, limite)
+
+        if corpo is None:
+            # Respondido pelo Flask (413), com os mesmos hooks das demais respostas
+            rota = _corpo_grande_demais
+            corpo = b""
+        environ["wsgi.input"] = io.BytesIO(corpo)
+        environ["CONTENT_LENGTH"] = str(len(corpo))
+
+        resposta = await self._despachar(environ, rota)
+        await _enviar_resposta(resposta, environ, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            mensagem = await receive()
+
+            if mensagem["type"] == "lifespan.startup":
+                try:
+                    await self._iniciar()
+                except Exception as e:
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+
+            elif mensagem["type"] == "lifespan.shutdown":
+                await fechar_cliente_http()
+                await fechar_pool()
+                self._executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _iniciar(self):
+        if self._iniciado:
+            return
+
+        async with self._lock_inicio:
+            if not self._iniciado:
+                await abrir_pool(self.app.config)
+                abrir_cliente_http(self.app.config)
+                self._iniciado = True
+
+    def _rota_assincrona(self, environ):
+        if environ["REQUEST_METHOD"] in _METODOS_WSGI:
+            return None
+
+        adaptador = self.app.url_map.bind_to_environ(
+            environ, server_name=self.app.config["SERVER_NAME"]
+        )
+        try:
+            endpoint, _ = adaptador.match()
+        except (HTTPException, RoutingException):
+            # 404, 405 e redirecionamentos são respondidos pelo próprio Flask
+            return None
+
+        return self.rotas_assincronas.get(endpoint)
+
+    async def _despachar(self, environ, rota):
+        # Mesmo fluxo de Flask.wsgi_app/full_dispatch_request, aguardando a corrotina
+        app = self.app
+        contexto = app.request_context(environ)
+        erro = None
+        try:
+            try:
+                contexto.push()
+                # Avisa o teardown de app.py para não encerrar a transação da
+                # conexão compartilhada (síncrona) a partir do event loop
+                g.rota_assincrona = True
+                try:
+                    request_started.send(app, _async_wrapper=app.ensure_sync)
+                    retorno = app.preprocess_request()
+                    if retorno is None:
+                        retorno = await rota()
+                except Exception as e:
+                    retorno = app.handle_user_exception(e)
+                return app.finalize_request(retorno)
+            except Exception as e:
+                erro = e
+                return app.handle_exception(e)
+        finally:
+            if erro is not None and app.should_ignore_error(erro):
+                erro = None
+            contexto.pop(erro)
+
+    async def _executar_wsgi(self, environ, receive, send):
+        # A chamada da aplicação, a iteração do corpo e o close() rodam em uma
+        # única thread do pool, dentro de um contexto (contextvars) próprio da
+        # requisição: o contexto de requisição que o Flask empilha (inclusive o
+        # de stream_with_context) é desempilhado na mesma thread e no mesmo
+        # Context. As partes chegam ao event loop por uma fila limitada.
+        loop = asyncio.get_running_loop()
+        fila = asyncio.Queue(maxsize=_PARTES_EM_ESPERA)
+        parar = threading.Event()
+        inicio = {}
+
+        contexto = contextvars.copy_context()
+        loop.run_in_executor(
+            self._executor,
+            contexto.run,
+            self._servir_wsgi,
+            environ,
+            inicio,
+            loop,
+            fila,
+            parar,
+        )
+
+        async def enviar_inicio():
+            if not inicio.get("enviado"):
+                inicio["enviado"] = True
+                await send(
+                    {
+                        "type": "http.response.start",
+                        "status": inicio["status"],
+                        "headers": _cabecalhos_asgi(inicio["headers"]),
+                    }
+                )
+
+        desconexao = None
+        try:
+            while True:
+                proxima = asyncio.ensure_future(fila.get())
+                aguardando = {proxima} if desconexao is None else {proxima, desconexao}
+                await asyncio.wait(aguardando, return_when=asyncio.FIRST_COMPLETED)
+                if not proxima.done():
+                    proxima.cancel()
+                    if desconexao.result():
+                        # Cliente desconectou (ex: aba do painel fechada durante o SSE)
+                        break
+                    # Corpo não lido pela aplicação: não é consumido só para vigiar
+                    desconexao = None
+                    continue
+
+                tipo, valor = proxima.result()
+                if tipo == "pronto":
+                    # A aplicação já leu o corpo: receive() passa a vigiar a desconexão
+                    desconexao = asyncio.ensure_future(_aguardar_desconexao(receive))
+                elif tipo == "parte":
+                    await enviar_inicio()
+                    await send(
+                        {"type": "http.response.body", "body": valor, "more_body": True}
+                    )
+                elif tipo == "fim":
+                    await enviar_inicio()
+                    await send({"type": "http.response.body", "body": b""})
+                    break
+                else:
+                    raise valor
+        finally:
+            # A thread encerra o gerador (close) na próxima parte que produzir
+            parar.set()
+            if desconexao is not None:
+                desconexao.cancel()
+
+    def _servir_wsgi(self, environ, inicio, loop, fila, parar):
+        def start_response(status, headers, exc_info=None):
+            if exc_info is not None and inicio.get("enviado"):
+                raise exc_info[1].with_traceback(exc_info[2])
+            inicio["status"] = int(status.split(" ", 1)[0])
+            inicio["headers"] = headers
+            return _escrita_nao_suportada
+
+        def entregar(item):
+            # Espera espaço na fila, desistindo se o event loop parou de consumir
+            futuro = asyncio.run_coroutine_threadsafe(fila.put(item), loop)
+            while True:
+                try:
+                    futuro.result(timeout=_ESPERA_FILA_SEGUNDOS)
+                    return True
+                except concurrent.futures.TimeoutError:
+                    if parar.is_set():
+                        futuro.cancel()
+                        return False
+
+        try:
+            corpo = self.app(environ, start_response)
+            try:
+                if not entregar(("pronto", None)):
+                    return
+                for parte in corpo:
+                    if parar.is_set():
+                        return
+                    if parte and not entregar(("parte", parte)):
+                        return
+            finally:
+                if hasattr(corpo, "close"):
+                    corpo.close()
+            entregar(("fim", None))
+        except Exception as e:
+            entregar(("erro", e))
+
+
+def montar_environ(scope):
+    """
+    Monta o environ WSGI (PEP 3333) de uma requisição ASGI.
+
+    O `wsgi.input` começa vazio: a ponte o substitui depois de escolher a rota,
+    pela leitura sob demanda (WSGI) ou pelo corpo já lido (rotas assíncronas).
+    `wsgi.input_terminated` indica ao Werkzeug que o servidor delimita o corpo,
+    o que permite aplicar MAX_CONTENT_LENGTH também a corpos sem Content-Length.
+
+    Args:
+        scope (dict): Escopo HTTP da requisição ASGI.
+
+    Returns:
+        dict: Environ para o Flask/Werkzeug.
+    """
+    raiz = scope.get("root_path", "")
+    caminho = scope["path"]
+    if raiz and caminho.startswith(raiz):
+        caminho = caminho[len(raiz) :]
+
+    servidor = scope.get("server") or ("localhost", 80)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": raiz.encode("utf-8").decode("latin-1"),
+        "PATH_INFO": caminho.encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope["query_string"].decode("latin-1"),
+        "SERVER_NAME": servidor[0],
+        "SERVER_PORT": str(servidor[1] or 80),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(),
+        "wsgi.input_terminated": True,
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+
+    cliente = scope.get("client")
+    if cliente:
+        environ["REMOTE_ADDR"] = cliente[0]
+        environ["REMOTE_PORT"] = str(cliente[1])
+
+    for nome, valor in scope["headers"]:
+        nome = nome.decode("latin-1")
+        valor = valor.decode("latin-1")
+
+        if nome == "content-length":
+            environ["CONTENT_LENGTH"] = valor
+            continue
+        if nome == "content-type":
+            environ["CONTENT_TYPE"] = valor
+            continue
+
+        chave = "HTTP_" + nome.upper().replace("-", "_")
+        if chave in environ:
+            valor = f"{environ[chave]},{valor}"
+        environ[chave] = valor
+
+    return environ
+
+
+async def _ler_corpo(receive, limite):
+    # None quando o corpo passa do limite: o restante não é lido
+    partes = []
+    tamanho = 0
+    while True:
+        mensagem = await receive()
+        if mensagem["type"] == "http.disconnect":
+            break
+        parte = mensagem.get("body", b"")
+        tamanho += len(parte)
+        if limite is not None and tamanho > limite:
+            return None
+        partes.append(parte)
+        if not mensagem.get("more_body"):
+            break
+    return b"".join(partes)
+
+
+async def _corpo_grande_demais():
+    raise RequestEntityTooLarge()
+
+
+class _EntradaASGI(io.RawIOBase):
+    """
+    `wsgi.input` que lê o corpo da requisição ASGI sob demanda, a partir da
+    thread WSGI, e interrompe a leitura com 413 ao passar do limite.
+    """
+
+    def __init__(self, receive, loop, limite):
+        self._receive = receive
+        self._loop = loop
+        self._limite = limite
+        self._pendente = b""
+        self._lidos = 0
+        self._fim = False
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._pendente and not self._fim:
+            mensagem = asyncio.run_coroutine_threadsafe(
+                self._receive(), self._loop
+            ).result()
+            if mensagem["type"] == "http.disconnect":
+                self._fim = True
+                break
+
+            self._pendente = mensagem.get("body", b"")
+            self._fim = not mensagem.get("more_body")
+            self._lidos += len(self._pendente)
+            if self._limite is not None and self._lidos > self._limite:
+                self._fim = True
+                self._pendente = b""
+                raise RequestEntityTooLarge()
+
+        tamanho = min(len(buffer), len(self._pendente))
+        buffer[:tamanho] = self._pendente[:tamanho]
+        self._pendente = self._pendente[tamanho:]
+        return tamanho
+
+
+async def _aguardar_desconexao(receive):
+    # True ao desconectar; False se chegar corpo que a aplicação não leu
+    while True:
+        mensagem = await receive()
+        if mensagem["type"] == "http.disconnect":
+            return True
+        if mensagem.get("body"):
+            return False
+
+
+async def _enviar_resposta(resposta, environ, send):
+    try:
+        cabecalhos = resposta.get_wsgi_headers(environ)
+        corpo = b"".join(resposta.get_app_iter(environ))
+    finally:
+        resposta.close()
+
+    await send(
+        {
+            "type": "http.response.start",
+            "status": resposta.status_code,
+            "headers": _cabecalhos_asgi(cabecalhos.to_wsgi_list()),
+        }
+    )
+    await send({"type": "http.response.body", "body": corpo})
+
+
+def _cabecalhos_asgi(cabecalhos):
+    return [
+        (nome.lower().encode("latin-1"), valor.encode("latin-1"))
+        for nome, valor in cabecalhos
+    ]
+
+
+def _escrita_nao_suportada(dados):
+    raise NotImplementedError("write() do WSGI não é suportado pela ponte ASGI.")
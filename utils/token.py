@@ -1,18 +1,24 @@
-from flask_jwt_extended import create_access_token
+from flask_jwt_extended import create_access_token, create_refresh_token
+from flask import current_app
+import hashlib
 import uuid
 from datetime import timedelta
 
 
-def gerar_token_jwt(fotografo_id):
+def gerar_token_jwt(fotografo_id, token_epoch=0, familia=None):
     """
     Gera um token JWT seguro com identificador único (JTI) para controle de denylist.
 
     O token contém claims adicionais com:
         - jti: Identificador único do token (usado na lista negra)
         - fotografo_id: ID do usuário autenticado
+        - token_epoch: Época de sessão do fotógrafo no momento da emissão
+        - familia: Família de refresh tokens da sessão (revogada no logout)
 
     Args:
         fotografo_id (int): ID do fotógrafo autenticado que será incluído no token.
+        token_epoch (int): Valor atual de `fotografo.token_epoch` (padrão: 0).
+        familia (str | None): Identificador da família de refresh tokens da sessão.
 
     Returns:
         str: Token JWT assinado e codificado pronto para uso nas requisições protegidas.
@@ -25,10 +31,15 @@ def gerar_token_jwt(fotografo_id):
     jti = str(uuid.uuid4())
 
     # Claims adicionais para o token JWT
-    additional_claims = {"jti": jti, "fotografo_id": str(fotografo_id)}
+    additional_claims = {
+        "jti": jti,
+        "fotografo_id": str(fotografo_id),
+        "token_epoch": token_epoch,
+        "familia": familia,
+    }
 
-    # Define tempo de expiração do token (24 horas)
-    expires = timedelta(hours=24)
+    # Token de acesso de curta duração; a renovação é feita com o refresh token
+    expires = timedelta(minutes=current_app.config["JWT_ACCESS_TOKEN_MINUTOS"])
 
     # Gera o token JWT com as configurações definidas
     token = create_access_token(
@@ -38,3 +49,52 @@ def gerar_token_jwt(fotografo_id):
     )
 
     return token
+
+
+def gerar_refresh_token(fotografo_id, token_epoch, familia):
+    """
+    Gera um refresh token JWT para renovar a sessão sem nova autenticação.
+
+    Cada refresh token pertence a uma família (uma por login) e só pode ser usado
+    uma vez: a cada renovação um novo token da mesma família é emitido.
+
+    Args:
+        fotografo_id (int): ID do fotógrafo autenticado.
+        token_epoch (int): Valor atual de `fotografo.token_epoch`.
+        familia (str): Identificador da família de refresh tokens da sessão.
+
+    Returns:
+        tuple: (token, jti, expira_em) — token codificado, seu JTI e a validade
+               como `timedelta` a partir de agora.
+    """
+    jti = str(uuid.uuid4())
+    expires = timedelta(days=current_app.config["JWT_REFRESH_TOKEN_DIAS"])
+
+    token = create_refresh_token(
+        identity=str(fotografo_id),
+        additional_claims={
+            "jti": jti,
+            "fotografo_id": str(fotografo_id),
+            "token_epoch": token_epoch,
+            "familia": familia,
+        },
+        expires_delta=expires,
+    )
+
+    return token, jti, expires
+
+
+def gerar_hash_token(token):
+    """
+    Gera o digest SHA-256 de um token para armazenamento e busca no banco.
+
+    O token em texto puro nunca é persistido: apenas o digest de 32 bytes é
+    gravado, o que mantém o índice compacto e evita vazamento em caso de dump.
+
+    Args:
+        token (str): Token em texto puro (ex: token de recuperação de senha).
+
+    Returns:
+        bytes: Digest SHA-256 do token (32 bytes), pronto para coluna BYTEA.
+    """
+    return hashlib.sha256(token.encode("utf-8")).digest()